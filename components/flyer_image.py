@@ -0,0 +1,26 @@
+from nicegui import ui
+from services.image_proxy import image_proxy
+from services.thumbnails import thumbnails
+
+# Card widths in the 1 / 2 / 3 column job grids
+CARD_SIZES = "(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw"
+# Quick-view modal header (w-[min(90vw,700px)])
+MODAL_SIZES = "(min-width: 778px) 700px, 90vw"
+
+
+def create_flyer_image(url: str, classes: str, sizes: str = CARD_SIZES):
+    """Flyer <img> that loads a right-sized thumbnail via srcset once one exists.
+
+    Falls back to the full flyer, served through the local image proxy, while
+    thumbnails are still being generated (or when Pillow is not installed).
+    Returns the image element so callers can listen for its "load" event.
+    """
+    sources = thumbnails.srcset_for(url)
+    if sources is None:
+        return ui.image(image_proxy.proxied_url(url)).props("loading=lazy").classes(classes)
+    with ui.element("picture").classes("contents"):
+        for mime_type, srcset in sources["sources"]:
+            ui.element("source").props(f'type="{mime_type}" srcset="{srcset}" sizes="{sizes}"')
+        return ui.element("img").props(
+            f'src="{sources["src"]}" loading=lazy decoding=async'
+        ).classes(classes)
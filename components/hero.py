@@ -1,8 +1,13 @@
+from urllib.parse import urlencode
+
 from nicegui import ui
+from services.image_proxy import image_proxy
+from components.suggestions import SuggestionDropdown
 
 # Define color constants
 PRIMARY_COLOR = "#00b074"  # New primary color
 SECONDARY_COLOR = "#00b074"  # Using primary for consistency
+HERO_IMAGE_URL = "https://images.pexels.com/photos/3756681/pexels-photo-3756681.jpeg"
 
 def create_hero():
     """Create a modern hero section with search functionality."""
@@ -11,7 +16,7 @@ def create_hero():
         # Background image container
         with ui.element('div').classes("absolute inset-0 w-full h-full -z-10 overflow-hidden").style("width: 100%; height: 100%;"):
             # Background image
-            ui.image("https://images.pexels.com/photos/3756681/pexels-photo-3756681.jpeg") \
+            ui.image(image_proxy.proxied_url(HERO_IMAGE_URL)) \
                 .classes("w-full h-full object-cover").style("width: 100%; height: 100%; object-fit: cover;")
             
             # Dark overlay for better text readability
@@ -52,26 +57,41 @@ def create_hero():
                     ).style("box-shadow: 0 4px 30px rgba(0, 0, 0, 0.1);"):
                         with ui.row().classes("flex-1 items-center px-4 py-3 w-full sm:w-auto"):
                             ui.icon("search", size="sm", color="white").classes("mr-3")
-                            ui.input(
+                            search_input = ui.input(
                                 placeholder="Job title or company"
                             ).classes(
                                 "flex-1 bg-transparent border-0 text-white placeholder-white/70 focus:outline-none focus:ring-0 text-base w-full"
-                            ).props('readonly')
+                            )
 
                         with ui.row().classes("hidden sm:block h-8 w-px bg-white/30 mx-2"):
                             pass
 
                         with ui.row().classes("w-full sm:w-64 items-center px-4 py-3"):
                             ui.icon("location_on", size="sm", color="white").classes("mr-3")
-                            ui.input(
+                            location_input = ui.input(
                                 placeholder="Location)"
                             ).classes(
                                 "flex-1 bg-transparent border-0 text-white placeholder-white focus:outline focus:ring-0 text-base w-full"
                             ).props('')
 
+                        def run_search():
+                            # /jobs runs the query through the full-text index (ranked, with snippets)
+                            query = {
+                                key: value for key, value in (
+                                    ("search", (search_input.value or "").strip()),
+                                    ("location", (location_input.value or "").strip()),
+                                ) if value
+                            }
+                            ui.navigate.to("/jobs" + ("?" + urlencode(query) if query else ""))
+
+                        search_input.on("keydown.enter", run_search)
+                        location_input.on("keydown.enter", run_search)
+                        # Typeahead from the live catalog; a picked title/company searches straight away
+                        SuggestionDropdown(search_input, on_pick=lambda suggestion: run_search())
+                        SuggestionDropdown(location_input, kinds=("location",))
                         ui.button(
                             "SEARCH",
-                            on_click=lambda: ui.navigate.to("/jobs")
+                            on_click=run_search
                         ).style(f"background-color: {PRIMARY_COLOR} !important")\
                          .classes("hover:opacity-90 text-white font-semibold px-6 py-3 rounded-sm "
                                 "min-h-[40px] text-sm transition-all duration-300 transform hover:scale-105 shadow-lg w-full sm:w-auto mt-2 sm:mt-0")
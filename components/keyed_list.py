@@ -0,0 +1,68 @@
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+from nicegui import ui
+
+
+class KeyedList:
+    """Keyed renderer for a list of items inside one container element.
+
+    update() diffs the previous and next key sequences: elements of items that
+    are still shown are reused (moved when their position changed), only new
+    items are rendered and only dropped ones are removed. An item whose
+    version changed is rendered again in place. Appending items to the end
+    (e.g. "Load more") therefore only sends the new elements to the browser.
+    """
+
+    def __init__(self, container: ui.element, key: Callable[[Any], Hashable],
+                 render: Callable[[Any], ui.element], version: Optional[Callable[[Any], Hashable]] = None):
+        self.container = container
+        self.key = key
+        self.render = render
+        self.version = version or (lambda item: None)
+        self._order: List[Hashable] = []  # keys in the container's child order
+        self._elements: Dict[Hashable, ui.element] = {}
+        self._versions: Dict[Hashable, Hashable] = {}
+
+    def update(self, items: Iterable[Any]) -> Dict[str, int]:
+        """Show exactly items, in order; returns created/removed/moved/kept counts"""
+        counts = {'created': 0, 'removed': 0, 'moved': 0, 'kept': 0}
+        wanted: Dict[Hashable, Any] = {}
+        for item in items:
+            wanted.setdefault(self.key(item), item)
+
+        # Drop elements that are gone or outdated; the rest keep their relative order
+        for key in list(self._order):
+            if key not in wanted or self._versions[key] != self.version(wanted[key]):
+                self.container.remove(self._elements.pop(key))
+                del self._versions[key]
+                self._order.remove(key)
+                counts['removed'] += 1
+
+        for index, (key, item) in enumerate(wanted.items()):
+            element = self._elements.get(key)
+            if element is None:
+                with self.container:
+                    element = self.render(item)
+                self._elements[key] = element
+                self._versions[key] = self.version(item)
+                if index < len(self._order):
+                    element.move(self.container, index)
+                self._order.insert(index, key)
+                counts['created'] += 1
+            elif self._order[index] != key:
+                element.move(self.container, index)
+                self._order.remove(key)
+                self._order.insert(index, key)
+                counts['moved'] += 1
+            else:
+                counts['kept'] += 1
+        return counts
+
+    def clear(self):
+        self.container.clear()
+        self._order.clear()
+        self._elements.clear()
+        self._versions.clear()
+
+    def __len__(self) -> int:
+        return len(self._order)
@@ -0,0 +1,76 @@
+from typing import Callable, Iterable, List, Optional
+
+from nicegui import ui
+
+from services.autocomplete import SEARCH_KINDS, Suggestion
+from services.job_catalog import job_catalog
+from services.query_pipeline import LatestQuery, suggest_stats
+
+# Suggestions are answered from memory, so only coalesce what arrives within one round trip
+SUGGEST_DEBOUNCE_SECONDS = 0.05
+
+KIND_ICONS = {'title': 'work', 'company': 'business', 'category': 'category', 'location': 'location_on'}
+
+
+class SuggestionDropdown:
+    """Typeahead dropdown under a ui.input, fed by the catalog's suggestion index.
+
+    Every edit of the input asks the server for the top values starting with
+    the typed text (latest-only, so a stale answer never replaces a newer
+    one) and lists them in a menu anchored to the input. The menu never takes
+    focus, so typing carries on; picking an entry fills the input and calls
+    on_pick with the Suggestion.
+    """
+
+    def __init__(self, input_element: ui.input, kinds: Iterable[str] = SEARCH_KINDS,
+                 on_pick: Optional[Callable[[Suggestion], None]] = None):
+        self.input = input_element
+        self.kinds = tuple(kinds)
+        self.on_pick = on_pick
+        self.suggestions: List[Suggestion] = []
+        with self.input:
+            self.menu = ui.menu().props('no-parent-event no-focus fit').classes('max-h-80')
+        self.query = LatestQuery(self._lookup, self._show, delay=SUGGEST_DEBOUNCE_SECONDS, stats=suggest_stats)
+        self.input.on('update:model-value', lambda e: self.refresh())
+        self.input.on('keydown.enter', lambda e: self.close())
+        self.input.on('keydown.esc', lambda e: self.close())
+
+    def refresh(self):
+        text = (self.input.value or '').strip()
+        if not text:
+            self.close()
+            return
+        self.query.submit(text)
+
+    def close(self):
+        self.query.cancel()
+        self.menu.close()
+
+    async def _lookup(self, text: str) -> List[Suggestion]:
+        return await job_catalog.suggest(text, self.kinds)
+
+    def _show(self, text: str, suggestions: List[Suggestion], timing):
+        # Nothing to add when the only match is what was typed
+        if not suggestions or (len(suggestions) == 1 and suggestions[0].label.casefold() == text.casefold()):
+            self.menu.close()
+            return
+        if [(s.label, s.kind) for s in suggestions] != [(s.label, s.kind) for s in self.suggestions]:
+            self.menu.clear()
+            with self.menu:
+                for suggestion in suggestions:
+                    with ui.item(on_click=lambda s=suggestion: self._pick(s)).classes('text-gray-800'):
+                        with ui.item_section().props('avatar').classes('min-w-0 pr-3'):
+                            ui.icon(KIND_ICONS.get(suggestion.kind, 'search'), size='xs', color='grey-6')
+                        with ui.item_section():
+                            ui.item_label(suggestion.label).classes('text-sm')
+                        with ui.item_section().props('side'):
+                            ui.item_label(f"{suggestion.count} job{'s' if suggestion.count != 1 else ''}") \
+                                .props('caption')
+        self.suggestions = suggestions
+        self.menu.open()
+
+    def _pick(self, suggestion: Suggestion):
+        self.close()
+        self.input.set_value(suggestion.label)
+        if self.on_pick is not None:
+            self.on_pick(suggestion)
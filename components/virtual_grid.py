@@ -0,0 +1,141 @@
+import asyncio
+import math
+from typing import Any, Awaitable, Callable, Hashable, List, Optional
+
+from nicegui import ui
+
+from components.keyed_list import KeyedList
+
+# Fallback card row height (card + row gap, px) until the browser has measured one
+ROW_HEIGHT = 484
+# Rows kept rendered above and below the visible ones
+OVERSCAN_ROWS = 2
+# Ask for the next page once the rendered window is this many rows from the end
+PREFETCH_ROWS = 3
+INITIAL_VIEWPORT = 900
+
+# Reports where the grid sits in the window (throttled to one report per frame
+# plus 100ms) as a "viewport" DOM event on the wrapper. Re-reports when the
+# wrapper resizes, e.g. after more results were appended.
+_VIEWPORT_JS = """
+<script>
+(function () {
+  var wrapperId = 'c%(wrapper)s', gridId = 'c%(grid)s', last = '', queued = false;
+  function report() {
+    queued = false;
+    var wrapper = document.getElementById(wrapperId), grid = document.getElementById(gridId);
+    if (!wrapper || !grid) return;
+    var style = getComputedStyle(grid), card = grid.firstElementChild;
+    var detail = {
+      top: Math.round(-wrapper.getBoundingClientRect().top),
+      height: window.innerHeight,
+      total: wrapper.offsetHeight,
+      columns: style.gridTemplateColumns.split(' ').filter(Boolean).length || 1,
+      row: card ? Math.round(card.offsetHeight + (parseFloat(style.rowGap) || 0)) : 0
+    };
+    var key = JSON.stringify(detail);
+    if (key === last) return;
+    last = key;
+    wrapper.dispatchEvent(new CustomEvent('viewport', {detail: detail}));
+  }
+  function schedule() {
+    if (queued) return;
+    queued = true;
+    requestAnimationFrame(function () { setTimeout(report, 100); });
+  }
+  window.addEventListener('scroll', schedule, {passive: true});
+  window.addEventListener('resize', schedule);
+  function observe() {
+    var wrapper = document.getElementById(wrapperId);
+    if (!wrapper) return setTimeout(observe, 100);
+    if (window.ResizeObserver) new ResizeObserver(schedule).observe(wrapper);
+    schedule();
+  }
+  observe();
+})();
+</script>
+"""
+
+
+class VirtualGrid:
+    """Virtually scrolled card grid: only the rows near the viewport exist as elements.
+
+    Spacers above and below the rendered window stand in for the other rows,
+    so the page keeps its full scroll height while the browser DOM and the
+    server-side element tree stay the size of a few screens. Scrolling moves
+    the window a row at a time and the KeyedList reuses every card that stays
+    in it. When the window nears the end, on_near_end (e.g. fetching the next
+    server page) is awaited.
+    """
+
+    def __init__(self, render: Callable[[Any], ui.element], key: Callable[[Any], Hashable],
+                 version: Optional[Callable[[Any], Hashable]] = None, grid_classes: str = '',
+                 on_near_end: Optional[Callable[[], Awaitable[None]]] = None):
+        self.items: List[Any] = []
+        self.on_near_end = on_near_end
+        self.columns = 3
+        self.row_height = ROW_HEIGHT
+        self.top = 0
+        self.viewport = INITIAL_VIEWPORT
+        self._window = (0, 0)
+        self._loading = False
+        self.wrapper = ui.element('div').classes('w-full')
+        with self.wrapper:
+            self.top_spacer = ui.element('div')
+            self.grid = ui.element('div').classes(grid_classes)
+            self.bottom_spacer = ui.element('div')
+        self.cards = KeyedList(self.grid, key=key, render=render, version=version)
+        self.wrapper.on('viewport', self._on_viewport, args=['detail'])
+        ui.add_body_html(_VIEWPORT_JS % {'wrapper': self.wrapper.id, 'grid': self.grid.id})
+
+    def set_items(self, items: List[Any], keep_position: bool = False):
+        """Show a result list from its first row, or with keep_position where the user is (e.g. after appending)"""
+        self.items = items
+        self._window = (-1, -1)
+        if not keep_position and self.top > 0:
+            self.top = 0
+            ui.run_javascript(f"document.getElementById('c{self.wrapper.id}')?.scrollIntoView({{block: 'start'}})")
+        self._render()
+
+    def _rows(self) -> int:
+        return math.ceil(len(self.items) / self.columns)
+
+    def _render(self):
+        rows = self._rows()
+        span = math.ceil(self.viewport / self.row_height) + 2 * OVERSCAN_ROWS
+        last = min(rows, math.ceil((self.top + self.viewport) / self.row_height) + OVERSCAN_ROWS)
+        # Past the end (the browser has not clamped the scroll yet) the window still ends full
+        first = max(0, min(self.top // self.row_height - OVERSCAN_ROWS, last - span))
+        if (first, last) == self._window:
+            return
+        self._window = (first, last)
+        self.cards.update(self.items[first * self.columns:last * self.columns])
+        self.top_spacer.style(f'height: {first * self.row_height}px')
+        self.bottom_spacer.style(f'height: {max(0, rows - last) * self.row_height}px')
+
+    def near_end(self) -> bool:
+        return self._window[1] + PREFETCH_ROWS >= self._rows()
+
+    async def _on_viewport(self, e):
+        detail = (e.args or {}).get('detail') or {}
+        try:
+            self.top = max(0, int(detail.get('top', 0)))
+            self.viewport = max(1, int(detail.get('height', INITIAL_VIEWPORT)))
+            self.columns = max(1, int(detail.get('columns', self.columns)))
+            self.row_height = int(detail.get('row') or 0) or self.row_height
+        except (TypeError, ValueError):
+            return
+        self._render()
+        if self.on_near_end is not None and self.near_end() and not self._loading:
+            self._loading = True
+            try:
+                await self.on_near_end()
+            except asyncio.CancelledError:
+                raise
+            except Exception as ex:
+                print(f"Error loading more results: {ex}")
+            finally:
+                self._loading = False
+
+    def __len__(self) -> int:
+        return len(self.cards)
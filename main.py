@@ -17,6 +17,16 @@ from pages.shared.jobs import jobs_page
 from pages.shared.home import home_page
 from components.job_details_modal import show_job_details
 from services.auth_service import auth_service
+from services.http_client import close_session, close_async_client
+from services.job_catalog import job_catalog
+from services.job_sync import job_sync
+from services.single_flight import upstream_flights
+from services.query_pipeline import search_stats, suggest_stats
+from services.circuit_breaker import circuit_breakers
+from services.thumbnails import MIME_TYPES, thumbnails
+from services.image_proxy import ImageHostNotAllowed, image_proxy, read_chunks
+from fastapi import Depends, HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
 import os
 from dotenv import load_dotenv
 from typing import Dict, List, Any, Optional
@@ -28,9 +38,105 @@ load_dotenv()
 # Initialize API service
 api_service = APIService()
 
+# Internal counters under /_stats; off unless enabled, and then only for admins
+STATS_ROUTES = os.getenv("STATS_ROUTES", "False").lower() == "true"
+
+# Release pooled upstream connections when the server stops
+app.on_shutdown(close_session)
+app.on_shutdown(close_async_client)
+app.on_shutdown(thumbnails.shutdown)
+
+# Keep the local SQLite job mirror in sync (only when JOB_READ_MODE=mirror or JOB_MIRROR_SYNC=1)
+app.on_startup(job_sync.start)
+app.on_shutdown(job_sync.stop)
+
+# Load the catalog at startup so the search, facet and spelling indexes are built before the first query
+app.on_startup(job_catalog.warm_up)
+
+
+@app.get("/thumbs/{name}")
+def flyer_thumbnail(name: str):
+    """Resized flyer thumbnails; names are content hashes, so responses never change."""
+    path = thumbnails.path_for(name)
+    if path is None:
+        raise HTTPException(status_code=404)
+    return FileResponse(
+        path,
+        media_type=MIME_TYPES[name.rsplit(".", 1)[1]],
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
+
+
+@app.get("/img")
+async def proxied_image(url: str):
+    """Remote images (flyers, sample photos, hero) served from the local image cache."""
+    try:
+        # Streams from an already open file, so cache eviction cannot remove it mid-response
+        image, file = await image_proxy.open(url)
+    except ImageHostNotAllowed:
+        raise HTTPException(status_code=403)
+    except Exception as e:
+        print(f"Error proxying image {url}: {e}")
+        raise HTTPException(status_code=502)
+    return StreamingResponse(
+        read_chunks(file),
+        media_type=image.content_type,
+        headers={"Cache-Control": "public, max-age=86400", "Content-Length": str(os.fstat(file.fileno()).st_size)},
+    )
+
+
+async def require_stats_access():
+    """Guard for the /_stats routes: 404 while STATS_ROUTES is off, 403 unless this session is an admin's."""
+    if not STATS_ROUTES:
+        raise HTTPException(status_code=404)
+    # The requester's own session, not auth_service.current_user (the last login on this worker)
+    try:
+        user = app.storage.user.get("user_data") or {}
+    except RuntimeError:  # no storage_secret, so no sessions
+        user = {}
+    if user.get("role") != "admin":
+        raise HTTPException(status_code=403)
+
+
+@app.get("/_stats/images", dependencies=[Depends(require_stats_access)])
+def image_stats():
+    """Image proxy cache counters (hits, misses, revalidations, evictions, bytes)."""
+    return image_proxy.stats()
+
+
+@app.get("/_stats/catalog", dependencies=[Depends(require_stats_access)])
+def catalog_stats():
+    """Job catalog cache counters (hits, stale hits, misses, refreshes)."""
+    return job_catalog.stats()
+
+
+@app.get("/_stats/mirror", dependencies=[Depends(require_stats_access)])
+def mirror_stats():
+    """SQLite job mirror row counts and sync counters."""
+    return job_sync.stats()
+
+
+@app.get("/_stats/search", dependencies=[Depends(require_stats_access)])
+def search_stats_route():
+    """/jobs search pipeline counters (debounced, cancelled, delivered) and time-to-results percentiles,
+    with the same for the typeahead suggestions under 'suggestions'."""
+    return dict(search_stats.stats(), suggestions=suggest_stats.stats())
+
+
+@app.get("/_stats/single-flight", dependencies=[Depends(require_stats_access)])
+def single_flight_stats():
+    """Upstream request coalescing counters (leaders vs. coalesced duplicates)."""
+    return upstream_flights.stats()
+
+
+@app.get("/_stats/circuits", dependencies=[Depends(require_stats_access)])
+def circuit_stats():
+    """State of the per-endpoint upstream circuit breakers."""
+    return circuit_breakers.stats()
+
 
 @ui.page("/")
-def index():
+async def index():
     """Main page for the JobBoard website."""
     # Header
     create_header()
@@ -39,7 +145,7 @@ def index():
     create_hero()
 
     # Home page content
-    home_page()
+    await home_page()
 
     # Footer
     create_footer()
@@ -47,7 +153,7 @@ def index():
 
 # Route definitions
 @ui.page("/vendor-dashboard")
-def vendor_dashboard():
+async def vendor_dashboard():
     """Vendor dashboard page with role-based access control."""
     # Check if user is authenticated and has vendor/employer role
     current_user = auth_service.get_current_user()
@@ -62,7 +168,7 @@ def vendor_dashboard():
         return
     
     create_header()
-    vendor_dashboard_page()
+    await vendor_dashboard_page()
     create_footer()
 
 
@@ -108,10 +214,10 @@ def job_seeker_dashboard():
 
 
 @ui.page("/jobs")
-def jobs():
+async def jobs():
     """Jobs listing page."""
     create_header()
-    jobs_page()
+    await jobs_page()
     create_footer()
 
 
@@ -3,16 +3,13 @@ Home Page - Main landing page for the JobBoard website
 """
 
 from nicegui import ui
-from services.api_service import APIService
+from services.job_catalog import job_catalog
 from components.job_details_modal import show_job_details
 
 
-def home_page():
+async def home_page():
     """Main page content for the JobBoard website."""
 
-    # Initialize API service
-    api_service = APIService()
-
     # Add global styles to force flush footer and eliminate white gaps
     ui.add_head_html(
         """<style>
@@ -267,7 +264,7 @@ def home_page():
                 ).classes("text-xl text-gray-600 max-w-2xl mx-auto")
 
             # Job Cards Grid
-            featured_jobs = api_service.get_jobs()[:3]
+            featured_jobs = (await job_catalog.get_jobs())[:3]
             if featured_jobs:
                 with ui.row().classes("grid grid-cols-1 md:grid-cols-3 gap-8"):
                     for job in featured_jobs:
@@ -3,20 +3,14 @@
 from nicegui import ui
 from components.header import create_header
 from components.footer import create_footer
-from services.api_service import APIService
-
-# Initialize API service
-api_service = APIService()
+from services.job_catalog import job_catalog
 
 @ui.page("/job/{job_id}")
-def job_details_page(job_id: str):
+async def job_details_page(job_id: str):
     """Full page view for job details"""
     
-    # Get job data from API only
-    jobs = api_service.get_jobs()
-    print(f"Looking for job ID: {job_id}")
-    print(f"Available job IDs: {[j.get('id') for j in jobs]}")
-    job = next((j for j in jobs if str(j.get('id')) == str(job_id)), None)
+    # Indexed catalog lookup (falls back to GET /jobs/{id} for jobs not in the catalog)
+    job = await job_catalog.get_job(job_id)
     
     if not job:
         # Create header and show error message
@@ -1,28 +1,45 @@
 from nicegui import ui
-from services.api_service import APIService
-from datetime import datetime
-from time import monotonic
+from services.async_api_service import AsyncAPIService
+from services.job_catalog import job_catalog
+from services.job_facets import sort_text
+from services.job_normalizer import epoch_seconds
+from services.job_search import highlight_html
+from services.query_pipeline import LatestQuery
+from services.spelling import SEARCH_AUTOCORRECT
+from components.flyer_image import MODAL_SIZES, create_flyer_image
+from components.suggestions import SuggestionDropdown
+from components.virtual_grid import VirtualGrid
 from urllib.parse import urlencode, quote_plus
 
+JOB_TYPES = ("Full-time", "Part-time", "Contract", "Internship", "Temporary")
+# Sidebar facets that show live counts (location is a free-text filter)
+SIDEBAR_FACETS = ("job_type", "category", "company", "remote")
+# Job fields a results card (and its quick view) shows; a card is rebuilt only when one changes
+CARD_FIELDS = ("title", "job_title", "company", "location", "flyer", "status", "search_snippet",
+               "application_count", "view_count", "description", "job_description")
 
-def jobs_page():
-    """Jobs page with client-side search, sorting, load-more pagination, placeholders, and a quick-view modal.
+
+async def jobs_page():
+    """Jobs page with client-side search, sorting, virtualized infinite scroll, placeholders, and a quick-view modal.
 
     Keeps the exact flyer rendering code from Manage Jobs when a flyer exists.
     """
 
-    api_service = APIService()
+    api_service = AsyncAPIService()
 
     # ---------------------- Data fetch ----------------------
-    def fetch_jobs():
+    async def fetch_jobs():
         try:
-            return api_service.get_jobs()
+            # Unfiltered listing comes from the shared catalog cache
+            return await job_catalog.get_jobs()
         except Exception as e:
             print(f"Error fetching jobs: {e}")
             return []
 
     # Initial fetch (no filters)
-    jobs = fetch_jobs()
+    jobs = await fetch_jobs()
+    # Sidebar filters and their counts come from the catalog's facet posting lists
+    await job_catalog.get_facets()
 
     # ---------------------- State ----------------------
     # Read initial query params (best-effort; gracefully falls back)
@@ -43,30 +60,38 @@ def jobs_page():
     params = _read_query_params()
 
     search_query = (params.get("search") or "")
-    sort_mode = params.get("sort") or "Newest"  # Newest | Company | Title
-    items_per_page = 9
-    loaded_count = items_per_page
+    initial_location = (params.get("location") or "").strip()
+    sort_mode = params.get("sort") or "Relevance"  # Relevance | Newest | Company | Title
+    items_per_page = 9  # server page size
     server_paging = False
     page = 1
 
-    # Debounce machinery
+    # Typing waits this long for the next keystroke before searching
     debounce_delay = 0.35
-    _dirty = False
-    _due = 0.0
     last_server_query = None
+    # True while `jobs` came from the server (pages of a server-side query) rather than the catalog
+    from_server = False
+    # True while `jobs` holds full-text search results for last_server_query (ranked by relevance)
+    index_search = False
+    # Search the user asked to keep as typed ("Search instead for"), so it is not corrected again
+    exact_query = None
 
     # UI control placeholders (set to None, assigned later in UI block)
     search_input = None
     sort_select = None
     count_label = None
+    timing_label = None
+    correction_row = None
     location_input = None
     job_type_select = None
     category_select = None
+    company_select = None
     remote_checkbox = None
     salary_min_input = None
     salary_max_input = None
-    grid = None
-    load_more_row = None
+    results = None
+    empty_label = None
+    loading_row = None
     dialog = None
     dialog_container = None
 
@@ -75,26 +100,11 @@ def jobs_page():
         return (str(v or "").strip()).lower()
 
     def _extract_timestamp(j: dict) -> float:
-        v = j.get("posted_date") or j.get("date_posted") or j.get("created_at") or ""
-        # Epoch milliseconds/seconds
-        try:
-            if isinstance(v, (int, float)):
-                # assume seconds if small, ms if large
-                return float(v if v < 10_000_000_000 else v / 1000.0)
-            if isinstance(v, str):
-                sv = v.strip()
-                if sv.isdigit():
-                    num = int(sv)
-                    return float(num if num < 10_000_000_000 else num / 1000.0)
-                # ISO-ish handling
-                s = sv.replace("Z", "+00:00")
-                try:
-                    return datetime.fromisoformat(s).timestamp()
-                except Exception:
-                    pass
-        except Exception:
-            pass
-        return 0.0
+        # Normalized jobs carry posted_ts, computed once at ingest
+        ts = j.get("posted_ts")
+        if ts is not None:
+            return ts
+        return epoch_seconds(j.get("posted_date") or j.get("date_posted") or j.get("created_at"))
 
     def _is_active(j: dict) -> bool:
         status = _text(j.get("status"))
@@ -105,19 +115,25 @@ def jobs_page():
         # Heuristic: if posted_date exists, assume active
         return True
 
-    def _job_matches(j: dict) -> bool:
-        # Search match
-        hay = " ".join([
-            _text(j.get("title") or j.get("job_title")),
-            _text(j.get("company")),
-            _text(j.get("location")),
-        ])
-        if _text(search_query) not in hay:
-            return False
+    def _job_matches(j: dict, sidebar: bool = True, query=None, ranked=None) -> bool:
+        # sidebar=False skips the location/type/category/company/remote/salary checks (done by the facet index)
+        # query/ranked default to the page's search text and whether the full-text index matched it
+        query = search_query if query is None else query
+        if ranked is None:
+            ranked = index_search and _text(query) == _text(last_server_query)
+        # Search match (already done by the full-text index when it answered this query)
+        if query and not ranked:
+            hay = " ".join([
+                _text(j.get("title") or j.get("job_title")),
+                _text(j.get("company")),
+                _text(j.get("location")),
+            ])
+            if _text(query) not in hay:
+                return False
 
         # Location filter
         try:
-            if location_input is not None:
+            if sidebar and location_input is not None:
                 loc_val = (location_input.value or "").strip().lower()
                 if loc_val and loc_val not in _text(j.get("location")):
                     return False
@@ -126,7 +142,7 @@ def jobs_page():
 
         # Job type filter
         try:
-            if job_type_select is not None:
+            if sidebar and job_type_select is not None:
                 jt = (job_type_select.value or "All")
                 if jt != "All" and _text(j.get("job_type")) != _text(jt):
                     return False
@@ -135,16 +151,25 @@ def jobs_page():
 
         # Category filter
         try:
-            if category_select is not None:
+            if sidebar and category_select is not None:
                 cat = (category_select.value or "All")
                 if cat != "All" and _text(j.get("category")) != _text(cat):
                     return False
         except Exception:
             pass
 
+        # Company filter
+        try:
+            if sidebar and company_select is not None:
+                comp = (company_select.value or "All")
+                if comp != "All" and _text(j.get("company")) != _text(comp):
+                    return False
+        except Exception:
+            pass
+
         # Remote filter (heuristic)
         try:
-            if remote_checkbox is not None and remote_checkbox.value:
+            if sidebar and remote_checkbox is not None and remote_checkbox.value:
                 loc = _text(j.get("location"))
                 typ = _text(j.get("job_type"))
                 is_remote = bool(j.get("remote")) or ("remote" in loc) or ("remote" in typ)
@@ -153,39 +178,99 @@ def jobs_page():
         except Exception:
             pass
 
-        # Salary filters (best-effort heuristic on salary string)
+        # Salary filters on the numeric bounds parsed at normalization (jobs without one pass)
         try:
-            if (salary_min_input is not None and salary_min_input.value not in (None, "")) or \
-               (salary_max_input is not None and salary_max_input.value not in (None, "")):
-                import re
-                sal = j.get("salary") or ""
-                nums = [int(n.replace(",", "")) for n in re.findall(r"\d{1,3}(?:,\d{3})*", sal)]
-                j_min = nums[0] if nums else None
-                j_max = nums[1] if len(nums) > 1 else j_min
-                if salary_min_input is not None and salary_min_input.value not in (None, ""):
-                    try:
-                        if j_max is not None and j_max < int(float(salary_min_input.value)):
-                            return False
-                    except Exception:
-                        pass
-                if salary_max_input is not None and salary_max_input.value not in (None, ""):
-                    try:
-                        if j_min is not None and j_min > int(float(salary_max_input.value)):
-                            return False
-                    except Exception:
-                        pass
+            if sidebar:
+                low, high = _salary_bounds()
+                if low is not None and j.get("salary_max") is not None and j["salary_max"] < low:
+                    return False
+                if high is not None and j.get("salary_min") is not None and j["salary_min"] > high:
+                    return False
         except Exception:
             pass
 
         return True
 
-    def _apply_filters() -> list:
-        # Client-side filtering + sorting fallback
-        filtered = [j for j in jobs if _job_matches(j)]
+    def _salary_bounds():
+        # (min, max) from the salary inputs, None where empty
+        bounds = []
+        for number in (salary_min_input, salary_max_input):
+            value = number.value if number is not None else None
+            bounds.append(float(value) if value not in (None, "") else None)
+        return tuple(bounds)
+
+    def _facet_selection() -> dict:
+        selection = {}
+        try:
+            selection["location"] = (location_input.value or "").strip()
+            selection["job_type"] = job_type_select.value or "All"
+            selection["category"] = category_select.value or "All"
+            selection["company"] = company_select.value or "All"
+            selection["remote"] = bool(remote_checkbox.value)
+            selection["min_salary"], selection["max_salary"] = _salary_bounds()
+        except Exception:
+            pass
+        return selection
+
+    def _facet_options(values, selected, fixed=(), limit=None) -> dict:
+        # "Label (count)" options: the fixed values first, then the most common others
+        counts = {label.casefold(): count for label, count in values}
+        labels = list(fixed)
+        known = {label.casefold() for label in labels}
+        others = [label for label, count in values if count and label.casefold() not in known]
+        labels += others[:limit] if limit else others
+        if selected and selected != "All" and selected.casefold() not in {label.casefold() for label in labels}:
+            labels.append(selected)
+        return {"All": "All", **{label: f"{label} ({counts.get(label.casefold(), 0):,})" for label in labels}}
+
+    def _show_facet_counts(counts: dict):
+        try:
+            for select, facet, fixed, limit in (
+                (job_type_select, "job_type", JOB_TYPES, None),
+                (category_select, "category", categories, None),
+                (company_select, "company", (), 50),
+            ):
+                options = _facet_options(counts.get(facet, []), select.value, fixed, limit)
+                if options != select.options:
+                    select.set_options(options, value=select.value or "All")
+            remote_count = sum(count for _, count in counts.get("remote", []))
+            remote_checkbox.set_text(f"Remote only ({remote_count:,})")
+        except Exception as ex:
+            print(f"Could not update filter counts: {ex}")
+
+    def _apply_filters(query=None, found=None) -> list:
+        # With query (and found, from _results_for) a search run previews results it has not shown
+        # yet: the page state and the sidebar counts are left alone
+        preview = query is not None
+        listed, ranked, server = (found or (jobs, index_search, from_server))[:3]
+        # Fetched results were text-matched by the index if it answered them; else work it out per query
+        matched = ranked if found else None
+        facets = job_catalog.facets
+        if facets is not None and not server:
+            # Sidebar and salary filters by posting-list/range-index intersection; only search still runs per job
+            selection = _facet_selection()
+            base = facets.bits_for(listed) if ranked else None
+            bits = facets.select(selection, base)
+            if sort_mode == "Relevance" and ranked:
+                candidates = facets.filter_jobs(listed, bits)  # full-text results are already in BM25 order
+            else:
+                # Ordered by the snapshot's precomputed sort permutation, no re-sort
+                mode = "newest" if sort_mode == "Relevance" else sort_mode.lower()
+                candidates = facets.sorted_jobs(bits, mode, listed if ranked else None)
+            filtered = [j for j in candidates if _job_matches(j, False, query, matched)]
+            if not preview:
+                _show_facet_counts(facets.counts(selection, SIDEBAR_FACETS, base))
+            return filtered
+        # Client-side filtering fallback
+        filtered = [j for j in listed if _job_matches(j, True, query, matched)]
+        if preview:
+            return filtered
         if sort_mode == "Company":
-            filtered.sort(key=lambda j: _text(j.get("company")))
+            filtered.sort(key=lambda j: sort_text(j.get("company")))
         elif sort_mode == "Title":
-            filtered.sort(key=lambda j: _text(j.get("title") or j.get("job_title")))
+            filtered.sort(key=lambda j: sort_text(j.get("title") or j.get("job_title")))
+        elif sort_mode == "Relevance" and index_search:
+            pass  # full-text results are already in BM25 order
         else:  # Newest
             filtered.sort(key=_extract_timestamp, reverse=True)
         return filtered
@@ -195,7 +280,7 @@ def jobs_page():
             q = {}
             if search_query:
                 q["search"] = search_query
-            if sort_mode and sort_mode != "Newest":
+            if sort_mode and sort_mode != "Relevance":
                 q["sort"] = sort_mode
             query = ("?" + urlencode(q)) if q else ""
             js = (
@@ -216,7 +301,7 @@ def jobs_page():
             with ui.card().classes("w-[min(90vw,700px)] p-0"):
                 # Header image
                 if job.get("flyer"):
-                    ui.image(job.get("flyer")).classes("w-full h-56 object-cover rounded-t-xl")
+                    create_flyer_image(job.get("flyer"), "w-full h-56 object-cover rounded-t-xl", MODAL_SIZES)
                 else:
                     with ui.element("div").classes("w-full h-56 rounded-t-xl bg-gray-100 flex items-center justify-center border-b border-gray-200"):
                         ui.icon("insert_photo", size="2.5rem").classes("text-gray-400")
@@ -323,15 +408,15 @@ def jobs_page():
             return "company:asc"
         if mode == "Title":
             return "title:asc"
-        return "created_at:desc"  # Newest
+        return "created_at:desc"  # Newest (and Relevance, which only the local index ranks)
 
-    def _build_filters(include_pagination: bool = False) -> dict:
+    def _build_filters(query) -> dict:
         f = {}
-        if search_query:
+        if query:
             # Send common alternatives; server will ignore unknowns
-            f["search"] = search_query
-            f["q"] = search_query
-            f["keyword"] = search_query
+            f["search"] = query
+            f["q"] = query
+            f["keyword"] = query
         # Sort hint for server
         f["sort"] = _translate_sort_for_server(sort_mode)
         # Sidebar filters -> server
@@ -355,42 +440,36 @@ def jobs_page():
         except Exception:
             pass
         try:
-            if remote_checkbox.value:
-                f["remote"] = True
+            comp = (company_select.value or "All")
+            if comp and comp != "All":
+                f["company"] = comp
         except Exception:
             pass
         try:
-            if 'salary_min_input' in locals() and salary_min_input.value not in (None, ""):
-                f["min_salary"] = int(float(salary_min_input.value))
+            if remote_checkbox.value:
+                f["remote"] = True
         except Exception:
             pass
         try:
-            if 'salary_max_input' in locals() and salary_max_input.value not in (None, ""):
-                f["max_salary"] = int(float(salary_max_input.value))
+            low, high = _salary_bounds()
+            if low is not None:
+                f["min_salary"] = int(low)
+            if high is not None:
+                f["max_salary"] = int(high)
         except Exception:
             pass
-        if include_pagination:
-            f["page"] = page
-            f["limit"] = items_per_page
         return f
 
-    def _analyze_meta_and_set_paging(meta: dict, batch_count: int):
-        nonlocal server_paging
-        # Consider server paging active if meta hints at pagination or batch size equals page size
-        if meta and ("total" in meta or "page" in meta or "limit" in meta or "next" in meta or "prev" in meta):
-            server_paging = True
-        elif batch_count == items_per_page:
-            server_paging = True
-        else:
-            server_paging = False
-
-    def _server_fetch(reset: bool = False):
-        nonlocal jobs
-        filters = _build_filters(include_pagination=True)
-        result = api_service.get_jobs_with_meta(filters)
-        batch = result.get("jobs", [])
-        meta = result.get("meta", {})
-        _analyze_meta_and_set_paging(meta, len(batch))
+    async def _server_page(query, number: int):
+        # Pages of the same query are shared and the next one is already being prefetched
+        pager = api_service.paginate(_build_filters(query), items_per_page)
+        return await pager.get_page(number), pager.has_page(number + 1)
+
+    async def _server_fetch(reset: bool = False):
+        nonlocal jobs, server_paging, from_server
+        batch, more = await _server_page(search_query, page)
+        from_server = True
+        server_paging = more
         if reset:
             jobs = batch
         else:
@@ -398,22 +477,37 @@ def jobs_page():
             seen = {j.get("id") for j in jobs}
             jobs.extend([b for b in batch if b.get("id") not in seen])
 
-    def _refetch_from_server_if_needed():
-        nonlocal jobs, last_server_query, page
-        q = _text(search_query)
+    async def _results_for(query):
+        """Results for search text query as (jobs, index_search, from_server, server_paging, last_server_query),
+        or None when the ones on the page still answer it. Reads the page state, never assigns it."""
+        q = _text(query)
         try:
-            # Only query server when search has at least 2 chars to avoid noisy calls
+            # Only search when the query has at least 2 chars to avoid noisy calls
             if q and len(q) >= 2 and q != _text(last_server_query or ""):
-                page = 1
-                _server_fetch(reset=True)
-                last_server_query = search_query
-            # When search is cleared, refresh from server once to reset
+                # Ranked full-text search over the catalog; the server search is the fallback
+                hits = await job_catalog.search_jobs(q)
+                if hits is None:
+                    batch, more = await _server_page(query, 1)
+                    return batch, False, True, more, query
+                return hits, True, False, False, query
+            # When search is cleared, reload the full listing once to reset
             if not q and last_server_query is not None:
-                page = 1
-                _server_fetch(reset=True)
-                last_server_query = None
+                if index_search:
+                    return await fetch_jobs(), False, False, False, None
+                batch, more = await _server_page(query, 1)
+                return batch, False, True, more, None
         except Exception as ex:
             print(f"Server search fallback due to error: {ex}")
+        return None
+
+    def _use_results(query, found):
+        # The only place a search run assigns the page state: after its last await, so a run
+        # superseded (cancelled) while awaiting leaves the page as it was
+        nonlocal search_query, page, jobs, index_search, from_server, server_paging, last_server_query
+        search_query = query
+        page = 1
+        if found is not None:
+            jobs, index_search, from_server, server_paging, last_server_query = found
 
     # ---------------------- UI ----------------------
     with ui.element("div").classes("container mx-auto px-6 py-8"):
@@ -436,7 +530,7 @@ def jobs_page():
                     location_input = ui.input(label="Location", placeholder="e.g., Remote or City").props("dense").classes("w-full mb-3")
 
                     # Job Type
-                    job_type_select = ui.select(["All", "Full-time", "Part-time", "Contract", "Internship", "Temporary"], value="All", label="Job Type").props("dense").classes("w-full mb-3")
+                    job_type_select = ui.select(["All", *JOB_TYPES], value="All", label="Job Type").props("dense").classes("w-full mb-3")
 
                     # Category
                     try:
@@ -445,13 +539,16 @@ def jobs_page():
                         categories = []
                     category_select = ui.select(["All", *categories], value="All", label="Category").props("dense").classes("w-full mb-3")
 
+                    # Company
+                    company_select = ui.select(["All"], value="All", label="Company").props("dense").classes("w-full mb-3")
+
                     # Remote only
                     remote_checkbox = ui.checkbox("Remote only").classes("mb-3")
 
-                    # # Salary range
-                    # with ui.row().classes("gap-3"):
-                    #     salary_min_input = ui.number(label="Min Salary", format="%.0f").props("dense").classes("w-1/2")
-                    #     salary_max_input = ui.number(label="Max Salary", format="%.0f").props("dense").classes("w-1/2")
+                    # Salary range
+                    with ui.row().classes("gap-3 no-wrap"):
+                        salary_min_input = ui.number(label="Min Salary", format="%.0f", min=0).props("dense").classes("w-1/2")
+                        salary_max_input = ui.number(label="Max Salary", format="%.0f", min=0).props("dense").classes("w-1/2")
 
                     with ui.row().classes("justify-between mt-4"):
                         ui.button("Reset", on_click=lambda: _reset_filters()).props("outline").style("border-color: #2b3940 !important; color: #2b3940 !important;").classes("hover:bg-[#2b3940] hover:text-white")
@@ -461,95 +558,111 @@ def jobs_page():
             with ui.element("div").classes("order-2 lg:order-2 lg:col-span-3"):
                 with ui.row().classes("items-center justify-between gap-4 mb-2 flex-wrap"):
                     # Count label
-                    count_label = ui.label().classes("text-sm text-gray-600")
-                    sort_select = ui.select(["Newest", "Company", "Title"], value=sort_mode, label="Sort by").props("dense").classes("w-full md:w-44")
+                    with ui.row().classes("items-baseline gap-2"):
+                        count_label = ui.label().classes("text-sm text-gray-600")
+                        # Time-to-results of the last search (keystroke to rendered)
+                        timing_label = ui.label().classes("text-xs text-gray-400")
+                    sort_select = ui.select(["Relevance", "Newest", "Company", "Title"], value=sort_mode, label="Sort by").props("dense").classes("w-full md:w-44")
+                # "Did you mean" / "Showing results for" when a search found nothing as typed
+                correction_row = ui.row().classes("items-baseline gap-1 text-sm text-gray-600 mb-2")
+                correction_row.set_visibility(False)
 
                 # Grid container and dialog setup
-                grid = ui.element("div").classes("grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6 mt-2")
-                load_more_row = ui.row().classes("justify-center mt-6")
+                # Only the cards near the viewport exist; the next server page loads while scrolling
+                results = VirtualGrid(
+                    render=lambda j: _render_card(j),
+                    key=lambda j: str(j.get("id")),
+                    version=lambda j: _card_version(j),
+                    grid_classes="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6 mt-2",
+                    on_near_end=lambda: _load_next_page(),
+                )
+                empty_label = ui.label("No jobs available").classes("w-full text-center text-gray-500 mt-6")
+                empty_label.set_visibility(False)
+                with ui.row().classes("w-full justify-center mt-6") as loading_row:
+                    ui.spinner(size="lg").style("color: #00b074")
+                loading_row.set_visibility(False)
 
                 dialog = ui.dialog()
                 with dialog:
                     dialog_container = ui.element("div")
 
     # ---------------------- Actions ----------------------
-    def _refresh():
-        nonlocal loaded_count
+    def _card_version(job: dict):
+        # Cards are reused across refreshes while what they show is unchanged
+        return tuple(str(job.get(field)) for field in CARD_FIELDS)
+
+    def _render_card(job: dict):
+        # Clickable card for quick view
+        # Fixed height: the virtual grid sizes its spacers in whole card rows
+        card = ui.element("div").classes("bg-white rounded-xl shadow-sm border border-gray-200 p-4 cursor-pointer hover:shadow-md transition-shadow flex flex-col justify-between h-[460px] overflow-hidden").on("click", lambda e=None, j=job: _open_quick_view(j))
+        with card:
+            with ui.column().classes("w-full space-y-4"):
+                # EXACT flyer code from Manage Jobs (preserved) + skeleton shimmer + status badge
+                if job.get("flyer"):
+                    with ui.element("div").classes("relative w-full h-40 rounded-md overflow-hidden"):
+                        skeleton = ui.element("div").classes("absolute inset-0 animate-pulse bg-gray-200")
+                        # EXACT vendor image classes preserved
+                        img = create_flyer_image(job.get("flyer"), "w-full h-40 object-cover rounded-md")
+                        img.on("load", lambda e=None, sk=skeleton: sk.delete())
+                        # Active/Closed status badge on top right of flyer
+                        active = _is_active(job)
+                        badge_color = "bg-[#00b074] text-white" if active else "bg-gray-500 text-white"
+                        with ui.element("div").classes(f"absolute top-2 right-2 px-2 py-1 rounded-full text-xs font-medium {badge_color}"):
+                            ui.label("Active" if active else "Closed")
+                else:
+                    # Placeholder with the same size to preserve layout + status badge
+                    with ui.element("div").classes("relative w-full h-40 rounded-md bg-gray-100 flex items-center justify-center border border-gray-200"):
+                        ui.icon("insert_photo", size="2rem").classes("text-gray-400")
+                        # Active/Closed status badge on top right of placeholder
+                        active = _is_active(job)
+                        badge_color = "bg-[#00b074] text-white" if active else "bg-gray-500 text-white"
+                        with ui.element("div").classes(f"absolute top-2 right-2 px-2 py-1 rounded-full text-xs font-medium {badge_color}"):
+                            ui.label("Active" if active else "Closed")
+
+                with ui.column().classes("space-y-1"):
+                    ui.label(job.get("title") or job.get("job_title", "Unknown")).classes("font-semibold text-lg text-[#2b3940] line-clamp-2")
+                    ui.label(job.get("company", "N/A")).classes("text-sm text-gray-600 truncate")
+                    ui.label(job.get("location", "N/A")).classes("text-sm text-gray-500 truncate")
+                    # Where the search terms matched (full-text results only)
+                    if job.get("search_snippet"):
+                        ui.html(highlight_html(job["search_snippet"])).classes("text-xs text-gray-500 line-clamp-2 [&_mark]:bg-[#e6f7f1] [&_mark]:text-[#2b3940]")
+
+                with ui.row().classes("justify-between text-sm"):
+                    with ui.row().classes("items-center space-x-1"):
+                        ui.icon("people", size="1rem").classes("text-[#00b074]")
+                        ui.label(f"{job.get('application_count', 0)} applications").classes("text-gray-600")
+                    with ui.row().classes("items-center space-x-1"):
+                        ui.icon("visibility", size="1rem").classes("text-[#00b074]")
+                        ui.label(f"{job.get('view_count', 0)} views").classes("text-gray-600")
+
+            with ui.row().classes("w-full justify-center items-center pt-4 border-t border-gray-100 mt-4 space-x-3"):
+                ui.button("View", on_click=lambda j=job: _open_quick_view(j)).style("background-color: #00b074 !important; color: white !important; font-size: 0.75rem !important; padding: 0.25rem 0.75rem !important;")
+                ui.button("Save", on_click=lambda j=job: ui.notify("Saved to Favourite")).props("outline").style("border-color: #2b3940 !important; color: #2b3940 !important; font-size: 0.75rem !important; padding: 0.25rem 0.75rem !important;")
+        return card
+
+    def _refresh(keep_position: bool = False):
         filtered = _apply_filters()
         count_label.set_text(f"Jobs ({len(filtered)})")
 
-        grid.clear()
-
-        for job in filtered[:loaded_count]:
-            # Clickable card for quick view
-            with grid:
-                card = ui.element("div").classes("bg-white rounded-xl shadow-sm border border-gray-200 p-4 cursor-pointer hover:shadow-md transition-shadow flex flex-col justify-between").on("click", lambda e=None, j=job: _open_quick_view(j))
-                with card:
-                    with ui.column().classes("w-full space-y-4"):
-                        # EXACT flyer code from Manage Jobs (preserved) + skeleton shimmer + status badge
-                        if job.get("flyer"):
-                            with ui.element("div").classes("relative w-full h-40 rounded-md overflow-hidden"):
-                                skeleton = ui.element("div").classes("absolute inset-0 animate-pulse bg-gray-200")
-                                # EXACT vendor image classes preserved
-                                img = ui.image(job.get("flyer")).classes("w-full h-40 object-cover rounded-md")
-                                img.on("load", lambda e=None, sk=skeleton: sk.delete())
-                                # Active/Closed status badge on top right of flyer
-                                active = _is_active(job)
-                                badge_color = "bg-[#00b074] text-white" if active else "bg-gray-500 text-white"
-                                with ui.element("div").classes(f"absolute top-2 right-2 px-2 py-1 rounded-full text-xs font-medium {badge_color}"):
-                                    ui.label("Active" if active else "Closed")
-                        else:
-                            # Placeholder with the same size to preserve layout + status badge
-                            with ui.element("div").classes("relative w-full h-40 rounded-md bg-gray-100 flex items-center justify-center border border-gray-200"):
-                                ui.icon("insert_photo", size="2rem").classes("text-gray-400")
-                                # Active/Closed status badge on top right of placeholder
-                                active = _is_active(job)
-                                badge_color = "bg-[#00b074] text-white" if active else "bg-gray-500 text-white"
-                                with ui.element("div").classes(f"absolute top-2 right-2 px-2 py-1 rounded-full text-xs font-medium {badge_color}"):
-                                    ui.label("Active" if active else "Closed")
-
-                        with ui.column().classes("space-y-1"):
-                            ui.label(job.get("title") or job.get("job_title", "Unknown")).classes("font-semibold text-lg text-[#2b3940]")
-                            ui.label(job.get("company", "N/A")).classes("text-sm text-gray-600")
-                            ui.label(job.get("location", "N/A")).classes("text-sm text-gray-500")
-
-                        with ui.row().classes("justify-between text-sm"):
-                            with ui.row().classes("items-center space-x-1"):
-                                ui.icon("people", size="1rem").classes("text-[#00b074]")
-                                ui.label(f"{job.get('application_count', 0)} applications").classes("text-gray-600")
-                            with ui.row().classes("items-center space-x-1"):
-                                ui.icon("visibility", size="1rem").classes("text-[#00b074]")
-                                ui.label(f"{job.get('view_count', 0)} views").classes("text-gray-600")
-
-                    with ui.row().classes("w-full justify-center items-center pt-4 border-t border-gray-100 mt-4 space-x-3"):
-                        ui.button("View", on_click=lambda j=job: _open_quick_view(j)).style("background-color: #00b074 !important; color: white !important; font-size: 0.75rem !important; padding: 0.25rem 0.75rem !important;")
-                        ui.button("Save", on_click=lambda j=job: ui.notify("Saved to Favourite")).props("outline").style("border-color: #2b3940 !important; color: #2b3940 !important; font-size: 0.75rem !important; padding: 0.25rem 0.75rem !important;")
-
-        # Load more control
-        load_more_row.clear()
-        # If server paging active, always show load more when last batch likely not final
-        show_load_more = False
-        if server_paging:
-            show_load_more = True
-        else:
-            show_load_more = len(filtered) > loaded_count
-        if show_load_more:
-            with load_more_row:
-                ui.button("Load more", on_click=lambda: _load_more()).props("outline").style("border-color: #2b3940 !important; color: #2b3940 !important; padding-left: 1.5rem !important; padding-right: 1.5rem !important;")
+        # Only the window around the viewport is rendered, reusing the cards already shown
+        results.set_items(filtered, keep_position)
+        empty_label.set_visibility(not filtered)
+        # More server pages follow as the user scrolls
+        loading_row.set_visibility(bool(server_paging))
         # Update URL after refresh
         _push_url_state()
 
-    def _load_more():
-        nonlocal loaded_count, page
-        if server_paging:
-            page += 1
-            try:
-                _server_fetch(reset=False)
-            except Exception as ex:
-                print(f"Server paging fallback due to error: {ex}")
-        else:
-            loaded_count += items_per_page
-        _refresh()
+    async def _load_next_page():
+        # Called by the results grid as the user scrolls near the end (the pager prefetches ahead)
+        nonlocal page
+        if not server_paging:
+            return
+        page += 1
+        try:
+            await _server_fetch(reset=False)
+        except Exception as ex:
+            print(f"Server paging fallback due to error: {ex}")
+        _refresh(keep_position=True)
 
     def _open_quick_view(job: dict):
         dialog_container.clear()
@@ -557,7 +670,7 @@ def jobs_page():
             with ui.card().classes("w-[min(90vw,700px)] p-0"):
                 # Header image
                 if job.get("flyer"):
-                    ui.image(job.get("flyer")).classes("w-full h-56 object-cover rounded-t-xl")
+                    create_flyer_image(job.get("flyer"), "w-full h-56 object-cover rounded-t-xl", MODAL_SIZES)
                 else:
                     with ui.element("div").classes("w-full h-56 rounded-t-xl bg-gray-100 flex items-center justify-center border-b border-gray-200"):
                         ui.icon("insert_photo", size="2.5rem").classes("text-gray-400")
@@ -579,33 +692,70 @@ def jobs_page():
 
         dialog.open()
 
+    # ---------------------- Search pipeline ----------------------
+    async def _run_query(text: str):
+        # Results are fetched into locals and only assigned by _use_results at the end
+        query = _text(text)
+        found = await _results_for(query)
+        correction = None
+        # Nothing found: offer the closest catalog spelling, or with SEARCH_AUTOCORRECT search for it
+        if query and query != _text(exact_query) and not _apply_filters(query, found):
+            corrected = await job_catalog.correct_query(query)
+            if corrected and not SEARCH_AUTOCORRECT:
+                correction = (query, corrected, False)
+            elif corrected:
+                correction = (query, corrected, True)
+                query = corrected
+                found = await _results_for(corrected)
+        _use_results(query, found)
+        return correction
+
+    def _show_results(text: str, correction, timing: dict):
+        _refresh()
+        timing_label.set_text(f"in {timing['total_ms']:,.0f} ms" if _text(text) else "")
+        _show_correction(correction)
+
+    def _show_correction(correction):
+        correction_row.clear()
+        correction_row.set_visibility(bool(correction))
+        if not correction:
+            return
+        original, corrected, applied = correction
+        link_classes = "text-[#00b074] font-medium underline cursor-pointer"
+        with correction_row:
+            if applied:
+                ui.label("Showing results for")
+                ui.label(corrected).classes("font-semibold text-[#2b3940]")
+                ui.label("· Search instead for")
+                ui.label(original).classes(link_classes).on("click", lambda: _search_exactly(original))
+            else:
+                ui.label("Did you mean")
+                ui.label(corrected).classes(link_classes).on("click", lambda: _search_corrected(corrected))
+                ui.label("?")
+
+    def _search_exactly(text: str):
+        nonlocal exact_query
+        exact_query = text
+        search.submit(text, 0)
+
+    def _search_corrected(text: str):
+        search_input.set_value(text)
+        _on_search_change(delay=0)
+
+    search = LatestQuery(_run_query, _show_results, delay=debounce_delay)
+
     # Wire up controls
-    def _on_search_change():
-        nonlocal search_query, loaded_count, _dirty, _due
-        search_query = _text(search_input.value)
-        loaded_count = items_per_page
-        _dirty = True
-        _due = monotonic() + debounce_delay
+    def _on_search_change(delay=None):
+        search.submit(search_input.value or "", delay)
 
     def _on_sort_change():
-        nonlocal sort_mode, loaded_count
+        nonlocal sort_mode
         sort_mode = sort_select.value or "Newest"
-        loaded_count = items_per_page
         _refresh()
 
-    def _debounce_tick():
-        nonlocal _dirty
-        if _dirty and monotonic() >= _due:
-            _dirty = False
-            _refetch_from_server_if_needed()
-            _refresh()
-
     def _on_filters_change():
-        nonlocal loaded_count, page
-        loaded_count = items_per_page
-        page = 1
-        _refetch_from_server_if_needed()
-        _refresh()
+        # Same pipeline as typing, without the wait: an older search still running is dropped
+        _on_search_change(delay=0)
 
     def _reset_filters():
         try:
@@ -616,6 +766,7 @@ def jobs_page():
             location_input.set_value("")
             job_type_select.set_value("All")
             category_select.set_value("All")
+            company_select.set_value("All")
             remote_checkbox.set_value(False)
             salary_min_input.set_value(None)
             salary_max_input.set_value(None)
@@ -623,15 +774,19 @@ def jobs_page():
             pass
         _on_filters_change()
 
-    search_input.on("change", lambda e: _on_search_change())
-    # Update on typing with debounce
-    search_input.on("keydown", lambda e: _on_search_change())
+    # Every edit (typing, clearing) schedules a debounced search; Enter searches right away
+    search_input.on("update:model-value", lambda e: _on_search_change())
+    search_input.on("keydown.enter", lambda e: _on_search_change(delay=0))
+    # Typeahead: picking a suggestion searches for it (or filters by it) right away
+    SuggestionDropdown(search_input, on_pick=lambda s: _on_search_change(delay=0))
+    SuggestionDropdown(location_input, kinds=("location",), on_pick=lambda s: _on_filters_change())
     sort_select.on("change", lambda e: _on_sort_change())
     # Sidebar filters
     try:
         location_input.on("change", lambda e: (_on_filters_change()))
         job_type_select.on("change", lambda e: (_on_filters_change()))
         category_select.on("change", lambda e: (_on_filters_change()))
+        company_select.on("change", lambda e: (_on_filters_change()))
         remote_checkbox.on("change", lambda e: (_on_filters_change()))
         salary_min_input.on("change", lambda e: (_on_filters_change()))
         salary_max_input.on("change", lambda e: (_on_filters_change()))
@@ -645,64 +800,22 @@ def jobs_page():
             search_input.set_value(search_query)
         except Exception:
             pass
+    if initial_location:
+        try:
+            location_input.set_value(initial_location)
+        except Exception:
+            pass
     # ensure sort_mode is valid
-    if sort_mode not in {"Newest", "Company", "Title"}:
-        sort_mode = "Newest"
+    if sort_mode not in {"Relevance", "Newest", "Company", "Title"}:
+        sort_mode = "Relevance"
     try:
         sort_select.set_value(sort_mode)
     except Exception:
         pass
 
-    # Start debounce timer (temporarily disabled for debugging)
-    # ui.timer(0.15, _debounce_tick)
-
-    # Initial render with flyers and modal
-    if not jobs:
-        with grid:
-            ui.label("No jobs available").classes("text-center text-gray-500 col-span-full")
-    else:
-        # Show jobs with flyers
-        for i, job in enumerate(jobs[:9]):  # Show 9 jobs (3x3 grid)
-            with grid:
-                # Clickable card for quick view
-                card = ui.element("div").classes("bg-white rounded-xl shadow-sm border border-gray-200 p-4 cursor-pointer hover:shadow-md transition-shadow flex flex-col justify-between").on("click", lambda e=None, j=job: _open_quick_view(j))
-                with card:
-                    with ui.column().classes("w-full space-y-4"):
-                        # EXACT flyer code from Manage Jobs (preserved) + skeleton shimmer + status badge
-                        if job.get("flyer"):
-                            with ui.element("div").classes("relative w-full h-40 rounded-md overflow-hidden"):
-                                skeleton = ui.element("div").classes("absolute inset-0 animate-pulse bg-gray-200")
-                                # EXACT vendor image classes preserved
-                                img = ui.image(job.get("flyer")).classes("w-full h-40 object-cover rounded-md")
-                                img.on("load", lambda e=None, sk=skeleton: sk.delete())
-                                # Active/Closed status badge on top right of flyer
-                                active = _is_active(job)
-                                badge_color = "bg-[#00b074] text-white" if active else "bg-gray-500 text-white"
-                                with ui.element("div").classes(f"absolute top-2 right-2 px-2 py-1 rounded-full text-xs font-medium {badge_color}"):
-                                    ui.label("Active" if active else "Closed")
-                        else:
-                            # Placeholder with the same size to preserve layout + status badge
-                            with ui.element("div").classes("relative w-full h-40 rounded-md bg-gray-100 flex items-center justify-center border border-gray-200"):
-                                ui.icon("insert_photo", size="2rem").classes("text-gray-400")
-                                # Active/Closed status badge on top right of placeholder
-                                active = _is_active(job)
-                                badge_color = "bg-[#00b074] text-white" if active else "bg-gray-500 text-white"
-                                with ui.element("div").classes(f"absolute top-2 right-2 px-2 py-1 rounded-full text-xs font-medium {badge_color}"):
-                                    ui.label("Active" if active else "Closed")
-
-                        with ui.column().classes("space-y-1"):
-                            ui.label(job.get("title") or job.get("job_title", "Unknown")).classes("font-semibold text-lg text-[#2b3940]")
-                            ui.label(job.get("company", "N/A")).classes("text-sm text-gray-600")
-                            ui.label(job.get("location", "N/A")).classes("text-sm text-gray-500")
-
-                        with ui.row().classes("justify-between text-sm"):
-                            with ui.row().classes("items-center space-x-1"):
-                                ui.icon("people", size="1rem").classes("text-[#00b074]")
-                                ui.label(f"{job.get('application_count', 0)} applications").classes("text-gray-600")
-                            with ui.row().classes("items-center space-x-1"):
-                                ui.icon("visibility", size="1rem").classes("text-[#00b074]")
-                                ui.label(f"{job.get('view_count', 0)} views").classes("text-gray-600")
-
-                    with ui.row().classes("w-full justify-center items-center pt-4 border-t border-gray-100 mt-4 space-x-3"):
-                        ui.button("View", on_click=lambda j=job: _open_quick_view(j)).style("background-color: #00b074 !important; color: white !important; font-size: 0.75rem !important; padding: 0.25rem 0.75rem !important;")
-                        ui.button("Save", on_click=lambda j=job: ui.notify("Saved")).props("outline").style("border-color: #2b3940 !important; color: #2b3940 !important; font-size: 0.75rem !important; padding: 0.25rem 0.75rem !important;")
\ No newline at end of file
+    # Initial render with flyers and modal (also fills the live counts next to the sidebar filters)
+    if search_query or initial_location:
+        # Arrived with a query (e.g. from the home page search box): show the ranked matches,
+        # corrected like a typed search when nothing matches as spelled
+        _show_correction(await _run_query(search_query))
+    _refresh()
@@ -1,29 +1,41 @@
+import logging
 import requests
 import os
-from typing import Dict, List, Optional, Any
-from pydantic import BaseModel
+import sqlite3
+from typing import Dict, Iterator, List, Optional, Any, Tuple, Union
 from .sample_data import get_sample_jobs, get_company_logos, get_sample_applicants
+from .http_client import get_session
+from .single_flight import request_key
+from .validator_cache import validator_cache
+from .circuit_breaker import CircuitOpenError, circuit_breakers
+from .last_known_good import last_known_good
+from .job_normalizer import normalize_job, normalize_jobs, parse_salary, salary_bounds
+from .job_records import JobRecord, job_records, parse_job_records
+from .job_stream import STREAM_CHUNK_SIZE, iter_json_jobs
+from .flyer_upload import MultipartBody, Progress, SpooledFlyer
+from .job_store import job_read_mode, job_store
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_BASE_URL = 'https://advertisement-management-api-91xh.onrender.com/api'
+
+
+def api_base_url() -> str:
+    """Upstream API base URL (read when needed, so values loaded from .env apply)"""
+    return os.getenv('API_BASE_URL', DEFAULT_API_BASE_URL).rstrip('/')
 
-class Job(BaseModel):
-    id: Optional[str] = None
-    title: str
-    company: str
-    location: str
-    description: str
-    requirements: str
-    salary: Optional[str] = None
-    job_type: str  # full-time, part-time, contract, etc.
-    category: str
-    posted_date: Optional[str] = None
-    vendor_id: Optional[str] = None
 
 class APIService:
-    def __init__(self):
-        self.base_url = os.getenv('API_BASE_URL', 'https://advertisement-management-api-91xh.onrender.com/api').rstrip('/').rstrip('/')
+    def __init__(self, read_mode: Optional[str] = None):
+        self.base_url = api_base_url()
+        # 'api' or 'mirror' (answer reads from the local SQLite mirror); None follows JOB_READ_MODE
+        self.read_mode = read_mode
         self.api_key = os.getenv('API_KEY', '')
         self.default_headers = {
             'Content-Type': 'application/json'
         }
+        # Pooled keep-alive session shared with the auth services
+        self.http = get_session()
         # Note: Authentication now handled by enhanced auth_service with Bearer tokens
     
     def _get_auth_headers(self) -> Dict[str, str]:
@@ -61,184 +73,258 @@ class APIService:
 
     def _normalize_job(self, job: Dict) -> Dict:
         """Normalizes a job dictionary to a standard format."""
-        print(f"DEBUG: _normalize_job called with keys: {list(job.keys()) if job else 'None'}")
-        print(f"DEBUG: _normalize_job input: {job}")
-
-        salary = ""
-        if 'salary_min' in job and 'salary_max' in job:
-            salary = f"${job['salary_min']:,.0f} - ${job['salary_max']:,.0f}"
-        elif 'min_salary' in job and 'max_salary' in job:
-            salary = f"${job['min_salary']:,.0f} - ${job['max_salary']:,.0f}"
-        elif 'salary' in job:
-            # Handle case where salary is a single string
-            salary = job['salary']
-
-        # Debug: Check what description fields are available
-        description_value = (job.get('description') or
-                           job.get('job_description') or
-                           job.get('jobDetail') or
-                           job.get('details') or
-                           'Job description not available')
-
-        company_value = (job.get('company') or
-                        job.get('company_name') or
-                        job.get('employer') or
-                        'Company not specified')
-
-        title_value = (job.get('title') or
-                      job.get('job_title') or
-                      job.get('jobTitle') or
-                      'Untitled Job')
-
-        print(f"DEBUG: Description mapping - description: '{job.get('description')}', job_description: '{job.get('job_description')}', final: '{description_value}'")
-        print(f"DEBUG: Company mapping - company: '{job.get('company')}', company_name: '{job.get('company_name')}', final: '{company_value}'")
-        print(f"DEBUG: Title mapping - title: '{job.get('title')}', job_title: '{job.get('job_title')}', final: '{title_value}'")
-
-        # Normalize flyer URL from various possible API fields
-        flyer_value = (job.get('flyer') or
-                       job.get('flyer_url') or job.get('flyerUrl') or
-                       job.get('image') or job.get('image_url') or job.get('imageUrl') or
-                       job.get('banner') or job.get('banner_url') or job.get('file_url') or job.get('file'))
-        flyer_value = self._to_absolute_url(flyer_value) if flyer_value else None
-
-        normalized = {
-            'id': job.get('id') or job.get('_id') or job.get('job_id'),
-            'title': title_value,
-            'company': company_value,
-            'location': (job.get('location') or
-                        job.get('job_location') or
-                        job.get('city') or
-                        'Location not specified'),
-            'description': description_value,
-            'requirements': (job.get('requirements') or
-                           job.get('job_requirements') or
-                           job.get('qualifications') or
-                           ''),
-            'salary': salary,
-            'job_type': (job.get('job_type') or
-                        job.get('employment_type') or
-                        job.get('type') or
-                        'Full-time'),
-            'category': (job.get('category') or
-                        job.get('job_category') or
-                        'Technology'),  # Use Technology as default instead of General
-            'posted_date': (job.get('date_posted') or
-                           job.get('posted_date') or
-                           job.get('created_at') or
-                           'Recently'),
-            'flyer': flyer_value,
-        }
+        return normalize_job(job, self._to_absolute_url)
+
+    def _normalize_jobs(self, raw_jobs: List[Dict]) -> List[Dict]:
+        """Normalize a batch of jobs with the compiled per-shape normalizer."""
+        return normalize_jobs(raw_jobs, self._to_absolute_url)
 
-        print(f"DEBUG: _normalize_job output: {normalized}")
-        return normalized
+    def _extract_jobs(self, data: Any) -> Tuple[List[Dict], Dict[str, Any]]:
+        """Split a /jobs payload into (raw job list, metadata).
+
+        Supports both a bare list and dict shapes wrapping the list in
+        'data', 'jobs' or 'results'; any other dict fields are kept as meta.
+        """
+        if isinstance(data, list):
+            return data, {}
+        if isinstance(data, dict):
+            raw_jobs = data.get('data') or data.get('jobs') or data.get('results') or []
+            meta = {k: v for k, v in data.items() if k not in ('data', 'jobs', 'results')}
+            return raw_jobs, meta
+        return [], {}
+
+    def _unwrap_job(self, job_data: Any) -> Optional[Dict]:
+        """Return the job dict from a /jobs/{id} payload (some APIs wrap it in {'data': {...}})"""
+        if not isinstance(job_data, dict):
+            return None
+        if 'data' in job_data and isinstance(job_data.get('data'), dict):
+            return job_data['data']
+        return job_data
+
+    def _multipart_headers(self) -> Dict[str, str]:
+        """Auth headers without Content-Type so the HTTP client can set the multipart boundary"""
+        headers = self._get_auth_headers().copy()
+        headers.pop('Content-Type', None)
+        return headers
+
+    def _upload_payload(self, data: Dict, file: Optional[Any],
+                        progress: Optional[Progress] = None) -> Tuple[Any, Dict[str, str]]:
+        """Request body and headers for a job form with an optional flyer.
+
+        Without a flyer the form is sent as-is. With one, the flyer is streamed
+        from its temp file as a multipart body; objects that only carry the
+        bytes in .content (name / content_type alongside) are spooled first.
+        """
+        headers = self._multipart_headers()
+        if not file:
+            return data, headers
+        if not isinstance(file, SpooledFlyer):
+            file = SpooledFlyer.spool(file.content, file.name, file.content_type)
+        body = MultipartBody(data, file, progress=progress)
+        return body, {**headers, **body.headers}
     
-    def get_jobs(self, filters: Optional[Dict] = None) -> List[Dict]:
-        """Fetch all jobs with optional filters"""
+    def _conditional_get(self, endpoint: str, path: str, params: Optional[Dict], headers: Dict[str, str]):
+        """GET that revalidates a previously seen response with its ETag / Last-Modified.
+
+        Returns (cache key, response, cached result). On 304 Not Modified the
+        response is None and the cached normalized result is returned instead.
+        Raises CircuitOpenError without touching the network while the
+        endpoint's circuit is open.
+        """
+        breaker = circuit_breakers.get(endpoint)
+        breaker.before_call()
+        key = request_key('GET', path, params, headers)
+        url = f"{self.base_url}{path}"
         try:
-            params = filters or {}
-            response = requests.get(
-                f"{self.base_url}/jobs",
+            response = self.http.get(
+                url,
                 params=params,
-                headers=self._get_auth_headers(),
+                headers={**headers, **validator_cache.conditional_headers(key)},
                 timeout=10
             )
-            response.raise_for_status()
-            data = response.json()
-            # Support both list and dict API response shapes
-            if isinstance(data, list):
-                raw_jobs = data
-            elif isinstance(data, dict):
-                raw_jobs = data.get('data') or data.get('jobs') or data.get('results') or []
-            else:
-                raw_jobs = []
-            # Normalize each job object to a consistent format
-            return [self._normalize_job(job) for job in raw_jobs]
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching jobs: {e}")
-            # Fallback to sample data when API is not available
-            from .sample_data import get_sample_jobs
-            return get_sample_jobs()
+            if response.status_code == 304:
+                cached = validator_cache.not_modified(key)
+                if cached is not None:
+                    breaker.record_success()
+                    return key, None, cached
+                # Validators outlived the cached body - fetch it unconditionally
+                response = self.http.get(url, params=params, headers=headers, timeout=10)
+        except requests.exceptions.RequestException:
+            breaker.record_failure()
+            raise
+        self._record_status(breaker, response.status_code)
+        response.raise_for_status()
+        return key, response, None
+
+    def _record_status(self, breaker, status_code: int):
+        """Only server errors count against an endpoint's health; 4xx replies are the caller's problem"""
+        if status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+    def _mirror_mode(self) -> bool:
+        return (self.read_mode or job_read_mode()) == 'mirror'
+
+    def _reads_from_mirror(self) -> bool:
+        # ready() queries SQLite until the first sync landed: async callers run this in a worker thread
+        return self._mirror_mode() and job_store.ready()
+
+    def _mirror_jobs(self, params: Optional[Dict]) -> Optional[Dict[str, Any]]:
+        """A /jobs result from the mirror, or None when the API has to answer"""
+        if not self._reads_from_mirror():
+            return None
+        try:
+            return job_store.query_jobs(params)
+        except sqlite3.Error as e:
+            print(f"Error reading jobs from mirror: {e}")
+            return None
+
+    def _mirror_job(self, job_id: str) -> Optional[Dict]:
+        """One job from the mirror; None also for jobs created since the last sync"""
+        if not self._reads_from_mirror():
+            return None
+        try:
+            return job_store.get_job(job_id)
+        except sqlite3.Error as e:
+            print(f"Error reading job {job_id} from mirror: {e}")
+            return None
+
+    def _mirror_applicants(self) -> Optional[List[Dict]]:
+        if not self._reads_from_mirror() or not job_store.has_applicants():
+            return None
+        try:
+            return job_store.get_applicants()
+        except sqlite3.Error as e:
+            print(f"Error reading applicants from mirror: {e}")
+            return None
+
+    def _fallback_jobs(self, params: Optional[Dict], headers: Dict[str, str]) -> Dict[str, Any]:
+        """Last real /jobs result for these params and credentials, or sample jobs if there never was one"""
+        return self._fallback_result(last_known_good.recall(request_key('GET', '/jobs', params, headers)))
+
+    @staticmethod
+    def _fallback_result(last: Optional[Dict]) -> Dict[str, Any]:
+        if last is not None:
+            return {"jobs": list(last["jobs"]), "meta": dict(last["meta"], source="fallback", stale=True)}
+        return {"jobs": get_sample_jobs(), "meta": {"source": "fallback"}}
+
+    @staticmethod
+    def _as_records(result: Dict[str, Any]) -> Dict[str, Any]:
+        """A normalized /jobs result with its jobs as typed JobRecords"""
+        return {"jobs": job_records(result["jobs"]), "meta": dict(result["meta"])}
+
+    def get_jobs(self, filters: Optional[Dict] = None, as_records: bool = False) -> List[Union[Dict, JobRecord]]:
+        """Fetch all jobs with optional filters (typed JobRecords when as_records is set)"""
+        return self.get_jobs_with_meta(filters, as_records=as_records)["jobs"]
 
-    def get_jobs_with_meta(self, filters: Optional[Dict] = None) -> Dict[str, Any]:
+    def get_jobs_with_meta(self, filters: Optional[Dict] = None, as_records: bool = False) -> Dict[str, Any]:
         """Fetch jobs and preserve any metadata returned by the API.
 
         Returns a dict with keys:
-        - 'jobs': List[Dict] normalized jobs
+        - 'jobs': List[Dict] normalized jobs (List[JobRecord] when as_records is set,
+          validated straight from the response bytes; see job_records)
         - 'meta': Dict[Any, Any] extra metadata from the response (may be empty)
         """
+        params = filters or {}
+        mirrored = self._mirror_jobs(params)
+        if mirrored is not None:
+            return self._as_records(mirrored) if as_records else mirrored
+        headers = self._get_auth_headers()
         try:
-            params = filters or {}
-            response = requests.get(
-                f"{self.base_url}/jobs",
-                params=params,
-                headers=self._get_auth_headers(),
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
-            meta: Dict[str, Any] = {}
-            if isinstance(data, list):
-                raw_jobs = data
-            elif isinstance(data, dict):
-                raw_jobs = data.get('data') or data.get('jobs') or data.get('results') or []
-                # retain any other fields as meta
-                meta = {k: v for k, v in data.items() if k not in ('data', 'jobs', 'results')}
-            else:
-                raw_jobs = []
-            jobs = [self._normalize_job(job) for job in raw_jobs]
-            return {"jobs": jobs, "meta": meta}
-        except requests.exceptions.RequestException as e:
+            key, response, result = self._conditional_get('GET /jobs', '/jobs', params, headers)
+            if result is None and as_records:
+                # The validator cache and last known good keep dicts: records are not stored
+                records, meta = parse_job_records(response.content, self._to_absolute_url)
+                return {"jobs": records, "meta": meta}
+            if result is None:
+                raw_jobs, meta = self._extract_jobs(response.json())
+                # Normalize each job object to a consistent format
+                result = {"jobs": self._normalize_jobs(raw_jobs), "meta": meta}
+                validator_cache.store(key, response.headers, result)
+            last_known_good.remember(key, result)
+            if as_records:
+                return self._as_records(result)
+            # Cached results are shared, so hand out fresh containers
+            return {"jobs": list(result["jobs"]), "meta": dict(result["meta"])}
+        except (requests.exceptions.RequestException, CircuitOpenError, ValueError) as e:
             print(f"Error fetching jobs (with meta): {e}")
-            # Fallback retains behavior while offering a minimal meta
-            from .sample_data import get_sample_jobs
-            return {"jobs": get_sample_jobs(), "meta": {"source": "fallback"}}
+            # Serve the last real response (or sample data if there never was one)
+            fallback = self._fallback_jobs(params, headers)
+            return self._as_records(fallback) if as_records else fallback
     
+    def iter_jobs(self, filters: Optional[Dict] = None) -> Iterator[Dict]:
+        """Yield normalized jobs one at a time while the /jobs response is still downloading.
+
+        Unlike get_jobs the body is never held in full, so memory stays bounded
+        by a single record. If the request fails before the first job arrives,
+        the same fallback as get_jobs is streamed instead; a failure mid-stream
+        just ends the iteration.
+        """
+        params = filters or {}
+        headers = self._get_auth_headers()
+        breaker = circuit_breakers.get('GET /jobs')
+        yielded = 0
+        try:
+            breaker.before_call()
+            try:
+                with self.http.get(f"{self.base_url}/jobs", params=params, headers=headers,
+                                   stream=True, timeout=10) as response:
+                    self._record_status(breaker, response.status_code)
+                    response.raise_for_status()
+                    for raw_job in iter_json_jobs(response.iter_content(STREAM_CHUNK_SIZE)):
+                        yield self._normalize_job(raw_job)
+                        yielded += 1
+            except requests.exceptions.HTTPError:
+                raise  # status already recorded above
+            except requests.exceptions.RequestException:
+                breaker.record_failure()
+                raise
+        except (requests.exceptions.RequestException, CircuitOpenError, ValueError) as e:
+            print(f"Error streaming jobs: {e}")
+            if not yielded:
+                yield from self._fallback_jobs(params, headers)["jobs"]
+
     def get_job_by_id(self, job_id: str) -> Optional[Dict]:
         """Fetch a specific job by ID"""
+        mirrored = self._mirror_job(job_id)
+        if mirrored is not None:
+            return mirrored
+        headers = self._get_auth_headers()
         try:
-            print(f"DEBUG: get_job_by_id called with job_id: {job_id}")
-            response = requests.get(
-                f"{self.base_url}/jobs/{job_id}",
-                headers=self._get_auth_headers(),
-                timeout=10
-            )
-            response.raise_for_status()
-            job_data = response.json()
-            print(f"DEBUG: API returned job data: {job_data}")
-            if isinstance(job_data, dict):
-                # Some APIs wrap in {'data': {...}}
-                maybe_job = job_data.get('data') if 'data' in job_data and isinstance(job_data.get('data'), dict) else job_data
+            logger.debug("get_job_by_id called with job_id: %s", job_id)
+            key, response, normalized = self._conditional_get('GET /jobs/{id}', f'/jobs/{job_id}', None, headers)
+            if normalized is None:
+                job_data = response.json()
+                logger.debug("API returned job data: %s", job_data)
+                maybe_job = self._unwrap_job(job_data)
+                if maybe_job is None:
+                    return None
                 normalized = self._normalize_job(maybe_job)
-                print(f"DEBUG: Normalized job data: {normalized}")
-                return normalized
-            return None
-        except requests.exceptions.RequestException as e:
+                logger.debug("Normalized job data: %s", normalized)
+                validator_cache.store(key, response.headers, normalized)
+            last_known_good.remember(key, normalized)
+            return dict(normalized)
+        except (requests.exceptions.RequestException, CircuitOpenError) as e:
             print(f"Error fetching job {job_id}: {e}")
-            return None
+            last = last_known_good.recall(request_key('GET', f'/jobs/{job_id}', None, headers))
+            return dict(last) if last is not None else None
     
-    def create_job(self, job_data: Dict, file: Optional[Any] = None) -> Optional[Dict]:
-        """Create a new job posting with optional file upload."""
+    def create_job(self, job_data: Dict, file: Optional[Any] = None,
+                   progress: Optional[Progress] = None) -> Optional[Dict]:
+        """Create a new job posting with optional file upload (progress gets bytes sent / total)."""
         try:
-            # Get authenticated headers
-            multipart_headers = self._get_auth_headers().copy()
-            # For multipart/form-data, requests sets the Content-Type header automatically.
-            if 'Content-Type' in multipart_headers:
-                del multipart_headers['Content-Type']
-
-            files = None
-            if file:
-                files = {'flyer': (file.name, file.content, file.content_type)}
+            payload, headers = self._upload_payload(job_data, file, progress)
 
             print(f"--- SENDING MULTIPART TO API: {self.base_url}/jobs ---")
             print("DATA:", job_data)
-            print("FILES:", files)
+            print("FILE:", f"{file.name} ({len(payload)} byte body)" if file else None)
             print("--------------------------------------------------")
 
-            response = requests.post(
+            response = self.http.post(
                 f"{self.base_url}/jobs",
-                data=job_data,
-                files=files,
-                headers=multipart_headers,
+                data=payload,
+                headers=headers,
                 timeout=20 # Increased timeout for file upload
             )
             response.raise_for_status()
@@ -252,13 +338,10 @@ class APIService:
             print("--------------------------")
             return None
     
-    def update_job(self, job_id: str, job_data: Dict, file: Optional[Any] = None) -> Optional[Dict]:
-        """Update an existing job posting with optional file upload."""
+    def update_job(self, job_id: str, job_data: Dict, file: Optional[Any] = None,
+                   progress: Optional[Progress] = None) -> Optional[Dict]:
+        """Update an existing job posting with optional file upload (progress gets bytes sent / total)."""
         try:
-            multipart_headers = self._get_auth_headers().copy()
-            if 'Content-Type' in multipart_headers:
-                del multipart_headers['Content-Type']
-
             # Debug: Print what we're receiving
             print(f"DEBUG: update_job called with job_id: {job_id}")
             print(f"DEBUG: job_data keys: {list(job_data.keys()) if job_data else 'None'}")
@@ -269,9 +352,7 @@ class APIService:
 
             print(f"DEBUG: Normalized API data: {api_data}")
 
-            files = None
-            if file:
-                files = {'flyer': (file.name, file.content, file.content_type)}
+            payload, headers = self._upload_payload(api_data, file, progress)
 
             # The API might expect a PUT or POST for updates with multipart.
             # If PUT doesn't work, the API might require POST with a method override, or just POST.
@@ -279,11 +360,10 @@ class APIService:
             print(f"DEBUG: Sending PUT request to {self.base_url}/jobs/{job_id}")
             print(f"DEBUG: API data being sent: {api_data}")
 
-            response = requests.put(
+            response = self.http.put(
                 f"{self.base_url}/jobs/{job_id}",
-                data=api_data,
-                files=files,
-                headers=multipart_headers,
+                data=payload,
+                headers=headers,
                 timeout=20
             )
             response.raise_for_status()
@@ -298,19 +378,10 @@ class APIService:
     
     def _normalize_job_for_api(self, job_data: Dict) -> Dict:
         """Normalize job data for API submission/update"""
-        # Parse salary range if it's a string like "$120,000 - $150,000"
-        min_salary = None
-        max_salary = None
-        if job_data.get('salary'):
-            salary_str = job_data.get('salary', '')
-            # Try to extract numbers from salary string
-            import re
-            numbers = re.findall(r'\d{1,3}(?:,\d{3})*', salary_str.replace('$', '').replace(',', ''))
-            if len(numbers) >= 2:
-                min_salary = int(numbers[0])
-                max_salary = int(numbers[1])
-            elif len(numbers) == 1:
-                min_salary = max_salary = int(numbers[0])
+        # Numeric salary fields win; otherwise parse a string like "$120,000 - $150,000"
+        min_salary, max_salary, _ = salary_bounds(job_data.get('salary_min'), job_data.get('salary_max'))
+        if min_salary is None:
+            min_salary, max_salary, _ = parse_salary(job_data.get('salary'))
 
         # Get current date for date_posted if not provided
         from datetime import datetime
@@ -324,8 +395,8 @@ class APIService:
             "location": job_data.get('location', ''),
             "employment_type": job_data.get('job_type', ''),
             "category": job_data.get('category', ''),
-            "min_salary": min_salary if min_salary is not None else 0,
-            "max_salary": max_salary if max_salary is not None else 0,
+            "min_salary": int(min_salary) if min_salary is not None else 0,
+            "max_salary": int(max_salary) if max_salary is not None else 0,
             "benefits": job_data.get('benefits', ''),  # Use benefits field directly
             "job_type": job_data.get('job_type', ''),  # Add job_type field as required
             "requirements": job_data.get('requirements', ''),  # Add requirements field
@@ -351,7 +422,7 @@ class APIService:
     def delete_job(self, job_id: str) -> bool:
         """Delete a job posting"""
         try:
-            response = requests.delete(
+            response = self.http.delete(
                 f"{self.base_url}/jobs/{job_id}",
                 headers=self._get_auth_headers(),
                 timeout=10
@@ -364,13 +435,27 @@ class APIService:
     
     def get_applicants(self):
         """Get all applicants"""
+        mirrored = self._mirror_applicants()
+        if mirrored is not None:
+            return mirrored
+        breaker = circuit_breakers.get('GET /applicants')
+        headers = self._get_auth_headers()
+        key = request_key('GET', '/applicants', None, headers)
         try:
-            response = requests.get(f"{self.base_url}/applicants", headers=self._get_auth_headers())
+            breaker.before_call()
+            try:
+                response = self.http.get(f"{self.base_url}/applicants", headers=headers, timeout=10)
+            except requests.exceptions.RequestException:
+                breaker.record_failure()
+                raise
+            self._record_status(breaker, response.status_code)
             if response.status_code == 200:
-                return response.json()
+                applicants = response.json()
+                last_known_good.remember(key, applicants)
+                return applicants
         except Exception as e:
             print(f"Error fetching applicants: {e}")
-            return []
+        return last_known_good.recall(key) or []
     
     def get_saved_jobs(self):
         """Get user's saved jobs"""
@@ -494,36 +579,39 @@ class APIService:
         print("Using fallback job categories (API doesn't support categories endpoint)")
         return ["Technology", "Finance", "Healthcare", "Education", "Marketing", "Sales", "Operations"]
 
-    def search_jobs(self, filters: Dict) -> List[Dict]:
-        """Search jobs with filters"""
-        try:
-            # Convert search filters to API parameters
-            api_filters = {}
+    def _build_search_params(self, filters: Dict) -> Dict[str, Any]:
+        """Convert search filters to API parameters"""
+        api_filters = {}
+
+        # Handle query/keyword search
+        if filters.get('query'):
+            api_filters['search'] = filters['query']
 
-            # Handle query/keyword search
-            if filters.get('query'):
-                api_filters['search'] = filters['query']
+        # Handle location filter
+        if filters.get('location'):
+            api_filters['location'] = filters['location']
 
-            # Handle location filter
-            if filters.get('location'):
-                api_filters['location'] = filters['location']
+        # Handle job type filter
+        if filters.get('job_type') and filters['job_type'] != 'all':
+            api_filters['employment_type'] = filters['job_type']
 
-            # Handle job type filter
-            if filters.get('job_type') and filters['job_type'] != 'all':
-                api_filters['employment_type'] = filters['job_type']
+        # Handle salary filters
+        if filters.get('salary_min'):
+            api_filters['min_salary'] = int(filters['salary_min'])
+        if filters.get('salary_max'):
+            api_filters['max_salary'] = int(filters['salary_max'])
 
-            # Handle salary filters
-            if filters.get('salary_min'):
-                api_filters['min_salary'] = int(filters['salary_min'])
-            if filters.get('salary_max'):
-                api_filters['max_salary'] = int(filters['salary_max'])
+        # Handle remote work filter
+        if filters.get('remote'):
+            api_filters['remote'] = True
 
-            # Handle remote work filter
-            if filters.get('remote'):
-                api_filters['remote'] = True
+        return api_filters
 
+    def search_jobs(self, filters: Dict) -> List[Dict]:
+        """Search jobs with filters"""
+        try:
             # Use the existing get_jobs method with filters
-            return self.get_jobs(filters=api_filters)
+            return self.get_jobs(filters=self._build_search_params(filters))
 
         except Exception as e:
             print(f"Error searching jobs: {e}")
@@ -550,7 +638,7 @@ class APIService:
         try:
             # Get all jobs for this vendor
             vendor_jobs = self.get_jobs_by_vendor(vendor_id)
-            vendor_job_ids = [job.get('id') for job in vendor_jobs if job.get('id')]
+            vendor_job_ids = {job.get('id') for job in vendor_jobs if job.get('id')}
 
             # Get all applicants and filter by vendor's job IDs
             all_applicants = self.get_applicants()
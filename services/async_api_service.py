@@ -0,0 +1,356 @@
+"""
+Asyncio counterpart of APIService
+Page handlers await these methods so a slow upstream call no longer blocks the
+NiceGUI event loop (and every other websocket client served by the worker)
+"""
+
+import asyncio
+import os
+import httpx
+from typing import AsyncIterator, Dict, List, Optional, Any, Union
+from .api_service import APIService
+from .job_records import JobRecord, parse_job_records
+from .http_client import get_async_client
+from .single_flight import request_key, upstream_flights
+from .validator_cache import validator_cache
+from .circuit_breaker import CircuitOpenError, circuit_breakers
+from .last_known_good import last_known_good
+from .job_stream import STREAM_CHUNK_SIZE, JobStreamParser
+from .pagination import JobPager, job_pagers
+from .flyer_upload import MultipartBody, Progress, SpooledFlyer
+
+# Upper bound on concurrent GET /jobs/{id} calls issued by get_jobs_by_ids
+JOB_FETCH_CONCURRENCY = int(os.getenv('JOB_FETCH_CONCURRENCY', '8'))
+
+
+class AsyncAPIService(APIService):
+    """Same endpoints and normalized return shapes as APIService, but awaitable.
+
+    Requests go through the shared httpx client, which multiplexes them over a
+    single HTTP/2 connection when the upstream supports it. Methods that only
+    return mock data are inherited unchanged from APIService.
+    """
+
+    def __init__(self, read_mode: Optional[str] = None):
+        super().__init__(read_mode)
+        self.client = get_async_client()
+
+    async def _coalesced(self, path: str, params: Optional[Dict], headers: Dict[str, str], fetch):
+        """Run fetch once for all concurrent identical GETs (same path, params and auth scope)"""
+        key = request_key('GET', path, params, headers)
+        return await upstream_flights.do(key, fetch)
+
+    async def _from_mirror(self, read, *args):
+        """Run a mirror read in a worker thread so SQLite never blocks the event loop.
+
+        The reads check job_store.ready() themselves, so that query runs in the thread too.
+        """
+        if not self._mirror_mode():
+            return None
+        return await asyncio.get_running_loop().run_in_executor(None, read, *args)
+
+    async def _conditional_get(self, endpoint: str, path: str, params: Optional[Dict], headers: Dict[str, str]):
+        """Async version of APIService._conditional_get (returns key, response, cached result)"""
+        breaker = circuit_breakers.get(endpoint)
+        breaker.before_call()
+        key = request_key('GET', path, params, headers)
+        url = f"{self.base_url}{path}"
+        try:
+            response = await self.client.get(
+                url,
+                params=params,
+                headers={**headers, **validator_cache.conditional_headers(key)},
+                timeout=10
+            )
+            if response.status_code == 304:
+                cached = validator_cache.not_modified(key)
+                if cached is not None:
+                    breaker.record_success()
+                    return key, None, cached
+                response = await self.client.get(url, params=params, headers=headers, timeout=10)
+        except httpx.HTTPError:
+            breaker.record_failure()
+            raise
+        self._record_status(breaker, response.status_code)
+        response.raise_for_status()
+        return key, response, None
+
+    def _remember(self, key, result):
+        """Persist a last-known-good result off the event loop"""
+        asyncio.get_running_loop().run_in_executor(None, last_known_good.remember, key, result)
+
+    async def _recall(self, key) -> Any:
+        """Read a last-known-good result (possibly from disk) off the event loop"""
+        return await asyncio.get_running_loop().run_in_executor(None, last_known_good.recall, key)
+
+    async def _recall_jobs(self, params: Optional[Dict], headers: Dict[str, str]) -> Dict[str, Any]:
+        """Async version of APIService._fallback_jobs"""
+        return self._fallback_result(await self._recall(request_key('GET', '/jobs', params, headers)))
+
+    async def get_jobs(self, filters: Optional[Dict] = None, as_records: bool = False) -> List[Union[Dict, JobRecord]]:
+        """Fetch all jobs with optional filters (typed JobRecords when as_records is set)"""
+        return (await self.get_jobs_with_meta(filters, as_records=as_records))['jobs']
+
+    async def get_jobs_with_meta(self, filters: Optional[Dict] = None, as_records: bool = False) -> Dict[str, Any]:
+        """Fetch jobs and preserve any metadata returned by the API.
+
+        Returns a dict with keys:
+        - 'jobs': List[Dict] normalized jobs (List[JobRecord] when as_records is set,
+          validated straight from the response bytes; see job_records)
+        - 'meta': Dict[Any, Any] extra metadata from the response (may be empty)
+        """
+        params = filters or {}
+        mirrored = await self._from_mirror(self._mirror_jobs, params)
+        if mirrored is not None:
+            return self._as_records(mirrored) if as_records else mirrored
+        headers = self._get_auth_headers()
+        if as_records:
+            return await self._fetch_job_records(params, headers)
+        result = await self._coalesced('/jobs', params, headers, lambda: self._fetch_jobs_with_meta(params, headers))
+        # Every coalesced caller gets its own containers to sort or extend
+        return {"jobs": list(result["jobs"]), "meta": dict(result["meta"])}
+
+    async def _fetch_jobs_with_meta(self, params: Dict, headers: Dict[str, str]) -> Dict[str, Any]:
+        try:
+            key, response, result = await self._conditional_get('GET /jobs', '/jobs', params, headers)
+            if result is None:
+                raw_jobs, meta = self._extract_jobs(response.json())
+                result = {"jobs": self._normalize_jobs(raw_jobs), "meta": meta}
+                validator_cache.store(key, response.headers, result)
+            self._remember(key, result)
+            return result
+        except (httpx.HTTPError, CircuitOpenError, ValueError) as e:
+            # ValueError: a 200 whose body is not JSON (a proxy error page, a truncated body)
+            print(f"Error fetching jobs (with meta): {e}")
+            # Serve the last real response (or sample data if there never was one)
+            return await self._recall_jobs(params, headers)
+
+    async def _fetch_job_records(self, params: Dict, headers: Dict[str, str]) -> Dict[str, Any]:
+        """Typed-record variant of _fetch_jobs_with_meta (not coalesced; records are not cached)"""
+        try:
+            key, response, result = await self._conditional_get('GET /jobs', '/jobs', params, headers)
+            if result is not None:
+                return self._as_records(result)
+            # One validate_json pass over the body, normalizing each record: keep it off the loop
+            records, meta = await asyncio.get_running_loop().run_in_executor(
+                None, parse_job_records, response.content, self._to_absolute_url
+            )
+            return {"jobs": records, "meta": meta}
+        except (httpx.HTTPError, CircuitOpenError, ValueError) as e:
+            print(f"Error fetching job records: {e}")
+            return self._as_records(await self._recall_jobs(params, headers))
+
+    async def iter_jobs(self, filters: Optional[Dict] = None, meta: Optional[Dict] = None,
+                        fallback: bool = True) -> AsyncIterator[Dict]:
+        """Async version of APIService.iter_jobs: yields normalized jobs as the body arrives.
+
+        meta, when given, receives the response's other top-level fields (paging
+        info) once the body is read. With fallback=False failures are raised
+        instead of streaming fallback jobs - the mirror sync must never store those.
+        """
+        params = filters or {}
+        headers = self._get_auth_headers()
+        breaker = circuit_breakers.get('GET /jobs')
+        parser = JobStreamParser()
+        yielded = 0
+        try:
+            breaker.before_call()
+            try:
+                async with self.client.stream('GET', f"{self.base_url}/jobs", params=params,
+                                              headers=headers, timeout=10) as response:
+                    self._record_status(breaker, response.status_code)
+                    response.raise_for_status()
+                    async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                        for raw_job in parser.feed(chunk):
+                            yield self._normalize_job(raw_job)
+                            yielded += 1
+                    for raw_job in parser.feed(b'', final=True):
+                        yield self._normalize_job(raw_job)
+                        yielded += 1
+                    if meta is not None:
+                        meta.update(parser.meta)
+            except httpx.TransportError:
+                breaker.record_failure()
+                raise
+        except (httpx.HTTPError, CircuitOpenError, ValueError) as e:
+            print(f"Error streaming jobs: {e}")
+            if not fallback:
+                raise
+            if not yielded:
+                for job in (await self._recall_jobs(params, headers))["jobs"]:
+                    yield job
+
+    def paginate(self, filters: Optional[Dict] = None, page_size: int = 20) -> JobPager:
+        """Prefetching pager over the server-side pages of a /jobs query.
+
+        Pagers are shared per query (filters, page size and auth scope), so
+        pages someone already loaded are served from memory.
+        """
+        params = filters or {}
+        key = request_key('GET', '/jobs', {**params, 'limit': page_size}, self._get_auth_headers())
+        return job_pagers.get(key, lambda: JobPager(self.get_jobs_with_meta, params, page_size))
+
+    async def get_job_by_id(self, job_id: str) -> Optional[Dict]:
+        """Fetch a specific job by ID"""
+        job = await self._from_mirror(self._mirror_job, job_id)
+        if job is not None:
+            return job
+        headers = self._get_auth_headers()
+        job = await self._coalesced(f'/jobs/{job_id}', None, headers, lambda: self._fetch_job_by_id(job_id, headers))
+        return dict(job) if job is not None else None
+
+    async def get_jobs_by_ids(self, job_ids: List[str], concurrency: int = JOB_FETCH_CONCURRENCY) -> List[Optional[Dict]]:
+        """Fetch several jobs by ID concurrently, at most `concurrency` requests at a time.
+
+        Results are in the order of job_ids, with None for jobs that could not be found.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def fetch(job_id):
+            async with semaphore:
+                return await self.get_job_by_id(job_id)
+
+        return list(await asyncio.gather(*(fetch(job_id) for job_id in job_ids)))
+
+    async def _fetch_job_by_id(self, job_id: str, headers: Dict[str, str]) -> Optional[Dict]:
+        try:
+            key, response, normalized = await self._conditional_get('GET /jobs/{id}', f'/jobs/{job_id}', None, headers)
+            if normalized is None:
+                maybe_job = self._unwrap_job(response.json())
+                if maybe_job is None:
+                    return None
+                normalized = self._normalize_job(maybe_job)
+                validator_cache.store(key, response.headers, normalized)
+            self._remember(key, normalized)
+            return normalized
+        except (httpx.HTTPError, CircuitOpenError, ValueError) as e:
+            print(f"Error fetching job {job_id}: {e}")
+            return await self._recall(request_key('GET', f'/jobs/{job_id}', None, headers))
+
+    def _body_kwargs(self, payload: Any) -> Dict[str, Any]:
+        """httpx takes streamed bodies as content= and plain forms as data="""
+        if isinstance(payload, MultipartBody):
+            # Only the async generator: httpx treats anything with __iter__ as a sync stream,
+            # which an AsyncClient refuses to send
+            return {'content': payload.__aiter__()}
+        return {'data': payload}
+
+    @staticmethod
+    async def _spooled(file: Optional[Any]) -> Optional[Any]:
+        """The flyer spooled to disk off the event loop (_upload_payload would write it synchronously)"""
+        if not file or isinstance(file, SpooledFlyer):
+            return file
+        return await SpooledFlyer.spool_async(file.content, file.name, file.content_type)
+
+    async def create_job(self, job_data: Dict, file: Optional[Any] = None,
+                         progress: Optional[Progress] = None) -> Optional[Dict]:
+        """Create a new job posting with optional file upload (progress gets bytes sent / total)."""
+        try:
+            payload, headers = self._upload_payload(job_data, await self._spooled(file), progress)
+            response = await self.client.post(
+                f"{self.base_url}/jobs",
+                headers=headers,
+                **self._body_kwargs(payload),
+                timeout=20  # Increased timeout for file upload
+            )
+            response.raise_for_status()
+            return response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            print(f"Error creating job: {e}")
+            if isinstance(e, httpx.HTTPStatusError):
+                print(f"Status Code: {e.response.status_code}")
+                print(f"Response Body: {e.response.text}")
+            return None
+
+    async def update_job(self, job_id: str, job_data: Dict, file: Optional[Any] = None,
+                         progress: Optional[Progress] = None) -> Optional[Dict]:
+        """Update an existing job posting with optional file upload (progress gets bytes sent / total)."""
+        try:
+            payload, headers = self._upload_payload(self._normalize_job_for_api(job_data), await self._spooled(file),
+                                                    progress)
+            response = await self.client.put(
+                f"{self.base_url}/jobs/{job_id}",
+                headers=headers,
+                **self._body_kwargs(payload),
+                timeout=20
+            )
+            response.raise_for_status()
+            return response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            print(f"Error updating job {job_id}: {e}")
+            if isinstance(e, httpx.HTTPStatusError):
+                print(f"Status Code: {e.response.status_code}")
+                print(f"Response Body: {e.response.text}")
+            return None
+
+    async def delete_job(self, job_id: str) -> bool:
+        """Delete a job posting"""
+        try:
+            response = await self.client.delete(
+                f"{self.base_url}/jobs/{job_id}",
+                headers=self._get_auth_headers(),
+                timeout=10
+            )
+            response.raise_for_status()
+            return True
+        except httpx.HTTPError as e:
+            print(f"Error deleting job {job_id}: {e}")
+            return False
+
+    async def get_applicants(self) -> List[Dict]:
+        """Get all applicants"""
+        mirrored = await self._from_mirror(self._mirror_applicants)
+        if mirrored is not None:
+            return mirrored
+        breaker = circuit_breakers.get('GET /applicants')
+        headers = self._get_auth_headers()
+        key = request_key('GET', '/applicants', None, headers)
+        try:
+            breaker.before_call()
+            try:
+                response = await self.client.get(
+                    f"{self.base_url}/applicants",
+                    headers=headers,
+                    timeout=10
+                )
+            except httpx.HTTPError:
+                breaker.record_failure()
+                raise
+            self._record_status(breaker, response.status_code)
+            if response.status_code == 200:
+                applicants = response.json()
+                self._remember(key, applicants)
+                return applicants
+        except Exception as e:
+            print(f"Error fetching applicants: {e}")
+        return await self._recall(key) or []
+
+    async def search_jobs(self, filters: Dict) -> List[Dict]:
+        """Search jobs with filters"""
+        try:
+            return await self.get_jobs(filters=self._build_search_params(filters))
+        except Exception as e:
+            print(f"Error searching jobs: {e}")
+            # Fallback to all jobs if search fails
+            return await self.get_jobs()
+
+    async def get_jobs_by_vendor(self, vendor_id: str) -> List[Dict]:
+        """Fetch jobs for a specific vendor using API filtering"""
+        try:
+            return await self.get_jobs(filters={'vendor_id': vendor_id})
+        except Exception as e:
+            print(f"Error fetching jobs for vendor {vendor_id}: {e}")
+            return []
+
+    async def get_applicants_by_vendor(self, vendor_id: str) -> List[Dict]:
+        """Fetch applicants for jobs posted by a specific vendor"""
+        try:
+            # Both calls are independent, so wait for the slower one rather than both in turn
+            vendor_jobs, all_applicants = await asyncio.gather(
+                self.get_jobs_by_vendor(vendor_id), self.get_applicants()
+            )
+            vendor_job_ids = {job.get('id') for job in vendor_jobs if job.get('id')}
+            return [app for app in all_applicants if app.get('job_id') in vendor_job_ids]
+        except Exception as e:
+            print(f"Error fetching applicants for vendor {vendor_id}: {e}")
+            return []
@@ -12,6 +12,7 @@ import requests
 from typing import Dict, Optional, Literal
 from datetime import datetime, timedelta
 from nicegui import app, ui
+from .http_client import get_session
 
 UserRole = Literal['vendor', 'user', 'job_seeker', 'employer', 'admin']
 
@@ -24,6 +25,7 @@ class AuthService:
         self._storage_warned = False
         self.current_user = None
         self.access_token = None
+        self.http = get_session()  # pooled keep-alive transport
         self._load_users()  # Load local users as fallback
     
     def _load_users(self):
@@ -91,7 +93,7 @@ class AuthService:
                     "is_active": True
                 }
                 
-                response = requests.post(
+                response = self.http.post(
                     f"{self.base_url}/users/register",
                     json=data,
                     headers={'Content-Type': 'application/json'},
@@ -142,7 +144,7 @@ class AuthService:
                     "password": password
                 }
                 
-                response = requests.post(
+                response = self.http.post(
                     f"{self.base_url}/users/login",
                     data=data,  # Send as form data instead of JSON
                     timeout=10
@@ -350,7 +352,7 @@ class AuthService:
                 "role": api_role
             }
             
-            response = requests.post(
+            response = self.http.post(
                 f"{self.base_url}/users/register",
                 data=data,  # Send as form data instead of JSON
                 timeout=10
@@ -0,0 +1,297 @@
+"""
+Typeahead suggestions for the job search boxes
+Titles, companies, categories and normalized locations of the catalog are
+kept in sorted arrays of lookup keys, one per kind - every value once per
+word, so "eng" finds "Software Engineer" - and a prefix is the range between
+two bisects. Values are weighted by how many jobs have them; a max segment
+tree over those weights gives the top-k of any range without scanning it,
+and answers for short prefixes are cached until a matching value changes.
+
+sync() diffs the catalog against what is indexed, so jobs being added,
+edited or removed only touch their own values.
+"""
+
+import heapq
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .job_facets import REMOTE, normalize_location, sort_text
+
+SUGGEST_LIMIT = 8
+CACHED_PREFIX_LENGTH = 3  # top-k of prefixes up to this long is cached
+SUGGEST_KINDS = ('title', 'company', 'category', 'location')
+SEARCH_KINDS = ('title', 'company', 'category')
+
+# Normalizer defaults that are not worth suggesting
+_PLACEHOLDERS = {'untitled job', 'company not specified'}
+_PREFIX_END = '\U0010ffff'
+
+Value = Tuple[str, str, str]  # (kind, key, label)
+
+
+def _job_values(job: Dict) -> Tuple[Value, ...]:
+    values = []
+    for kind in ('title', 'company', 'category'):
+        label = ' '.join(str(job.get(kind) or '').split())
+        key = label.casefold()
+        if key and key not in _PLACEHOLDERS:
+            values.append((kind, key, label))
+    location = normalize_location(job.get('location'))
+    if location:
+        values.append(('location', location, 'Remote' if location == REMOTE else location.title()))
+    return tuple(values)
+
+
+def _lookup_texts(key: str) -> List[str]:
+    """The key from each word on: 'senior data engineer' -> itself, 'data engineer', 'engineer'"""
+    words = key.split(' ')
+    return [' '.join(words[index:]) for index in range(len(words))]
+
+
+class Suggestion:
+    __slots__ = ('label', 'kind', 'count')
+
+    def __init__(self, label: str, kind: str, count: int):
+        self.label = label
+        self.kind = kind
+        self.count = count
+
+    def __repr__(self) -> str:
+        return f"Suggestion({self.label!r}, {self.kind!r}, {self.count})"
+
+
+class _KindIndex:
+    """Sorted (lookup text, key) rows of one kind, with a max segment tree over their scores.
+
+    The top-k of a prefix range is read off the tree with a heap, touching
+    O(k log n) nodes however many rows the prefix covers.
+    """
+
+    __slots__ = ('rows', 'tree', 'size')
+
+    def __init__(self, rows: Optional[List[Tuple[str, str]]] = None):
+        self.rows: List[Tuple[str, str]] = rows if rows is not None else []
+        self.tree: List[int] = [0, 0]
+        self.size = 1
+
+    def copy(self) -> '_KindIndex':
+        index = _KindIndex(list(self.rows))
+        index.tree, index.size = list(self.tree), self.size
+        return index
+
+    def insert(self, key: str):
+        for text in _lookup_texts(key):
+            index = bisect_left(self.rows, (text, key))
+            if index == len(self.rows) or self.rows[index] != (text, key):
+                self.rows.insert(index, (text, key))
+
+    def remove(self, key: str):
+        for text in _lookup_texts(key):
+            index = bisect_left(self.rows, (text, key))
+            if index < len(self.rows) and self.rows[index] == (text, key):
+                del self.rows[index]
+
+    def rebuild(self, counts: Dict[str, int]):
+        """Recompute every score (after rows were inserted or removed)"""
+        size = 1
+        while size < len(self.rows):
+            size *= 2
+        tree = [0] * (2 * size)
+        for index, (text, key) in enumerate(self.rows):
+            # Popularity, doubled when the value itself starts with the prefix
+            tree[size + index] = counts[key] * (2 if text == key else 1)
+        for node in range(size - 1, 0, -1):
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+        self.tree, self.size = tree, size
+
+    def update(self, key: str, count: int):
+        """New count for a value whose rows are already in place"""
+        for text in _lookup_texts(key):
+            node = self.size + bisect_left(self.rows, (text, key))
+            self.tree[node] = count * (2 if text == key else 1)
+            node //= 2
+            while node:
+                self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+                node //= 2
+
+    def top(self, prefix: str, limit: int) -> List[Tuple[int, str]]:
+        """Up to limit (score, key) of the values with a word starting with prefix, best first"""
+        low = bisect_left(self.rows, (prefix,)) + self.size
+        high = bisect_left(self.rows, (prefix + _PREFIX_END,)) + self.size
+        tree = self.tree
+        heap = []
+        while low < high:  # the O(log n) nodes covering the range
+            if low & 1:
+                heap.append((-tree[low], low))
+                low += 1
+            if high & 1:
+                high -= 1
+                heap.append((-tree[high], high))
+            low //= 2
+            high //= 2
+        heapq.heapify(heap)
+        found: List[Tuple[int, str]] = []
+        seen = set()
+        while heap and len(found) < limit:
+            score, node = heapq.heappop(heap)
+            if not score:
+                break
+            if node >= self.size:
+                key = self.rows[node - self.size][1]
+                if key not in seen:  # a value can match on several of its words
+                    seen.add(key)
+                    found.append((-score, key))
+            else:
+                heapq.heappush(heap, (-tree[2 * node], 2 * node))
+                heapq.heappush(heap, (-tree[2 * node + 1], 2 * node + 1))
+        return found
+
+
+class _Snapshot:
+    """Everything suggest() reads; replaced whole by sync(), never changed once published"""
+
+    __slots__ = ('counts', 'labels', 'kinds', 'cache')
+
+    def __init__(self, counts, labels, kinds, cache):
+        # kind -> key -> number of jobs, and kind -> key -> display label (first spelling seen)
+        self.counts: Dict[str, Dict[str, int]] = counts
+        self.labels: Dict[str, Dict[str, str]] = labels
+        self.kinds: Dict[str, _KindIndex] = kinds
+        # (prefix, kinds) -> top suggestions; the one part filled in after publishing
+        self.cache: Dict[Tuple[str, Tuple[str, ...]], List[Suggestion]] = cache
+
+
+class SuggestionIndex:
+    """Prefix index of catalog values, kept in sync incrementally (see sync()).
+
+    sync() runs in a worker thread and publishes a new snapshot, sharing the
+    parts of the old one no change touched; suggest() reads whichever
+    snapshot is current without locking.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()  # one sync at a time
+        # Guards the current snapshot's cache: suggest() fills it while sync() copies it
+        self._cache_lock = threading.Lock()
+        self._snapshot = _Snapshot({kind: {} for kind in SUGGEST_KINDS}, {kind: {} for kind in SUGGEST_KINDS},
+                                   {kind: _KindIndex() for kind in SUGGEST_KINDS}, {})
+        # job id -> the values it contributed
+        self._job_values: Dict[str, Tuple[Value, ...]] = {}
+        self.ready = False
+
+    def sync(self, jobs: Iterable[Dict]) -> Dict[str, int]:
+        """Index exactly these jobs (by id); returns added/updated/removed job counts"""
+        counts = {'added': 0, 'updated': 0, 'removed': 0}
+        current: Dict[str, Tuple[Value, ...]] = {}
+        for job in jobs:
+            if job.get('id') is not None:
+                current.setdefault(str(job['id']), _job_values(job))
+        with self._lock:
+            # Worked on a copy and kept only once the new snapshot is published,
+            # so a failed publish leaves the next sync the same diff to apply
+            job_values = dict(self._job_values)
+            # (kind, key) -> label for every value whose count changes
+            changed: Dict[Tuple[str, str], str] = {}
+            delta: Dict[Tuple[str, str], int] = {}
+            for job_id, values in current.items():
+                previous = job_values.get(job_id)
+                if previous == values:
+                    continue
+                counts['updated' if previous is not None else 'added'] += 1
+                for kind, key, label in previous or ():
+                    changed.setdefault((kind, key), label)
+                    delta[(kind, key)] = delta.get((kind, key), 0) - 1
+                for kind, key, label in values:
+                    changed.setdefault((kind, key), label)
+                    delta[(kind, key)] = delta.get((kind, key), 0) + 1
+                job_values[job_id] = values
+            for job_id in [job_id for job_id in job_values if job_id not in current]:
+                for kind, key, label in job_values.pop(job_id):
+                    changed.setdefault((kind, key), label)
+                    delta[(kind, key)] = delta.get((kind, key), 0) - 1
+                counts['removed'] += 1
+            if changed or not self.ready:
+                self._snapshot = self._publish(self._snapshot, changed, delta)
+            self._job_values = job_values
+            self.ready = True
+        return counts
+
+    def _publish(self, old: _Snapshot, changed: Dict[Tuple[str, str], str],
+                 delta: Dict[Tuple[str, str], int]) -> _Snapshot:
+        """A new snapshot with the changed counts applied"""
+        counts, labels, kinds = dict(old.counts), dict(old.labels), dict(old.kinds)
+        for kind in SUGGEST_KINDS:
+            updates = [key for changed_kind, key in changed if changed_kind == kind]
+            if not updates:
+                continue
+            kind_counts, kind_labels = dict(old.counts[kind]), dict(old.labels[kind])
+            added, removed = [], []
+            for key in updates:
+                before = kind_counts.get(key, 0)
+                after = before + delta.get((kind, key), 0)
+                if after > 0:
+                    kind_counts[key] = after
+                    kind_labels.setdefault(key, changed[(kind, key)])
+                    if not before:
+                        added.append(key)
+                elif before:
+                    del kind_counts[key]
+                    del kind_labels[key]
+                    removed.append(key)
+            if (len(added) + len(removed)) * 8 > len(kind_counts) + 64:
+                # Many new or gone values (e.g. the first sync): sort from scratch
+                index = _KindIndex(sorted((text, key) for key in kind_counts for text in _lookup_texts(key)))
+            else:
+                index = old.kinds[kind].copy()
+                for key in removed:
+                    index.remove(key)
+                for key in added:
+                    index.insert(key)
+            if added or removed:
+                index.rebuild(kind_counts)
+            else:  # only counts moved: rows are where they were
+                for key in updates:
+                    index.update(key, kind_counts[key])
+            counts[kind], labels[kind], kinds[kind] = kind_counts, kind_labels, index
+        # Cached answers stay valid unless a changed value matches their prefix
+        stale = {text[:length] for _, key in changed for text in _lookup_texts(key)
+                 for length in range(1, min(len(text), CACHED_PREFIX_LENGTH) + 1)}
+        with self._cache_lock:
+            cached = list(old.cache.items())
+        cache = {entry: found for entry, found in cached if entry[0] not in stale}
+        return _Snapshot(counts, labels, kinds, cache)
+
+    def suggest(self, prefix: str, kinds: Iterable[str] = SUGGEST_KINDS,
+                limit: int = SUGGEST_LIMIT) -> List[Suggestion]:
+        """Most popular values with a word starting with prefix; a match on the first word ranks higher"""
+        prefix = sort_text(prefix)
+        kinds = tuple(kind for kind in kinds if kind in SUGGEST_KINDS)
+        snapshot = self._snapshot
+        if not prefix or not self.ready:
+            return []
+        cacheable = len(prefix) <= CACHED_PREFIX_LENGTH and limit <= SUGGEST_LIMIT
+        found = snapshot.cache.get((prefix, kinds)) if cacheable else None
+        if found is None:
+            found = self._rank(snapshot, prefix, kinds, max(limit, SUGGEST_LIMIT))
+            if cacheable:
+                with self._cache_lock:
+                    snapshot.cache[(prefix, kinds)] = found
+        return found[:limit]
+
+    @staticmethod
+    def _rank(snapshot: _Snapshot, prefix: str, kinds: Tuple[str, ...], limit: int) -> List[Suggestion]:
+        found = [(score, kind, key) for kind in kinds for score, key in snapshot.kinds[kind].top(prefix, limit)]
+        # Ties keep lookup order within a kind, kinds in the order asked for
+        best = heapq.nsmallest(limit, found, key=lambda item: -item[0])
+        return [Suggestion(snapshot.labels[kind][key], kind, snapshot.counts[kind][key]) for _, kind, key in best]
+
+    def stats(self) -> Dict:
+        snapshot = self._snapshot
+        return {'ready': self.ready, 'values': sum(len(counts) for counts in snapshot.counts.values()),
+                'lookup_keys': sum(len(index.rows) for index in snapshot.kinds.values()),
+                'cached_prefixes': len(snapshot.cache)}
+
+
+# Global suggestion index, fed by the job catalog
+job_suggestions = SuggestionIndex()
@@ -4,10 +4,10 @@ Integrates with the Job Hub API for real authentication
 """
 
 import os
-import requests
 from typing import Dict, Optional, Literal
 from datetime import datetime, timedelta
 from nicegui import app, ui
+from .http_client import get_session
 
 UserRole = Literal['vendor', 'job_seeker', 'admin']
 
@@ -17,6 +17,7 @@ class EnhancedAuthService:
         self.current_user = None
         self.access_token = None
         self.token_expiry = None
+        self.http = get_session()  # pooled keep-alive transport
         
     def _make_request(self, method: str, endpoint: str, data: Dict = None, auth_required: bool = False) -> Dict:
         """Make authenticated API request"""
@@ -28,9 +29,9 @@ class EnhancedAuthService:
         
         try:
             if method.upper() == 'POST':
-                response = requests.post(url, json=data, headers=headers, timeout=10)
+                response = self.http.post(url, json=data, headers=headers, timeout=10)
             elif method.upper() == 'GET':
-                response = requests.get(url, headers=headers, timeout=10)
+                response = self.http.get(url, headers=headers, timeout=10)
             else:
                 return {"success": False, "message": f"Unsupported method: {method}"}
                 
@@ -0,0 +1,163 @@
+"""
+Disk-spooled flyer uploads
+A flyer is copied to an anonymous temp file (in a worker thread, with
+spool_async) as soon as the browser upload arrives and later streamed to the API as a multipart body in fixed-size
+chunks, so no flyer is ever held in memory in full - neither by the upload
+handler nor by the request body
+"""
+
+import asyncio
+import functools
+import os
+import tempfile
+import uuid
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+MAX_FLYER_BYTES = int(os.getenv('MAX_FLYER_BYTES', str(10 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# progress(bytes_sent, total_bytes)
+Progress = Callable[[int, int], None]
+
+
+class FlyerTooLarge(ValueError):
+    """Raised while spooling a flyer bigger than the configured limit"""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"Flyer is larger than the {max_bytes / (1024 * 1024):g} MB limit")
+        self.max_bytes = max_bytes
+
+
+class SpooledFlyer:
+    """An uploaded flyer kept in an anonymous temp file (removed on close or garbage collection)"""
+
+    def __init__(self, name: Optional[str], content_type: Optional[str], max_bytes: int = MAX_FLYER_BYTES):
+        self.name = name or 'flyer'
+        self.content_type = content_type or 'application/octet-stream'
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.file = tempfile.TemporaryFile()
+
+    @classmethod
+    def spool(cls, content: Any, name: Optional[str], content_type: Optional[str],
+              max_bytes: int = MAX_FLYER_BYTES) -> 'SpooledFlyer':
+        """Copy bytes or a binary file object (e.g. an upload event's content) to disk"""
+        flyer = cls(name, content_type, max_bytes)
+        try:
+            if isinstance(content, (bytes, bytearray)):
+                flyer._write(bytes(content))
+            else:
+                for chunk in iter(lambda: content.read(UPLOAD_CHUNK_SIZE), b''):
+                    flyer._write(chunk)
+        except BaseException:
+            flyer.close()
+            raise
+        return flyer
+
+    @classmethod
+    async def spool_async(cls, content: Any, name: Optional[str], content_type: Optional[str],
+                          max_bytes: int = MAX_FLYER_BYTES) -> 'SpooledFlyer':
+        """spool() in a worker thread, so the disk writes (and reads of a file-backed upload) skip the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(cls.spool, content, name, content_type, max_bytes))
+
+    def _write(self, data: bytes):
+        self.size += len(data)
+        if self.size > self.max_bytes:
+            raise FlyerTooLarge(self.max_bytes)
+        self.file.write(data)
+
+    def read_chunk(self, offset: int) -> bytes:
+        self.file.seek(offset)
+        return self.file.read(UPLOAD_CHUNK_SIZE)
+
+    def close(self):
+        self.file.close()
+
+
+def _quote(value: str) -> str:
+    """Escape a multipart header parameter the way browsers do"""
+    return value.replace('\\', '\\\\').replace('"', '%22').replace('\r', '%0D').replace('\n', '%0A')
+
+
+def _form_items(fields: Dict) -> List[Tuple[str, str]]:
+    """Flatten form fields like requests does: None is skipped and lists repeat the field"""
+    items = []
+    for key, value in fields.items():
+        for item in value if isinstance(value, (list, tuple)) else [value]:
+            if item is not None:
+                items.append((str(key), item.decode() if isinstance(item, bytes) else str(item)))
+    return items
+
+
+class MultipartBody:
+    """multipart/form-data body of form fields plus one flyer streamed from disk.
+
+    The length is known up front, so it is sent with a Content-Length header
+    rather than chunked transfer encoding. Iterate it for requests; give
+    httpx.AsyncClient body.__aiter__() (httpx sends anything iterable as a
+    sync stream), whose file reads run in a thread.
+    """
+
+    def __init__(self, fields: Dict, flyer: SpooledFlyer, file_field: str = 'flyer',
+                 progress: Optional[Progress] = None):
+        self.boundary = uuid.uuid4().hex
+        self.flyer = flyer
+        self.progress = progress
+        head = []
+        for key, value in _form_items(fields):
+            head.append(
+                f'--{self.boundary}\r\nContent-Disposition: form-data; name="{_quote(key)}"\r\n\r\n{value}\r\n'
+            )
+        head.append(
+            f'--{self.boundary}\r\nContent-Disposition: form-data; name="{_quote(file_field)}"; '
+            f'filename="{_quote(flyer.name)}"\r\nContent-Type: {flyer.content_type}\r\n\r\n'
+        )
+        self._head = ''.join(head).encode()
+        self._tail = f'\r\n--{self.boundary}--\r\n'.encode()
+        self.length = len(self._head) + flyer.size + len(self._tail)
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {
+            'Content-Type': f'multipart/form-data; boundary={self.boundary}',
+            'Content-Length': str(self.length),
+        }
+
+    def __len__(self) -> int:
+        return self.length
+
+    def _report(self, sent: int):
+        if self.progress is not None:
+            self.progress(sent, self.length)
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield self._head
+        sent = len(self._head)
+        offset = 0
+        while True:
+            chunk = self.flyer.read_chunk(offset)
+            if not chunk:
+                break
+            offset += len(chunk)
+            sent += len(chunk)
+            yield chunk
+            self._report(sent)
+        yield self._tail
+        self._report(self.length)
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        loop = asyncio.get_running_loop()
+        yield self._head
+        sent = len(self._head)
+        offset = 0
+        while True:
+            chunk = await loop.run_in_executor(None, self.flyer.read_chunk, offset)
+            if not chunk:
+                break
+            offset += len(chunk)
+            sent += len(chunk)
+            yield chunk
+            self._report(sent)
+        yield self._tail
+        self._report(self.length)
@@ -0,0 +1,128 @@
+"""
+Shared HTTP transport for the API services
+Keeps a bounded pool of keep-alive connections to the upstream API so page
+renders reuse TCP/TLS connections instead of opening a new one per call
+"""
+
+import os
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from typing import Dict, Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    # Advertises br/zstd only when the matching decoder is installed
+    from urllib3.util.request import ACCEPT_ENCODING
+except ImportError:  # pragma: no cover - very old urllib3
+    ACCEPT_ENCODING = "gzip,deflate"
+
+POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', '10'))  # number of hosts kept pooled
+POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '20'))  # connections kept per host
+POOL_BLOCK = os.getenv('HTTP_POOL_BLOCK', 'False').lower() == 'true'
+MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', '0'))
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_async_client: Optional[httpx.AsyncClient] = None
+
+DEFAULT_HEADERS = {
+    'Accept': 'application/json',
+    'Accept-Encoding': ACCEPT_ENCODING,
+}
+
+
+def _parse_host_limits(raw: str) -> Dict[str, int]:
+    """Parse 'host=size,host2=size2' into a dict of per-host pool sizes"""
+    limits = {}
+    for item in (raw or '').split(','):
+        if '=' not in item:
+            continue
+        host, size = item.split('=', 1)
+        try:
+            limits[host.strip()] = int(size)
+        except ValueError:
+            print(f"Ignoring invalid HTTP_POOL_HOST_LIMITS entry: {item}")
+    return limits
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    # The session is shared by every connected user, so never let the upstream
+    # store cookies on it - authentication travels in explicit headers instead.
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    session.headers.update(DEFAULT_HEADERS)
+    session.headers['Connection'] = 'keep-alive'
+
+    default_adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        pool_block=POOL_BLOCK,
+        max_retries=MAX_RETRIES,
+    )
+    session.mount('http://', default_adapter)
+    session.mount('https://', default_adapter)
+
+    # Per-host overrides, e.g. HTTP_POOL_HOST_LIMITS="my-api.onrender.com=50"
+    for host, size in _parse_host_limits(os.getenv('HTTP_POOL_HOST_LIMITS', '')).items():
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=size, pool_block=POOL_BLOCK, max_retries=MAX_RETRIES)
+        session.mount(f'http://{host}/', adapter)
+        session.mount(f'https://{host}/', adapter)
+
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide pooled session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def close_session():
+    """Close pooled connections (called on application shutdown)"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def _http2_available() -> bool:
+    """HTTP/2 in httpx needs the optional 'h2' package (pip install httpx[http2])"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the process-wide asyncio client, multiplexing requests over HTTP/2 when available"""
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(
+            http2=_http2_available(),
+            headers=DEFAULT_HEADERS,
+            limits=httpx.Limits(
+                max_connections=POOL_CONNECTIONS * POOL_MAXSIZE,
+                max_keepalive_connections=POOL_MAXSIZE,
+            ),
+            timeout=httpx.Timeout(10.0),
+        )
+        # Same rule as the sync session: never keep upstream cookies on a shared client
+        _async_client.cookies.jar.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return _async_client
+
+
+async def close_async_client():
+    """Close the asyncio client (called on application shutdown)"""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
@@ -0,0 +1,325 @@
+"""
+Local caching proxy for remote images
+Flyers, sample-job photos and the hero background are fetched once from
+their (allowlisted) hosts, kept on local disk and served from /img. The disk
+cache is bounded by total size with least-recently-used eviction, expired
+images keep being served while a conditional GET revalidates them in the
+background, and concurrent misses for the same image share one download.
+All disk I/O (index scan, image and metadata writes, eviction) runs in the
+default executor. Images are served from a file opened by open(), which
+eviction cannot pull out from under a response that is still streaming.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import BinaryIO, Dict, FrozenSet, Iterator, List, Mapping, Optional, Tuple
+from urllib.parse import quote, urljoin, urlsplit
+
+from .api_service import api_base_url
+from .http_client import get_async_client
+from .single_flight import SingleFlight
+
+IMAGE_CACHE_DIR = os.getenv('IMAGE_CACHE_DIR', os.path.join('.cache', 'images'))
+IMAGE_CACHE_MAX_BYTES = int(os.getenv('IMAGE_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+IMAGE_CACHE_TTL = float(os.getenv('IMAGE_CACHE_TTL', '86400'))  # when the upstream sends no max-age
+MAX_IMAGE_BYTES = 20 * 1024 * 1024
+MAX_IMAGE_AGE = 30 * 86400
+MAX_REDIRECTS = 3
+READ_CHUNK_SIZE = 64 * 1024
+
+PROXY_PATH = '/img'
+
+# Hosts the sample data and components load images from; the API host is added at runtime
+DEFAULT_IMAGE_HOSTS = ('images.unsplash.com', 'images.pexels.com', 'randomuser.me')
+
+_MAX_AGE = re.compile(r'max-age=(\d+)')
+
+
+class ImageFetchError(Exception):
+    """The image could not be fetched (or is not an image)"""
+
+
+class ImageHostNotAllowed(ImageFetchError):
+    """The URL points at a host outside the proxy allowlist"""
+
+
+class CachedImage:
+    __slots__ = ('key', 'path', 'content_type', 'etag', 'last_modified', 'expires_at', 'size')
+
+    def __init__(self, key: str, path: str, content_type: str, etag: Optional[str],
+                 last_modified: Optional[str], expires_at: float, size: int):
+        self.key = key
+        self.path = path
+        self.content_type = content_type
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+        self.size = size
+
+    def meta(self) -> Dict:
+        return {
+            'content_type': self.content_type,
+            'etag': self.etag,
+            'last_modified': self.last_modified,
+            'expires_at': self.expires_at,
+            'size': self.size,
+        }
+
+
+def _max_age(headers: Mapping[str, str], default: float) -> float:
+    match = _MAX_AGE.search(headers.get('Cache-Control', ''))
+    return min(float(match.group(1)), MAX_IMAGE_AGE) if match else default
+
+
+def read_chunks(file: BinaryIO) -> Iterator[bytes]:
+    """Body iterator for a file from ImageProxy.open(); closes it when done"""
+    try:
+        while True:
+            chunk = file.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        file.close()
+
+
+def _remove(paths: List[str]):
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class ImageProxy:
+    def __init__(self, directory: str = IMAGE_CACHE_DIR, max_bytes: int = IMAGE_CACHE_MAX_BYTES,
+                 ttl: float = IMAGE_CACHE_TTL):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # key -> image, least recently used first
+        self._entries: "OrderedDict[str, CachedImage]" = OrderedDict()
+        self._total_bytes = 0
+        self._loaded = False
+        self._loading: Optional[asyncio.Future] = None
+        self._hosts: Optional[FrozenSet[str]] = None
+        self._flights = SingleFlight()
+        self._revalidating = set()
+        self._stats = {'hits': 0, 'misses': 0, 'revalidations': 0, 'not_modified': 0, 'evictions': 0}
+
+    def allowed_hosts(self) -> FrozenSet[str]:
+        """Default image hosts, the API host, and any extra hosts in IMAGE_PROXY_HOSTS"""
+        if self._hosts is None:
+            extra = [host.strip() for host in os.getenv('IMAGE_PROXY_HOSTS', '').split(',') if host.strip()]
+            api_host = urlsplit(api_base_url()).hostname
+            self._hosts = frozenset(DEFAULT_IMAGE_HOSTS + tuple(extra) + ((api_host,) if api_host else ()))
+        return self._hosts
+
+    def is_allowed(self, url: Optional[str]) -> bool:
+        if not url:
+            return False
+        parts = urlsplit(url)
+        return parts.scheme in ('http', 'https') and parts.hostname in self.allowed_hosts()
+
+    def proxied_url(self, url: Optional[str]) -> Optional[str]:
+        """Local /img URL for an allowlisted image; other URLs are returned unchanged"""
+        return f"{PROXY_PATH}?url={quote(url, safe='')}" if self.is_allowed(url) else url
+
+    async def get(self, url: str) -> CachedImage:
+        """Return the cached image for url, downloading it on a miss"""
+        if not self.is_allowed(url):
+            raise ImageHostNotAllowed(url)
+        if not self._loaded:
+            await self._load_index()
+        key = hashlib.sha256(url.encode()).hexdigest()
+        image = self._entries.get(key)
+        if image is None:
+            self._stats['misses'] += 1
+            return await self._flights.do(key, lambda: self._fetch(url, key, None))
+        self._stats['hits'] += 1
+        self._entries.move_to_end(key)
+        if time.time() >= image.expires_at:
+            self._revalidate(url, image)
+        return image
+
+    def _revalidate(self, url: str, image: CachedImage):
+        """Conditional GET in the background; the stale copy is served meanwhile"""
+        if image.key in self._revalidating:
+            return
+        self._revalidating.add(image.key)
+
+        async def run():
+            try:
+                await self._flights.do(image.key, lambda: self._fetch(url, image.key, image))
+            except Exception as e:
+                print(f"Error revalidating image {url}: {e}")
+            finally:
+                self._revalidating.discard(image.key)
+
+        self._stats['revalidations'] += 1
+        asyncio.get_running_loop().create_task(run())
+
+    async def open(self, url: str) -> Tuple[CachedImage, BinaryIO]:
+        """The cached image for url with its file opened for reading (see read_chunks).
+
+        An open file stays readable after eviction removes it, so a response
+        streaming it is never cut short; an image evicted between the lookup
+        and the open is downloaded again.
+        """
+        loop = asyncio.get_running_loop()
+        for _ in range(2):
+            image = await self.get(url)
+            try:
+                return image, await loop.run_in_executor(None, open, image.path, 'rb')
+            except FileNotFoundError:
+                self._forget(image)
+        raise ImageFetchError(f"{url} was evicted while being served")
+
+    def _forget(self, image: CachedImage):
+        if self._entries.get(image.key) is image:
+            del self._entries[image.key]
+            self._total_bytes -= image.size
+
+    async def _send(self, url: str, headers: Dict[str, str]):
+        """Streamed GET that only follows redirects to allowlisted hosts"""
+        client = get_async_client()
+        # The shared client defaults to Accept: application/json, which some image hosts honour
+        headers = {'Accept': 'image/*', **headers}
+        for _ in range(MAX_REDIRECTS + 1):
+            request = client.build_request('GET', url, headers=headers, timeout=15)
+            response = await client.send(request, stream=True)
+            if not response.has_redirect_location:
+                return response
+            await response.aclose()
+            url = urljoin(url, response.headers.get('Location', ''))
+            if not self.is_allowed(url):
+                raise ImageHostNotAllowed(url)
+        raise ImageFetchError(f"Too many redirects for {url}")
+
+    async def _fetch(self, url: str, key: str, cached: Optional[CachedImage]) -> CachedImage:
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers['If-None-Match'] = cached.etag
+            if cached.last_modified:
+                headers['If-Modified-Since'] = cached.last_modified
+
+        path = os.path.join(self.directory, key)
+        loop = asyncio.get_running_loop()
+        response = await self._send(url, headers)
+        try:
+            if response.status_code == 304 and cached is not None:
+                self._stats['not_modified'] += 1
+                cached.expires_at = time.time() + _max_age(response.headers, self.ttl)
+                await loop.run_in_executor(None, self._write_meta, cached)
+                return cached
+            response.raise_for_status()
+            content_type = response.headers.get('Content-Type', '').split(';')[0].strip()
+            if not content_type.startswith('image/'):
+                raise ImageFetchError(f"{url} is not an image ({content_type or 'no content type'})")
+
+            # Single-flight per key: no other download writes this temp file
+            tmp_path = f"{path}.tmp"
+            size = 0
+            f = await loop.run_in_executor(None, self._open_temp, tmp_path)
+            try:
+                async for chunk in response.aiter_bytes():
+                    size += len(chunk)
+                    if size > MAX_IMAGE_BYTES:
+                        raise ImageFetchError(f"{url} is larger than {MAX_IMAGE_BYTES} bytes")
+                    await loop.run_in_executor(None, f.write, chunk)
+            except BaseException:
+                await loop.run_in_executor(None, f.close)
+                await loop.run_in_executor(None, _remove, [tmp_path])
+                raise
+            await loop.run_in_executor(None, f.close)
+            # Readers still streaming the previous copy keep their open file
+            await loop.run_in_executor(None, os.replace, tmp_path, path)
+        finally:
+            await response.aclose()
+
+        image = CachedImage(
+            key, path, content_type,
+            response.headers.get('ETag'), response.headers.get('Last-Modified'),
+            time.time() + _max_age(response.headers, self.ttl), size,
+        )
+        await loop.run_in_executor(None, self._write_meta, image)
+        stale = self._store(image)
+        if stale:
+            await loop.run_in_executor(None, _remove, stale)
+        return image
+
+    def _open_temp(self, tmp_path: str) -> BinaryIO:
+        os.makedirs(self.directory, exist_ok=True)
+        return open(tmp_path, 'wb')
+
+    def _store(self, image: CachedImage) -> List[str]:
+        """Add image to the LRU; returns the files of the images evicted to make room"""
+        previous = self._entries.pop(image.key, None)
+        if previous is not None:
+            self._total_bytes -= previous.size
+        self._entries[image.key] = image
+        self._total_bytes += image.size
+        stale = []
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._total_bytes -= evicted.size
+            self._stats['evictions'] += 1
+            stale += [evicted.path, f"{evicted.path}.json"]
+        return stale
+
+    def _write_meta(self, image: CachedImage):
+        try:
+            with open(f"{image.path}.json", 'w') as f:
+                json.dump(image.meta(), f)
+        except OSError as e:
+            print(f"Error saving image cache metadata: {e}")
+
+    async def _load_index(self):
+        """Pick up images cached by a previous run (scanned once, in a worker thread)"""
+        if self._loading is None:
+            self._loading = asyncio.get_running_loop().run_in_executor(None, self._scan_index)
+        # Shielded: a cancelled request must not cancel the scan other requests wait for
+        images = await asyncio.shield(self._loading)
+        if self._loaded:
+            return
+        self._loaded = True
+        # Ahead of anything fetched meanwhile: those are the most recently used
+        entries = OrderedDict((image.key, image) for image in images if image.key not in self._entries)
+        self._total_bytes += sum(image.size for image in entries.values())
+        entries.update(self._entries)
+        self._entries = entries
+
+    def _scan_index(self) -> List[CachedImage]:
+        """Images on disk, oldest (least recently written) first"""
+        images: List[CachedImage] = []
+        try:
+            metas = [entry for entry in os.scandir(self.directory) if entry.name.endswith('.json')]
+        except OSError:
+            return images
+        for meta_entry in sorted(metas, key=lambda entry: entry.stat().st_mtime):
+            key = meta_entry.name[:-len('.json')]
+            path = os.path.join(self.directory, key)
+            try:
+                with open(meta_entry.path) as f:
+                    meta = json.load(f)
+                if not os.path.isfile(path):
+                    continue
+                image = CachedImage(key, path, meta['content_type'], meta.get('etag'),
+                                    meta.get('last_modified'), meta.get('expires_at', 0.0), meta['size'])
+            except (OSError, ValueError, KeyError):
+                continue
+            images.append(image)
+        return images
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._stats, entries=len(self._entries), bytes=self._total_bytes)
+
+
+# Global image proxy
+image_proxy = ImageProxy()
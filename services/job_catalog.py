@@ -0,0 +1,315 @@
+"""
+Process-wide job catalog cache
+Serves normalized jobs from memory with a TTL and stale-while-revalidate:
+once an entry expires the stale copy keeps being served while a single
+background task refreshes it from the API. The full catalog is also indexed
+by job id for the detail routes, in the full-text search index, in the
+facet posting lists behind the /jobs sidebar, in the typeahead
+suggestion index of the search boxes and in the spelling index behind
+"Did you mean".
+"""
+
+import asyncio
+import os
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .async_api_service import AsyncAPIService
+from .autocomplete import SUGGEST_KINDS, SUGGEST_LIMIT, Suggestion, job_suggestions
+from .job_facets import FacetIndex
+from .job_records import JobRecord
+from .job_search import job_search
+from .job_sync import job_sync
+from .pagination import job_pagers
+from .spelling import job_spelling
+
+CATALOG_TTL = float(os.getenv('JOB_CATALOG_TTL', '60'))  # seconds an entry counts as fresh
+NEGATIVE_TTL = float(os.getenv('JOB_NEGATIVE_TTL', '30'))  # seconds an unknown job id is remembered
+MAX_NEGATIVE_ENTRIES = 1024
+
+ALL_JOBS: Tuple[str, ...] = ('all',)
+
+CacheKey = Tuple[str, ...]
+
+
+class _Entry:
+    __slots__ = ('jobs', 'fetched_at', 'task')
+
+    def __init__(self):
+        self.jobs: Optional[List[Dict]] = None
+        self.fetched_at = 0.0
+        self.task: Optional[asyncio.Task] = None
+
+
+class JobCatalog:
+    """Shared in-memory cache of normalized job lists.
+
+    The full catalog and per-vendor lists are cached as separate entries.
+    Callers always get a shallow copy of the cached list so they can sort or
+    extend it freely.
+    """
+
+    def __init__(self, api_service: Optional[AsyncAPIService] = None, ttl: float = CATALOG_TTL):
+        self.api_service = api_service or AsyncAPIService()
+        self.ttl = ttl
+        self._entries: Dict[CacheKey, _Entry] = {}
+        # job id -> job, rebuilt with the full catalog; single-job fetches are added as they happen
+        self._by_id: Dict[str, Dict] = {}
+        # job id -> monotonic time until which the id is known not to exist
+        self._missing: Dict[str, float] = {}
+        self._stats = {
+            'hits': 0,
+            'stale_hits': 0,
+            'misses': 0,
+            'refreshes': 0,
+            'refresh_failures': 0,
+            'id_hits': 0,
+            'id_misses': 0,
+            'negative_hits': 0,
+            'searches': 0,
+        }
+        # The catalog the indexes were last asked to reflect; older pending updates are skipped
+        self._indexed: Optional[List[Dict]] = None
+        # Latest full-text index update (each index's updates run in a worker thread, one after another)
+        self._search_sync: Optional[asyncio.Future] = None
+        # Facet posting lists of the current full catalog (swapped in whole once built)
+        self.facets: Optional[FacetIndex] = None
+        self._facet_build: Optional[asyncio.Future] = None
+        # Latest typeahead index update
+        self._suggest_sync: Optional[asyncio.Future] = None
+        # Latest spelling index update
+        self._spelling_sync: Optional[asyncio.Future] = None
+
+    async def get_jobs(self) -> List[Dict]:
+        """Return the full normalized job catalog"""
+        return await self._get(ALL_JOBS, self._load_all)
+
+    async def get_job(self, job_id) -> Optional[Dict]:
+        """Look up one job by id from the index, falling back to GET /jobs/{id}"""
+        return (await self.get_jobs_by_ids([job_id]))[0]
+
+    async def get_jobs_by_ids(self, job_ids: Iterable) -> List[Optional[Dict]]:
+        """Look up several jobs by id, in order (None for unknown ids).
+
+        Ids missing from the index are fetched concurrently (bounded by the
+        API service) and unknown ids are remembered for NEGATIVE_TTL seconds.
+        """
+        job_ids = [str(job_id) for job_id in job_ids]
+        self._revalidate_index()
+        now = time.monotonic()
+        to_fetch = []
+        for job_id in job_ids:
+            if job_id in self._by_id:
+                self._stats['id_hits'] += 1
+            elif self._missing.get(job_id, 0.0) > now:
+                self._stats['negative_hits'] += 1
+            elif job_id not in to_fetch:
+                self._stats['id_misses'] += 1
+                to_fetch.append(job_id)
+
+        if to_fetch:
+            fetched = await self.api_service.get_jobs_by_ids(to_fetch)
+            expires = time.monotonic() + NEGATIVE_TTL
+            for job_id, job in zip(to_fetch, fetched):
+                if job is None:
+                    self._remember_missing(job_id, expires)
+                else:
+                    self._by_id[job_id] = job
+
+        return [dict(self._by_id[job_id]) if job_id in self._by_id else None for job_id in job_ids]
+
+    async def search_jobs(self, query: str, limit: Optional[int] = None) -> Optional[List[Dict]]:
+        """Full-text search over the catalog: every matching job (or the best limit), most relevant first.
+
+        Each job is a copy with a 'search_snippet' (see job_search.highlight_html),
+        empty past the top job_search.SNIPPET_LIMIT matches.
+        Returns None when the query has no words or full-text search is
+        unavailable, so callers can fall back to their own matching.
+        """
+        await self.get_jobs()
+        # Let the first build finish; later updates are searched as they land
+        await self._first_build(lambda: self._search_sync, lambda: job_search.ready)
+        # Selective queries take ~1 ms, but terms matching much of the catalog are scored in full
+        hits = await asyncio.get_running_loop().run_in_executor(
+            None, job_search.search, query, limit
+        )
+        if hits is None:
+            return None
+        self._stats['searches'] += 1
+        results = []
+        for hit in hits:
+            job = self._by_id.get(hit.job_id)
+            if job is not None:
+                results.append(dict(job, search_snippet=hit.snippet))
+        return results
+
+    async def get_facets(self) -> Optional[FacetIndex]:
+        """Facet index of the full catalog (waits for the first build)"""
+        await self.get_jobs()
+        await self._first_build(lambda: self._facet_build, lambda: self.facets is not None)
+        return self.facets
+
+    async def suggest(self, prefix: str, kinds: Iterable[str] = SUGGEST_KINDS,
+                      limit: int = SUGGEST_LIMIT) -> List[Suggestion]:
+        """Typeahead suggestions for a search box prefix (empty until the first index build lands)"""
+        await self.get_jobs()
+        # Answered from memory in microseconds, so no worker thread; never waits on a build
+        return job_suggestions.suggest(prefix, kinds, limit)
+
+    async def correct_query(self, text: str) -> Optional[str]:
+        """The search text with its misspelled words corrected from the catalog vocabulary, or None"""
+        await self.get_jobs()
+        await self._first_build(lambda: self._spelling_sync, lambda: job_spelling.ready)
+        # A lookup checks a few dozen candidates (~0.1-0.3 ms), so it stays on the loop
+        return job_spelling.correct(text)
+
+    async def get_jobs_by_vendor(self, vendor_id: str) -> List[Dict]:
+        """Return the jobs posted by one vendor"""
+        return await self._get(
+            ('vendor', str(vendor_id)),
+            lambda: self.api_service.get_jobs_with_meta({'vendor_id': vendor_id}),
+        )
+
+    async def get_job_records_by_vendor(self, vendor_id: str) -> List[JobRecord]:
+        """The jobs posted by one vendor as typed records, for render loops (see job_records)"""
+        return await self._get(
+            ('vendor_records', str(vendor_id)),
+            lambda: self.api_service.get_jobs_with_meta({'vendor_id': vendor_id}, as_records=True),
+        )
+
+    def warm_up(self):
+        """Start loading the full catalog, and so building its indexes, before the first request needs them"""
+        entry = self._entries.setdefault(ALL_JOBS, _Entry())
+        if entry.jobs is None:
+            self._refresh(ALL_JOBS, entry, self._load_all)
+
+    def invalidate(self):
+        """Expire every entry so the next read refreshes (call after create/update/delete)"""
+        for entry in self._entries.values():
+            entry.fetched_at = 0.0
+        # Until the catalog reloads, id lookups go to the API rather than serve edited jobs
+        self._by_id.clear()
+        self._missing.clear()
+        job_pagers.clear()
+        # Pull the change into the SQLite mirror too (when it is enabled)
+        job_sync.request_sync()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/refresh counters for monitoring"""
+        return dict(self._stats, entries=len(self._entries), search=job_search.stats(),
+                    facet_jobs=len(self.facets) if self.facets is not None else 0,
+                    suggestions=job_suggestions.stats(), spelling=job_spelling.stats())
+
+    async def _get(self, key: CacheKey, loader: Callable[[], Awaitable[Dict]]) -> List[Dict]:
+        entry = self._entries.setdefault(key, _Entry())
+
+        if entry.jobs is None:
+            # Cold miss: wait for the (shared) load
+            self._stats['misses'] += 1
+            await asyncio.shield(self._refresh(key, entry, loader))
+            return list(entry.jobs or [])
+
+        if time.monotonic() - entry.fetched_at < self.ttl:
+            self._stats['hits'] += 1
+        else:
+            # Serve the stale copy while a background refresh runs
+            self._stats['stale_hits'] += 1
+            self._refresh(key, entry, loader)
+        return list(entry.jobs)
+
+    def _load_all(self) -> Awaitable[Dict]:
+        return self.api_service.get_jobs_with_meta()
+
+    def _revalidate_index(self):
+        """Refresh the full catalog in the background once it (and so the id index) is stale"""
+        entry = self._entries.get(ALL_JOBS)
+        if entry is not None and entry.jobs is not None and time.monotonic() - entry.fetched_at >= self.ttl:
+            self._refresh(ALL_JOBS, entry, self._load_all)
+
+    def _reindex(self, jobs: List[Dict]):
+        self._by_id = {str(job['id']): job for job in jobs if job.get('id') is not None}
+        self._missing.clear()
+        # A 304 or validator-cache hit hands back the same list: nothing to index
+        if self._indexed is not None and (jobs is self._indexed or jobs == self._indexed):
+            return
+        snapshot = self._indexed = list(jobs)
+        # Each index applies catalogs in order, so a slow older update never lands after a newer one
+        if job_search.enabled:
+            self._search_sync = self._after(self._search_sync, job_search.sync, snapshot, 'search index')
+        self._facet_build = self._after(self._facet_build, self._build_facets, snapshot, 'facets')
+        # Diffed against the previous catalog, so only added, edited and removed jobs cost anything
+        self._suggest_sync = self._after(self._suggest_sync, job_suggestions.sync, snapshot, 'suggestions')
+        self._spelling_sync = self._after(self._spelling_sync, job_spelling.sync, snapshot, 'spelling index')
+
+    def _after(self, previous: Optional[asyncio.Future], update: Callable[[List[Dict]], object],
+               snapshot: List[Dict], name: str) -> asyncio.Task:
+        return asyncio.get_running_loop().create_task(self._update_index(previous, update, snapshot, name))
+
+    async def _update_index(self, previous: Optional[asyncio.Future], update: Callable[[List[Dict]], object],
+                            snapshot: List[Dict], name: str):
+        """Run one index update in a worker thread once the previous one is done.
+
+        Skipped when a newer catalog arrived meanwhile: its own update follows.
+        """
+        if previous is not None and not previous.done():
+            await asyncio.wait([previous])
+        if snapshot is not self._indexed:
+            return
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, update, snapshot)
+        except Exception as e:
+            print(f"Error updating job {name}: {e}")
+
+    def _build_facets(self, jobs: List[Dict]):
+        """Build and swap in the facet index (runs in a worker thread)"""
+        self.facets = FacetIndex(jobs)
+
+    @staticmethod
+    async def _first_build(pending: Callable[[], Optional[asyncio.Future]], ready: Callable[[], bool]):
+        """Wait until an index has been built once (or its latest update ended without building it)"""
+        while not ready():
+            update = pending()
+            if update is None or update.done():
+                return
+            await asyncio.shield(update)
+
+    def _remember_missing(self, job_id: str, expires: float):
+        if len(self._missing) >= MAX_NEGATIVE_ENTRIES:
+            now = time.monotonic()
+            self._missing = {k: v for k, v in self._missing.items() if v > now}
+            if len(self._missing) >= MAX_NEGATIVE_ENTRIES:
+                self._missing.clear()
+        self._missing[job_id] = expires
+
+    def _refresh(self, key: CacheKey, entry: _Entry, loader: Callable[[], Awaitable[Dict]]) -> asyncio.Task:
+        """Start a refresh for the entry unless one is already running"""
+        if entry.task is None or entry.task.done():
+            entry.task = asyncio.get_running_loop().create_task(self._load(key, entry, loader))
+        return entry.task
+
+    async def _load(self, key: CacheKey, entry: _Entry, loader: Callable[[], Awaitable[Dict]]):
+        self._stats['refreshes'] += 1
+        try:
+            result = await loader()
+        except Exception as e:
+            print(f"Error refreshing job catalog {key}: {e}")
+            result = None
+
+        if result is None or result.get('meta', {}).get('source') == 'fallback':
+            self._stats['refresh_failures'] += 1
+            if entry.jobs is None:
+                # Nothing cached yet: serve the fallback but retry on the next read
+                entry.jobs = result.get('jobs', []) if result else []
+                entry.fetched_at = 0.0
+                if key == ALL_JOBS:
+                    self._reindex(entry.jobs)
+            return
+
+        entry.jobs = result.get('jobs', [])
+        entry.fetched_at = time.monotonic()
+        if key == ALL_JOBS:
+            self._reindex(entry.jobs)
+
+
+# Global job catalog instance
+job_catalog = JobCatalog()
@@ -0,0 +1,281 @@
+"""
+Faceted filtering for the job catalog
+Every facet value (category, job type, remote, company, normalized location)
+keeps a posting list of the catalog positions that have it, stored as an int
+bitmap. A filter combination is answered by OR-ing the selected values of a
+facet and AND-ing the facets together, and live counts per value are one
+AND plus a popcount each - no per-job predicates.
+
+Numeric salary bounds are range-filtered the same way: each is kept as a
+sorted value array with the matching positions alongside, so a "pays at least
+X" or "pays at most Y" query is one bisect plus a bitmap of the slice.
+
+Each listing sort (Newest/Company/Title) is a permutation of the snapshot,
+computed once from keys derived at build time (epoch posted_ts, casefolded
+text); a filtered page is put in order by mapping its positions to ranks and
+sorting those ints, never by re-deriving keys per job.
+"""
+
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+FACETS = ('category', 'job_type', 'remote', 'company', 'location')
+
+REMOTE = 'remote'
+
+# Listing sorts: mode -> (sort key of one job, descending)
+SORT_KEYS = {
+    'newest': (lambda job: job.get('posted_ts') or 0.0, True),
+    'company': (lambda job: sort_text(job.get('company')), False),
+    'title': (lambda job: sort_text(job.get('title')), False),
+}
+
+# Range filters: selection key -> (numeric job field, bound). A job whose range
+# overlaps the requested one matches; jobs without a numeric salary are kept.
+RANGE_FILTERS = {
+    'min_salary': ('salary_max', 'at_least'),
+    'max_salary': ('salary_min', 'at_most'),
+}
+
+_SPACES = re.compile(r'\s+')
+
+try:
+    _popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def _popcount(bits: int) -> int:
+        return bin(bits).count('1')
+
+
+def normalize_location(location) -> Optional[str]:
+    """Group spellings of the same place: 'New York, NY' and ' new york' -> 'new york'"""
+    text = _SPACES.sub(' ', str(location or '')).strip().casefold()
+    if not text or text == 'location not specified':
+        return None
+    if REMOTE in text:
+        return REMOTE
+    return text.split(',')[0].strip() or None
+
+
+def sort_text(value) -> str:
+    """Casefolded, whitespace-collapsed sort key"""
+    return _SPACES.sub(' ', str(value or '')).strip().casefold()
+
+
+def is_remote(job: Mapping) -> bool:
+    return bool(job.get('remote')) or any(
+        REMOTE in str(job.get(field) or '').casefold() for field in ('location', 'job_type')
+    )
+
+
+def _facet_values(job: Mapping) -> Iterable[Tuple[str, str, str]]:
+    """(facet, key, label) for every facet value of one job"""
+    for facet in ('category', 'job_type', 'company'):
+        label = _SPACES.sub(' ', str(job.get(facet) or '')).strip()
+        if label:
+            yield facet, label.casefold(), label
+    location = normalize_location(job.get('location'))
+    if location:
+        yield 'location', location, 'Remote' if location == REMOTE else location.title()
+    if is_remote(job):
+        yield 'remote', REMOTE, 'Remote'
+
+
+def positions(bits: int) -> List[int]:
+    """Set bit positions, lowest first (scans the binary string in C)"""
+    text = bin(bits)[:1:-1]
+    out = []
+    index = text.find('1')
+    while index != -1:
+        out.append(index)
+        index = text.find('1', index + 1)
+    return out
+
+
+def bitmap(value_positions: Iterable[int], size: int) -> int:
+    """Bitmap with the given positions set, built bytewise (shifting into a big int is quadratic)"""
+    buffer = bytearray((size + 7) // 8)
+    for position in value_positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+def _number(value) -> Optional[float]:
+    if value is None or value == '' or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class RangeIndex:
+    """Sorted values of one numeric field and the catalog positions they belong to"""
+
+    __slots__ = ('values', 'positions', 'missing', 'size')
+
+    def __init__(self, jobs: List[Dict], field: str):
+        self.size = len(jobs)
+        known, missing = [], []
+        for position, job in enumerate(jobs):
+            value = _number(job.get(field))
+            if value is None:
+                missing.append(position)
+            else:
+                known.append((value, position))
+        known.sort()
+        self.values = array('d', [value for value, _ in known])
+        self.positions = array('l', [position for _, position in known])
+        self.missing = bitmap(missing, self.size)
+
+    def at_least(self, value: float) -> int:
+        """Bitmap of jobs whose field is >= value"""
+        return bitmap(self.positions[bisect_left(self.values, value):], self.size)
+
+    def at_most(self, value: float) -> int:
+        """Bitmap of jobs whose field is <= value"""
+        return bitmap(self.positions[:bisect_right(self.values, value)], self.size)
+
+
+class SortOrder:
+    """One sort of a snapshot: order[rank] -> position, and rank[position] -> rank"""
+
+    __slots__ = ('order', 'rank')
+
+    def __init__(self, jobs: List[Dict], key, descending: bool):
+        keys = [key(job) for job in jobs]
+        # Stable, so equal keys keep catalog order in both directions
+        self.order = array('l', sorted(range(len(jobs)), key=keys.__getitem__, reverse=descending))
+        self.rank = array('l', bytes(self.order.itemsize * len(jobs)))
+        for rank, position in enumerate(self.order):
+            self.rank[position] = rank
+
+    def sorted_positions(self, bits: int) -> List[int]:
+        """Positions of bits in this order"""
+        size = len(self.order)
+        if _popcount(bits) * 5 >= size:
+            # Dense: walk the order and test membership bytewise
+            members = bits.to_bytes((size + 7) // 8, 'little')
+            return [position for position in self.order if members[position >> 3] >> (position & 7) & 1]
+        # Sparse: sort the selected positions' ranks
+        return [self.order[rank] for rank in sorted(map(self.rank.__getitem__, positions(bits)))]
+
+
+class FacetIndex:
+    """Immutable posting-list index over one catalog snapshot; rebuilt (and swapped) on reindex"""
+
+    __slots__ = ('jobs', 'all_bits', '_position', '_postings', '_labels', 'ranges', 'orders')
+
+    def __init__(self, jobs: List[Dict]):
+        self.jobs = jobs
+        self.all_bits = (1 << len(jobs)) - 1
+        self._position: Dict[str, int] = {}
+        # facet -> key -> bitmap, and facet -> key -> display label (first spelling seen)
+        self._postings: Dict[str, Dict[str, int]] = {facet: {} for facet in FACETS}
+        self._labels: Dict[str, Dict[str, str]] = {facet: {} for facet in FACETS}
+        # Collect positions per value first; one int per value is built at the end
+        collected: Dict[str, Dict[str, List[int]]] = {facet: {} for facet in FACETS}
+        for position, job in enumerate(jobs):
+            if job.get('id') is not None:
+                self._position.setdefault(str(job['id']), position)
+            for facet, key, label in _facet_values(job):
+                collected[facet].setdefault(key, []).append(position)
+                self._labels[facet].setdefault(key, label)
+        for facet, values in collected.items():
+            self._postings[facet] = {key: bitmap(value_positions, len(jobs)) for key, value_positions in values.items()}
+        self.ranges = {field: RangeIndex(jobs, field) for field, _ in RANGE_FILTERS.values()}
+        self.orders = {mode: SortOrder(jobs, key, descending) for mode, (key, descending) in SORT_KEYS.items()}
+
+    def _range_bits(self, name: str, value) -> int:
+        """Bitmap for a range filter: jobs inside the bound plus those without a salary"""
+        bound = _number(value)
+        if bound is None:
+            return self.all_bits
+        field, method = RANGE_FILTERS[name]
+        index = self.ranges[field]
+        return getattr(index, method)(bound) | index.missing
+
+    def _facet_bits(self, facet: str, selected) -> int:
+        """Bitmap for one facet's selection: a value, a list of values (OR), or for location a substring"""
+        postings = self._postings[facet]
+        if facet == 'remote':
+            return postings.get(REMOTE, 0) if selected else self.all_bits
+        values = selected if isinstance(selected, (list, tuple, set)) else [selected]
+        bits = 0
+        for value in values:
+            if facet == 'location':
+                needle = _SPACES.sub(' ', str(value)).strip().casefold()
+                for key, posting in postings.items():
+                    if needle in key:
+                        bits |= posting
+            else:
+                bits |= postings.get(_SPACES.sub(' ', str(value)).strip().casefold(), 0)
+        return bits
+
+    def _active(self, selection: Mapping) -> Dict[str, object]:
+        return {facet: value for facet, value in selection.items()
+                if (facet in self._postings or facet in RANGE_FILTERS)
+                and value not in (None, '', False, [], 'All')}
+
+    def select(self, selection: Mapping, base: Optional[int] = None) -> int:
+        """Bitmap of jobs matching every facet and range filter in selection (values 'All'/None/'' are ignored)"""
+        bits = self.all_bits if base is None else base
+        for facet, value in self._active(selection).items():
+            bits &= self._range_bits(facet, value) if facet in RANGE_FILTERS else self._facet_bits(facet, value)
+            if not bits:
+                break
+        return bits
+
+    def counts(self, selection: Mapping, facets: Iterable[str] = FACETS,
+               base: Optional[int] = None) -> Dict[str, List[Tuple[str, int]]]:
+        """Per facet, (label, count) of every value under the other facets' selections, most common first"""
+        active = self._active(selection)
+        all_bits = self.all_bits if base is None else base
+        result = {}
+        for facet in facets:
+            others = self.select({name: value for name, value in active.items() if name != facet}, all_bits)
+            labels = self._labels[facet]
+            values = [(labels[key], _popcount(posting & others)) for key, posting in self._postings[facet].items()]
+            values.sort(key=lambda item: (-item[1], item[0].casefold()))
+            result[facet] = values
+        return result
+
+    def bits_for(self, jobs: Iterable[Mapping]) -> int:
+        """Bitmap of the given jobs (by id) within this snapshot"""
+        found = (self._position.get(str(job.get('id'))) for job in jobs)
+        return bitmap((position for position in found if position is not None), len(self.jobs))
+
+    def jobs_for(self, bits: int) -> List[Dict]:
+        """The jobs in a bitmap, in catalog order"""
+        return [self.jobs[position] for position in positions(bits)]
+
+    def sorted_jobs(self, bits: int, mode: str, jobs: Optional[Iterable[Dict]] = None) -> List[Dict]:
+        """The jobs in bits in a precomputed order (see SORT_KEYS).
+
+        With jobs, those records stand in for the catalog's (e.g. search hits
+        carrying snippets) and only they are returned.
+        """
+        ordered = self.orders[mode].sorted_positions(bits)
+        if jobs is None:
+            return [self.jobs[position] for position in ordered]
+        records = {}
+        for job in jobs:
+            position = self._position.get(str(job.get('id')))
+            if position is not None:
+                records.setdefault(position, job)
+        return [records[position] for position in ordered if position in records]
+
+    def filter_jobs(self, jobs: Iterable[Dict], bits: int) -> List[Dict]:
+        """Keep the given jobs (in their order, e.g. by relevance) whose position is in bits"""
+        # Shifting the catalog-sized int once per job would be quadratic: test bytewise
+        members = bits.to_bytes((len(self.jobs) + 7) // 8, 'little')
+        out = []
+        for job in jobs:
+            position = self._position.get(str(job.get('id')))
+            if position is not None and members[position >> 3] >> (position & 7) & 1:
+                out.append(job)
+        return out
+
+    def __len__(self) -> int:
+        return len(self.jobs)
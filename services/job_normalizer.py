@@ -0,0 +1,254 @@
+"""
+Schema-driven job normalizer
+The upstream API has used several field names for the same data over time
+(title/job_title/jobTitle, many flyer aliases, ...). Instead of walking every
+alias chain for every job, a specialized accessor is compiled once per payload
+shape (the record's key set) and reused for every record of that shape.
+"""
+
+import logging
+import re
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (normalized field, upstream aliases in priority order, default)
+JOB_FIELDS = (
+    ('id', ('id', '_id', 'job_id'), None),
+    ('title', ('title', 'job_title', 'jobTitle'), 'Untitled Job'),
+    ('company', ('company', 'company_name', 'employer'), 'Company not specified'),
+    ('location', ('location', 'job_location', 'city'), 'Location not specified'),
+    ('description', ('description', 'job_description', 'jobDetail', 'details'), 'Job description not available'),
+    ('requirements', ('requirements', 'job_requirements', 'qualifications'), ''),
+    ('salary', None, ''),  # derived, see SALARY_RANGES
+    ('salary_min', None, None),  # numeric, parsed once here (see parse_salary)
+    ('salary_max', None, None),
+    ('salary_currency', ('salary_currency', 'currency'), None),
+    ('job_type', ('job_type', 'employment_type', 'type'), 'Full-time'),
+    ('category', ('category', 'job_category'), 'Technology'),  # Technology instead of General
+    ('posted_date', ('date_posted', 'posted_date', 'created_at'), 'Recently'),
+    ('posted_ts', None, 0.0),  # epoch seconds of posted_date, the "Newest" sort key (see epoch_seconds)
+    ('vendor_id', ('vendor_id', 'vendorId', 'employer_id'), None),
+    ('updated_at', ('updated_at', 'updatedAt', 'modified_at'), None),  # delta sync cursor
+    ('benefits', ('benefits', 'perks'), ''),
+    ('flyer', ('flyer', 'flyer_url', 'flyerUrl', 'image', 'image_url', 'imageUrl',
+               'banner', 'banner_url', 'file_url', 'file'), None),  # made absolute
+)
+
+# Numeric salary range field pairs, in priority order; a plain 'salary' string is the fallback
+SALARY_RANGES = (('salary_min', 'salary_max'), ('min_salary', 'max_salary'))
+
+MAX_COMPILED_SHAPES = 64
+
+Normalizer = Callable[[Dict, Callable], Dict]
+_compiled: Dict[Tuple[str, ...], Normalizer] = {}
+
+
+# Currency symbols and the ISO codes they stand for; symbols are also used when formatting
+CURRENCY_SYMBOLS = {'$': 'USD', '€': 'EUR', '£': 'GBP', '₵': 'GHS', '₦': 'NGN', '₹': 'INR', '¥': 'JPY'}
+_SYMBOL_FOR = {code: symbol for symbol, code in CURRENCY_SYMBOLS.items()}
+_CURRENCY_CODE = re.compile(r'\b(USD|EUR|GBP|GHS|NGN|KES|ZAR|CAD|AUD|INR|JPY|CHF)\b', re.IGNORECASE)
+# '120,000', '120000.50', '120k', '1.2m' - separators are only commas between groups of three
+_AMOUNT = re.compile(r'(\d{1,3}(?:,\d{3})+|\d+)(?:\.(\d+))?\s*([km])?(?![a-z])', re.IGNORECASE)
+_MULTIPLIERS = {'k': 1000, 'm': 1000000}
+
+
+def _number(value) -> Optional[float]:
+    if value is None or value == '' or isinstance(value, bool):
+        return None
+    try:
+        return float(str(value).replace(',', ''))
+    except ValueError:
+        return None
+
+
+def parse_salary(value) -> Tuple[Optional[float], Optional[float], Optional[str]]:
+    """(min, max, currency) of a salary string like '$120,000 - $160,000', '€50k-60k' or 'GHS 4,000'.
+
+    A single amount is both min and max; text without an amount ('Negotiable')
+    gives (None, None, currency-or-None).
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value), float(value), None
+    text = str(value or '')
+    currency = next((code for symbol, code in CURRENCY_SYMBOLS.items() if symbol in text), None)
+    if currency is None:
+        match = _CURRENCY_CODE.search(text)
+        currency = match.group(1).upper() if match else None
+    amounts = []
+    for whole, fraction, suffix in _AMOUNT.findall(text)[:2]:
+        amounts.append((float(whole.replace(',', '') + ('.' + fraction if fraction else '')), suffix.lower()))
+    if len(amounts) == 2 and amounts[1][1] and not amounts[0][1] and amounts[0][0] < 1000:
+        # '50-60k': the suffix applies to both ends
+        amounts[0] = (amounts[0][0], amounts[1][1])
+    amounts = [amount * _MULTIPLIERS.get(suffix, 1) for amount, suffix in amounts]
+    if not amounts:
+        return None, None, currency
+    if len(amounts) == 2:
+        return min(amounts), max(amounts), currency
+    return amounts[0], amounts[0], currency
+
+
+def salary_bounds(low, high, currency=None) -> Tuple[Optional[float], Optional[float], Optional[str]]:
+    """(min, max, currency) of numeric upstream range fields; a missing end takes the other's value"""
+    low, high = _number(low), _number(high)
+    return (low if low is not None else high), (high if high is not None else low), currency or None
+
+
+def salary_range(low, high, currency=None) -> str:
+    """Format a numeric salary range like '$120,000 - $160,000'"""
+    symbol = _SYMBOL_FOR.get(currency or 'USD', f"{currency} ")
+    low, high = _number(low), _number(high)
+    if low is None and high is None:
+        return ''
+    if low is None or high is None or low == high:
+        return f"{symbol}{(low if low is not None else high):,.0f}"
+    return f"{symbol}{low:,.0f} - {symbol}{high:,.0f}"
+
+
+_RELATIVE_DATE = re.compile(r'(\d+|an?)\s+(minute|hour|day|week|month|year)s?\s+ago', re.IGNORECASE)
+_UNIT_SECONDS = {'minute': 60, 'hour': 3600, 'day': 86400, 'week': 7 * 86400,
+                 'month': 30 * 86400, 'year': 365 * 86400}
+
+MAX_FIRST_SEEN = 65536
+# (job id, relative date text) -> its epoch seconds when first seen, so re-normalizing the
+# same job gives the same posted_ts (and the same content hash in the mirror and the indexes)
+_first_seen: Dict[Tuple[str, str], float] = {}
+
+
+def epoch_seconds(value, seen_as=None) -> float:
+    """Epoch seconds of a posted date: epoch s/ms, ISO 8601, or relative ('2 days ago'); 0.0 if unknown.
+
+    Relative dates count back from the first time job seen_as (an id) had that text,
+    or from now without one.
+    """
+    if isinstance(value, bool) or value is None:
+        return 0.0
+    if isinstance(value, (int, float)):
+        # assume seconds if small, ms if large
+        return float(value if value < 10_000_000_000 else value / 1000.0)
+    text = str(value).strip()
+    if text.isdigit():
+        return epoch_seconds(int(text))
+    try:
+        return datetime.fromisoformat(text.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        pass
+    match = _RELATIVE_DATE.search(text)
+    if match:
+        count = 1 if match.group(1).isalpha() else int(match.group(1))
+        if seen_as is None:
+            anchor = time.time()
+        else:
+            key = (str(seen_as), text)
+            anchor = _first_seen.get(key)
+            if anchor is None:
+                if len(_first_seen) >= MAX_FIRST_SEEN:
+                    _first_seen.clear()
+                anchor = _first_seen.setdefault(key, time.time())
+        return anchor - count * _UNIT_SECONDS[match.group(2).lower()]
+    return 0.0
+
+
+def _or_chain(aliases: Iterable[str], present: set, default) -> str:
+    """Source for `g(a) or g(b) or default`, limited to aliases the shape actually has"""
+    terms = [f"g({alias!r})" for alias in aliases if alias in present]
+    terms.append(repr(default))
+    return ' or '.join(terms)
+
+
+def _salary_lines(present: set) -> List[str]:
+    """Source binding salary (display text) and its numeric salary_min/max/currency.
+
+    Numeric range fields win (the display string is kept when there is one);
+    otherwise the display string is parsed once here so filters and sorting
+    never have to parse it again.
+    """
+    currency = _or_chain(('salary_currency', 'currency'), present, None)
+    text = "job['salary']" if 'salary' in present else "''"
+    lines = [f"    salary = {text}"]
+    for low, high in SALARY_RANGES:
+        if low in present and high in present:
+            lines += [
+                f"    salary_min, salary_max, salary_currency = salary_bounds(job[{low!r}], job[{high!r}], {currency})",
+                "    if salary_min is not None:",
+                "        salary = salary or salary_range(salary_min, salary_max, salary_currency)",
+                "    else:",
+                "        salary_min, salary_max, parsed_currency = parse_salary(salary)",
+                "        salary_currency = salary_currency or parsed_currency",
+            ]
+            return lines
+    lines += [
+        "    salary_min, salary_max, parsed_currency = parse_salary(salary)",
+        f"    salary_currency = {currency} or parsed_currency",
+    ]
+    return lines
+
+
+def _compile(shape: Tuple[str, ...]) -> Normalizer:
+    """Generate and compile a normalizer for records with exactly these keys.
+
+    Only the constant aliases/defaults above end up in the generated source;
+    upstream keys are used for membership tests, never interpolated.
+    """
+    present = set(shape)
+    lines = ["def normalize(job, to_abs):", "    g = job.get"]
+    lines.extend(_salary_lines(present))
+    items = []
+    for field, aliases, default in JOB_FIELDS:
+        if field.startswith('salary'):
+            items.append(f"{field!r}: {field}")
+        elif field == 'id':
+            lines.append(f"    job_id = {_or_chain(aliases, present, default)}")
+            items.append(f"{field!r}: job_id")
+        elif field == 'posted_date':
+            lines.append(f"    posted = {_or_chain(aliases, present, default)}")
+            items.append(f"{field!r}: posted")
+        elif field == 'posted_ts':
+            items.append(f"{field!r}: epoch_seconds(posted, job_id)")
+        elif field == 'flyer':
+            lines.append(f"    flyer = {_or_chain(aliases, present, None)}")
+            items.append(f"{field!r}: to_abs(flyer) if flyer else None")
+        else:
+            items.append(f"{field!r}: {_or_chain(aliases, present, default)}")
+    lines.append("    return {" + ", ".join(items) + "}")
+    source = "\n".join(lines)
+
+    namespace = {'salary_range': salary_range, 'salary_bounds': salary_bounds, 'parse_salary': parse_salary,
+                 'epoch_seconds': epoch_seconds}
+    exec(compile(source, f"<job normalizer #{len(_compiled)}>", 'exec'), namespace)
+    logger.debug("Compiled job normalizer for shape %s:\n%s", shape, source)
+    return namespace['normalize']
+
+
+def _normalizer_for(job: Dict) -> Normalizer:
+    shape = tuple(job)
+    fn = _compiled.get(shape)
+    if fn is None:
+        if len(_compiled) >= MAX_COMPILED_SHAPES:
+            _compiled.clear()
+        fn = _compiled[shape] = _compile(shape)
+    return fn
+
+
+def normalize_job(job: Dict, to_abs: Callable[[Optional[str]], Optional[str]]) -> Dict:
+    """Normalize a single upstream job dict"""
+    return _normalizer_for(job)(job, to_abs)
+
+
+def normalize_jobs(raw_jobs: Iterable[Dict], to_abs: Callable[[Optional[str]], Optional[str]]) -> List[Dict]:
+    """Normalize a batch, reusing the compiled accessor while consecutive records share a shape"""
+    out = []
+    last_shape = None
+    fn = None
+    for job in raw_jobs:
+        shape = tuple(job)
+        if shape != last_shape:
+            fn = _normalizer_for(job)
+            last_shape = shape
+        out.append(fn(job, to_abs))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Normalized %d jobs (%d compiled shapes)", len(out), len(_compiled))
+    return out
@@ -0,0 +1,114 @@
+"""
+Typed job records parsed straight from /jobs response bytes
+The opt-in alternative to the normalized job dicts (as_records=True on
+APIService.get_jobs / get_jobs_with_meta): the whole body goes through one
+pydantic validate_json pass into JobRecord, a __slots__ dataclass with the
+normalized fields, so render loops read attributes instead of probing dict
+keys. A malformed record is skipped on its own instead of failing the list.
+"""
+
+import dataclasses
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from pydantic import BaseModel, ConfigDict, TypeAdapter, ValidationError, ValidationInfo, WrapValidator, model_validator
+from pydantic.dataclasses import dataclass
+from typing_extensions import Annotated
+
+from .job_normalizer import normalize_job
+
+# slots=True needs Python 3.10; older interpreters get plain (dict-backed) records
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS, config=ConfigDict(extra='ignore', coerce_numbers_to_str=True))
+class JobRecord:
+    """One normalized job (the fields of job_normalizer.JOB_FIELDS, plus upstream counters)"""
+
+    id: Optional[str] = None
+    title: str = 'Untitled Job'
+    company: str = 'Company not specified'
+    location: str = 'Location not specified'
+    description: str = 'Job description not available'
+    requirements: Union[str, List[str]] = ''
+    salary: str = ''
+    salary_min: Optional[float] = None
+    salary_max: Optional[float] = None
+    salary_currency: Optional[str] = None
+    job_type: str = 'Full-time'
+    category: str = 'Technology'
+    posted_date: str = 'Recently'
+    posted_ts: float = 0.0
+    vendor_id: Optional[str] = None
+    updated_at: Optional[str] = None
+    benefits: Union[str, List[str]] = ''
+    flyer: Optional[str] = None
+    # Not part of the normalized dicts, but kept when the upstream record has them
+    application_count: int = 0
+    view_count: int = 0
+
+    @model_validator(mode='before')
+    @classmethod
+    def _normalize_upstream(cls, data: Any, info: ValidationInfo) -> Any:
+        """Raw upstream records are normalized first; already-normalized dicts (context normalized) are not"""
+        context = info.context or {}
+        if not isinstance(data, dict) or context.get('normalized'):
+            return data
+        job = normalize_job(data, context.get('to_abs') or _same_url)
+        job['application_count'] = data.get('application_count') or 0
+        job['view_count'] = data.get('view_count') or 0
+        return job
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The record as a job dict, for code paths that still take dicts"""
+        return dataclasses.asdict(self)
+
+
+def _same_url(url: Optional[str]) -> Optional[str]:
+    return url
+
+
+def _skip_invalid(value: Any, handler) -> Optional[JobRecord]:
+    try:
+        return handler(value)
+    except ValidationError as e:
+        print(f"Skipping malformed job record: {e.error_count()} invalid field(s)")
+        return None
+
+
+# A list item: a record, or None for one that failed validation
+_Item = Annotated[Optional[JobRecord], WrapValidator(_skip_invalid)]
+
+
+class _JobPage(BaseModel):
+    """The dict shapes of a /jobs body; fields other than the list are meta"""
+
+    model_config = ConfigDict(extra='allow')
+
+    data: Optional[List[_Item]] = None
+    jobs: Optional[List[_Item]] = None
+    results: Optional[List[_Item]] = None
+
+
+JOB_PAGE = TypeAdapter(Union[List[_Item], _JobPage])
+JOB_RECORDS = TypeAdapter(List[_Item])
+
+
+def parse_job_records(body: Union[bytes, str],
+                      to_abs: Callable[[Optional[str]], Optional[str]]) -> Tuple[List[JobRecord], Dict[str, Any]]:
+    """(records, meta) of a /jobs response body, like APIService._extract_jobs plus normalization.
+
+    Raises ValueError (pydantic.ValidationError) when the body is not JSON or not a /jobs shape.
+    """
+    page = JOB_PAGE.validate_json(body, context={'to_abs': to_abs})
+    if isinstance(page, list):
+        items, meta = page, {}
+    else:
+        items, meta = page.data or page.jobs or page.results or [], dict(page.model_extra or {})
+    return [record for record in items if record is not None], meta
+
+
+def job_records(jobs: Iterable[Dict]) -> List[JobRecord]:
+    """Records of already-normalized job dicts (mirror rows, cached or fallback results)"""
+    return [record for record in JOB_RECORDS.validate_python(list(jobs), context={'normalized': True})
+            if record is not None]
@@ -0,0 +1,189 @@
+"""
+Full-text job search
+An SQLite FTS5 index over title, company, location, description,
+requirements and benefits, kept in sync with the job catalog. Queries match
+word prefixes with accents folded (unicode61 remove_diacritics 2), are
+ranked by BM25 with title and company weighted highest, and come back with
+a highlighted snippet of the best matching field.
+
+FTS5 ships with the SQLite bundled in CPython; when it is missing the index
+stays disabled and callers keep their substring matching.
+"""
+
+import hashlib
+import html
+import json
+import re
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional
+
+SNIPPET_LIMIT = 200  # matches past the top ones come back without a snippet
+MAX_QUERY_TERMS = 8
+
+# Indexed fields and their BM25 weights
+SEARCH_FIELDS = (
+    ('title', 10.0),
+    ('company', 5.0),
+    ('location', 2.0),
+    ('description', 1.0),
+    ('requirements', 1.0),
+    ('benefits', 1.0),
+)
+
+# Snippet match markers; highlight_html() turns them into <mark> after escaping
+MATCH_START = '\x02'
+MATCH_END = '\x03'
+SNIPPET_TOKENS = 12
+
+_TERM = re.compile(r'\w+', re.UNICODE)
+
+SCHEMA = f"""
+CREATE TABLE docs (
+    id INTEGER PRIMARY KEY,
+    job_id TEXT NOT NULL UNIQUE,
+    hash TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE job_text USING fts5(
+    {', '.join(field for field, _ in SEARCH_FIELDS)},
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+"""
+
+
+def _field_text(value) -> str:
+    if isinstance(value, (list, tuple)):
+        return '\n'.join(str(item) for item in value if item)
+    return str(value) if value else ''
+
+
+def match_query(text: str) -> Optional[str]:
+    """FTS5 MATCH expression: every word of text as a quoted prefix term (all must match)"""
+    terms = _TERM.findall(text or '')[:MAX_QUERY_TERMS]
+    if not terms:
+        return None
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def highlight_html(snippet: str) -> str:
+    """Escape a snippet for ui.html and wrap the matched words in <mark>"""
+    return html.escape(snippet).replace(MATCH_START, '<mark>').replace(MATCH_END, '</mark>')
+
+
+class SearchHit:
+    __slots__ = ('job_id', 'score', 'snippet')
+
+    def __init__(self, job_id: str, score: float, snippet: str):
+        self.job_id = job_id
+        self.score = score
+        self.snippet = snippet
+
+
+class JobSearchIndex:
+    """In-memory FTS5 index of the job catalog.
+
+    sync() makes the index match a job list, rewriting only the documents
+    whose indexed text changed; it can run in a worker thread while the
+    event loop searches (both take the connection lock).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.enabled = True
+        self.ready = False
+        self._rank_sql = 'bm25(job_text, {})'.format(', '.join(str(weight) for _, weight in SEARCH_FIELDS))
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None and self.enabled:
+            conn = sqlite3.connect(':memory:', check_same_thread=False)
+            try:
+                conn.executescript(SCHEMA)
+            except sqlite3.OperationalError as e:
+                print(f"Full-text search disabled (SQLite without FTS5): {e}")
+                self.enabled = False
+                conn.close()
+                return None
+            self._conn = conn
+        return self._conn
+
+    def sync(self, jobs: Iterable[Dict]) -> Dict[str, int]:
+        """Index exactly these jobs (by id); returns added/updated/removed counts"""
+        counts = {'added': 0, 'updated': 0, 'removed': 0}
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return counts
+            with conn:
+                known = {job_id: (doc_id, digest) for doc_id, job_id, digest in conn.execute('SELECT id, job_id, hash FROM docs')}
+                seen = set()
+                for job in jobs:
+                    if job.get('id') is None:
+                        continue
+                    job_id = str(job['id'])
+                    if job_id in seen:
+                        continue
+                    seen.add(job_id)
+                    values = [_field_text(job.get(field)) for field, _ in SEARCH_FIELDS]
+                    digest = hashlib.sha1(json.dumps(values).encode()).hexdigest()
+                    previous = known.get(job_id)
+                    if previous is not None:
+                        if previous[1] == digest:
+                            continue
+                        conn.execute('DELETE FROM job_text WHERE rowid = ?', (previous[0],))
+                        conn.execute('UPDATE docs SET hash = ? WHERE id = ?', (digest, previous[0]))
+                        doc_id = previous[0]
+                        counts['updated'] += 1
+                    else:
+                        doc_id = conn.execute('INSERT INTO docs (job_id, hash) VALUES (?, ?)', (job_id, digest)).lastrowid
+                        counts['added'] += 1
+                    conn.execute(
+                        f"INSERT INTO job_text (rowid, {', '.join(field for field, _ in SEARCH_FIELDS)}) "
+                        f"VALUES (?, {', '.join('?' * len(SEARCH_FIELDS))})",
+                        (doc_id, *values),
+                    )
+                removed = [(doc_id,) for job_id, (doc_id, _) in known.items() if job_id not in seen]
+                conn.executemany('DELETE FROM job_text WHERE rowid = ?', removed)
+                conn.executemany('DELETE FROM docs WHERE id = ?', removed)
+                counts['removed'] = len(removed)
+            self.ready = True
+        return counts
+
+    def search(self, text: str, limit: Optional[int] = None,
+               snippets: int = SNIPPET_LIMIT) -> Optional[List[SearchHit]]:
+        """Every match for text (or the best limit), most relevant first; None when the index cannot answer.
+
+        Result counts and facets are computed over all matches, so nothing is
+        cut off by default; only the top `snippets` hits get a snippet.
+        """
+        query = match_query(text)
+        if query is None or not self.ready:
+            return None
+        with self._lock:
+            # Rank first, then build snippets for the top rows only
+            rows = self._conn.execute(
+                "SELECT hits.rowid, docs.job_id, hits.score "
+                f"FROM (SELECT rowid, {self._rank_sql} AS score FROM job_text "
+                "      WHERE job_text MATCH ? ORDER BY score LIMIT ?) AS hits "
+                "JOIN docs ON docs.id = hits.rowid ORDER BY hits.score",
+                (query, limit if limit is not None else -1),
+            ).fetchall()
+            top = [rowid for rowid, _, _ in rows[:snippets]]
+            found = dict(self._conn.execute(
+                f"SELECT rowid, snippet(job_text, -1, ?, ?, '…', {SNIPPET_TOKENS}) FROM job_text "
+                f"WHERE job_text MATCH ? AND rowid IN ({', '.join('?' * len(top))})",
+                (MATCH_START, MATCH_END, query, *top),
+            )) if top else {}
+        return [SearchHit(job_id, score, found.get(rowid, '')) for rowid, job_id, score in rows]
+
+    def stats(self) -> Dict:
+        if not self.ready:
+            return {'enabled': self.enabled, 'ready': False, 'documents': 0}
+        with self._lock:
+            documents = self._conn.execute('SELECT COUNT(*) FROM docs').fetchone()[0]
+        return {'enabled': self.enabled, 'ready': True, 'documents': documents}
+
+
+# Global search index, fed by the job catalog
+job_search = JobSearchIndex()
@@ -0,0 +1,392 @@
+"""
+SQLite mirror of the upstream catalog
+Normalized jobs, applicants and the vendors derived from them are kept in a
+local SQLite database that the background sync (see job_sync) keeps up to
+date. With JOB_READ_MODE=mirror the API services answer reads from here, so
+page latency no longer depends on the remote API.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+JOB_STORE_PATH = os.getenv('JOB_STORE_PATH', os.path.join('.cache', 'jobs.sqlite3'))
+
+# Filters the mirror can answer; a query with any other filter goes to the API
+SEARCH_PARAMS = ('search', 'q', 'keyword')
+JOB_TYPE_PARAMS = ('job_type', 'employment_type')
+PAGING_PARAMS = ('page', 'limit', 'offset')
+# Salary bounds -> the normalized numeric field they compare with; jobs without one are kept
+SALARY_FILTERS = {'min_salary': ('salary_max', '>='), 'max_salary': ('salary_min', '<=')}
+MIRROR_FILTERS = frozenset(SEARCH_PARAMS + JOB_TYPE_PARAMS + PAGING_PARAMS + tuple(SALARY_FILTERS) +
+                           ('sort', 'location', 'category', 'company', 'vendor_id', 'remote'))
+
+# Server sort hints (see jobs_page) -> ORDER BY
+SORT_ORDERS = {
+    'created_at:desc': 'posted_ts DESC, position',
+    'company:asc': 'company COLLATE NOCASE, position',
+    'title:asc': 'title COLLATE NOCASE, position',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    vendor_id TEXT,
+    title TEXT,
+    company TEXT,
+    location TEXT,
+    category TEXT COLLATE NOCASE,
+    job_type TEXT COLLATE NOCASE,
+    posted_date TEXT,
+    posted_ts REAL,
+    updated_at TEXT,
+    position INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_vendor_id ON jobs (vendor_id);
+CREATE INDEX IF NOT EXISTS jobs_category ON jobs (category);
+CREATE INDEX IF NOT EXISTS jobs_job_type ON jobs (job_type);
+
+CREATE TABLE IF NOT EXISTS applicants (
+    id TEXT PRIMARY KEY,
+    job_id TEXT,
+    hash TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS applicants_job_id ON applicants (job_id);
+
+CREATE TABLE IF NOT EXISTS vendors (
+    id TEXT PRIMARY KEY,
+    company TEXT,
+    job_count INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    resource TEXT PRIMARY KEY,
+    cursor TEXT,
+    synced_at REAL NOT NULL
+);
+"""
+
+# Run after SCHEMA; each step is skipped when the database already has it
+MIGRATIONS = (
+    # posted_ts: the numeric "Newest" sort key (posted_date is a display string like "2 days ago")
+    ('jobs', 'posted_ts', "ALTER TABLE jobs ADD COLUMN posted_ts REAL; "
+                          "UPDATE jobs SET posted_ts = json_extract(data, '$.posted_ts'); "
+                          "DROP INDEX IF EXISTS jobs_posted_date;"),
+)
+INDEXES = "CREATE INDEX IF NOT EXISTS jobs_posted_ts ON jobs (posted_ts);"
+
+
+def job_read_mode() -> str:
+    """'api' (default) or 'mirror'; read on use because .env is loaded after the imports"""
+    return os.getenv('JOB_READ_MODE', 'api').strip().lower()
+
+
+def _encode(record: Dict) -> Tuple[str, str]:
+    """JSON payload of a record and the hash used to detect changes"""
+    data = json.dumps(record, sort_keys=True, default=str)
+    return data, hashlib.sha1(data.encode()).hexdigest()
+
+
+def _contains(text) -> str:
+    """LIKE pattern matching text anywhere, with its own % and _ taken literally (use with ESCAPE '\\')"""
+    escaped = str(text).replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+
+def _applicant_id(applicant: Dict, data: str) -> str:
+    applicant_id = applicant.get('id') or applicant.get('_id')
+    return str(applicant_id) if applicant_id is not None else hashlib.sha1(data.encode()).hexdigest()
+
+
+def encode_job(job: Dict) -> Tuple:
+    """A normalized job (with an id) as its mirror columns, all but the listing position.
+
+    The sync encodes jobs as they stream in, so it only holds these rows -
+    one JSON string each - rather than the response and the job dicts.
+    """
+    data, digest = _encode(job)
+    return (
+        str(job['id']), job.get('vendor_id'), job.get('title'), job.get('company'), job.get('location'),
+        job.get('category'), job.get('job_type'), job.get('posted_date'), job.get('posted_ts'),
+        job.get('updated_at'), digest, data,
+    )
+
+
+class JobStore:
+    """SQLite tables for jobs, applicants and vendors plus the sync cursors.
+
+    Each thread gets its own connection; the database runs in WAL mode, so
+    page reads never wait for a sync that is writing.
+    """
+
+    def __init__(self, path: str = JOB_STORE_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+        self._ready = False
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            with self._schema_lock:
+                if not self._schema_ready:
+                    conn.executescript(SCHEMA)
+                    self._migrate(conn)
+                    conn.executescript(INDEXES)
+                    self._schema_ready = True
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection):
+        for table, column, script in MIGRATIONS:
+            if column not in {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}:
+                conn.executescript(f'BEGIN; {script} COMMIT;')
+
+    def ready(self) -> bool:
+        """True once the jobs table has been filled by at least one successful sync"""
+        if not self._ready:
+            try:
+                self._ready = self._synced_at('jobs') is not None
+            except sqlite3.Error as e:
+                print(f"Error opening job store: {e}")
+        return self._ready
+
+    # Sync state
+
+    def _synced_at(self, resource: str) -> Optional[float]:
+        row = self._conn().execute('SELECT synced_at FROM sync_state WHERE resource = ?', (resource,)).fetchone()
+        return row[0] if row else None
+
+    def cursor(self, resource: str) -> Optional[str]:
+        row = self._conn().execute('SELECT cursor FROM sync_state WHERE resource = ?', (resource,)).fetchone()
+        return row[0] if row else None
+
+    def _mark_synced(self, conn: sqlite3.Connection, resource: str, cursor: Optional[str]):
+        conn.execute(
+            'INSERT INTO sync_state (resource, cursor, synced_at) VALUES (?, ?, ?) '
+            'ON CONFLICT(resource) DO UPDATE SET cursor = excluded.cursor, synced_at = excluded.synced_at',
+            (resource, cursor, time.time()),
+        )
+
+    # Writes (called by the sync)
+
+    def apply_full(self, records: Iterable[Tuple], cursor: Optional[str]) -> Dict[str, int]:
+        """Make the jobs table match a complete upstream listing (encode_job records, in upstream order)"""
+        conn = self._conn()
+        with conn:
+            hashes = dict(conn.execute('SELECT id, hash FROM jobs'))
+            counts = {'added': 0, 'updated': 0, 'removed': 0}
+            rows, seen = [], set()
+            for position, record in enumerate(records):
+                if record[0] in seen:
+                    continue
+                seen.add(record[0])
+                if record[0] not in hashes:
+                    counts['added'] += 1
+                elif hashes[record[0]] != record[-2]:
+                    counts['updated'] += 1
+                rows.append(record + (position,))
+            removed = [(job_id,) for job_id in hashes if job_id not in seen]
+            counts['removed'] = len(removed)
+            conn.executemany('DELETE FROM jobs WHERE id = ?', removed)
+            self._upsert_jobs(conn, rows)
+            self._rebuild_vendors(conn)
+            self._mark_synced(conn, 'jobs', cursor)
+        self._ready = True
+        return counts
+
+    def apply_delta(self, records: Iterable[Tuple], cursor: Optional[str]) -> Dict[str, int]:
+        """Upsert jobs changed since the last cursor (encode_job records); new jobs go after the known ones"""
+        conn = self._conn()
+        with conn:
+            hashes = dict(conn.execute('SELECT id, hash FROM jobs'))
+            next_position = conn.execute('SELECT COALESCE(MAX(position), -1) + 1 FROM jobs').fetchone()[0]
+            counts = {'added': 0, 'updated': 0, 'removed': 0}
+            rows = []
+            for record in records:
+                job_id = record[0]
+                if job_id in hashes:
+                    if hashes[job_id] == record[-2]:
+                        continue
+                    row = record + (-1,)
+                    counts['updated'] += 1
+                else:
+                    row = record + (next_position,)
+                    next_position += 1
+                    counts['added'] += 1
+                hashes[job_id] = record[-2]
+                rows.append(row)
+            self._upsert_jobs(conn, rows)
+            if rows:
+                self._rebuild_vendors(conn)
+            self._mark_synced(conn, 'jobs', cursor)
+        self._ready = True
+        return counts
+
+    def _upsert_jobs(self, conn: sqlite3.Connection, rows: List[Tuple]):
+        # position -1 marks an update that keeps the job's current place in the listing
+        conn.executemany(
+            'INSERT INTO jobs (id, vendor_id, title, company, location, category, job_type, posted_date, '
+            'posted_ts, updated_at, hash, data, position) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) '
+            'ON CONFLICT(id) DO UPDATE SET vendor_id = excluded.vendor_id, title = excluded.title, '
+            'company = excluded.company, location = excluded.location, category = excluded.category, '
+            'job_type = excluded.job_type, posted_date = excluded.posted_date, posted_ts = excluded.posted_ts, '
+            'updated_at = excluded.updated_at, '
+            'position = CASE WHEN excluded.position < 0 THEN jobs.position ELSE excluded.position END, '
+            'hash = excluded.hash, data = excluded.data '
+            'WHERE jobs.hash != excluded.hash OR jobs.position != excluded.position',
+            rows,
+        )
+
+    def _rebuild_vendors(self, conn: sqlite3.Connection):
+        conn.execute('DELETE FROM vendors')
+        conn.execute(
+            'INSERT INTO vendors (id, company, job_count) '
+            'SELECT vendor_id, MIN(company), COUNT(*) FROM jobs WHERE vendor_id IS NOT NULL GROUP BY vendor_id'
+        )
+
+    def replace_applicants(self, applicants: Iterable[Dict]) -> Dict[str, int]:
+        """Make the applicants table match a complete upstream listing"""
+        conn = self._conn()
+        with conn:
+            hashes = dict(conn.execute('SELECT id, hash FROM applicants'))
+            counts = {'added': 0, 'updated': 0, 'removed': 0}
+            rows, seen = [], set()
+            for applicant in applicants:
+                data, digest = _encode(applicant)
+                applicant_id = _applicant_id(applicant, data)
+                if applicant_id in seen:
+                    continue
+                seen.add(applicant_id)
+                if hashes.get(applicant_id) == digest:
+                    continue
+                counts['updated' if applicant_id in hashes else 'added'] += 1
+                job_id = applicant.get('job_id')
+                rows.append((applicant_id, str(job_id) if job_id is not None else None, digest, data))
+            removed = [(applicant_id,) for applicant_id in hashes if applicant_id not in seen]
+            counts['removed'] = len(removed)
+            conn.executemany('DELETE FROM applicants WHERE id = ?', removed)
+            conn.executemany(
+                'INSERT OR REPLACE INTO applicants (id, job_id, hash, data) VALUES (?, ?, ?, ?)', rows
+            )
+            self._mark_synced(conn, 'applicants', None)
+        return counts
+
+    # Reads
+
+    def query_jobs(self, filters: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
+        """Answer a /jobs query from the mirror in the API's {'jobs', 'meta'} shape.
+
+        Returns None when a filter cannot be answered locally (the caller then
+        asks the API). 'page'/'limit'/'offset' page the result; meta then
+        carries 'total' so pagers know where it ends.
+        """
+        filters = {k: v for k, v in (filters or {}).items() if v not in (None, '')}
+        if not set(filters) <= MIRROR_FILTERS:
+            return None
+
+        where, args = [], []
+        search = next((filters[key] for key in SEARCH_PARAMS if key in filters), None)
+        if search:
+            where.append("(title LIKE ? ESCAPE '\\' OR company LIKE ? ESCAPE '\\'"
+                         " OR json_extract(data, '$.description') LIKE ? ESCAPE '\\')")
+            args += [_contains(search)] * 3
+        if filters.get('location'):
+            where.append("location LIKE ? ESCAPE '\\'")
+            args.append(_contains(filters['location']))
+        if filters.get('remote'):
+            where.append("location LIKE '%remote%'")
+        job_type = next((filters[key] for key in JOB_TYPE_PARAMS if key in filters), None)
+        if job_type:
+            where.append('job_type = ?')
+            args.append(str(job_type))
+        if filters.get('category'):
+            where.append('category = ?')
+            args.append(str(filters['category']))
+        if filters.get('company'):
+            where.append('company = ? COLLATE NOCASE')
+            args.append(str(filters['company']))
+        if filters.get('vendor_id'):
+            where.append('vendor_id = ?')
+            args.append(str(filters['vendor_id']))
+        for name, (field, op) in SALARY_FILTERS.items():
+            if name in filters:
+                try:
+                    bound = float(filters[name])
+                except (TypeError, ValueError):
+                    return None
+                where.append(f"(json_extract(data, '$.{field}') IS NULL OR json_extract(data, '$.{field}') {op} ?)")
+                args.append(bound)
+
+        clause = f" WHERE {' AND '.join(where)}" if where else ''
+        order = SORT_ORDERS.get(str(filters.get('sort')), 'position')
+        sql = f'SELECT data FROM jobs{clause} ORDER BY {order}'
+        meta: Dict[str, Any] = {'source': 'mirror'}
+        conn = self._conn()
+        if any(key in filters for key in PAGING_PARAMS):
+            try:
+                limit = max(1, int(filters.get('limit', 20)))
+                offset = int(filters['offset']) if 'offset' in filters else (int(filters.get('page', 1)) - 1) * limit
+            except (TypeError, ValueError):
+                return None
+            sql += ' LIMIT ? OFFSET ?'
+            meta.update(
+                total=conn.execute(f'SELECT COUNT(*) FROM jobs{clause}', args).fetchone()[0],
+                limit=limit,
+                offset=max(0, offset),
+            )
+            args += [limit, max(0, offset)]
+        return {'jobs': [json.loads(data) for data, in conn.execute(sql, args)], 'meta': meta}
+
+    def get_job(self, job_id) -> Optional[Dict]:
+        row = self._conn().execute('SELECT data FROM jobs WHERE id = ?', (str(job_id),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_applicants(self, job_ids: Optional[Iterable] = None) -> List[Dict]:
+        """All mirrored applicants, or only those who applied to one of job_ids"""
+        conn = self._conn()
+        if job_ids is None:
+            rows = conn.execute('SELECT data FROM applicants ORDER BY rowid')
+        else:
+            ids = [str(job_id) for job_id in job_ids]
+            if not ids:
+                return []
+            rows = conn.execute(
+                f"SELECT data FROM applicants WHERE job_id IN ({', '.join('?' * len(ids))}) ORDER BY rowid", ids
+            )
+        return [json.loads(data) for data, in rows]
+
+    def has_applicants(self) -> bool:
+        return self._synced_at('applicants') is not None
+
+    def get_vendors(self) -> List[Dict]:
+        rows = self._conn().execute('SELECT id, company, job_count FROM vendors ORDER BY company')
+        return [{'id': vendor_id, 'company': company, 'job_count': count} for vendor_id, company, count in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        conn = self._conn()
+        counts = {
+            table: conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+            for table in ('jobs', 'applicants', 'vendors')
+        }
+        synced = dict(conn.execute('SELECT resource, synced_at FROM sync_state'))
+        return dict(counts, synced_at=synced, jobs_cursor=self.cursor('jobs'))
+
+
+# Global job mirror
+job_store = JobStore()
@@ -0,0 +1,150 @@
+"""
+Incremental parser for /jobs payloads
+Decodes the job array of a response body as chunks arrive, so each job can be
+normalized and handed out while the rest is still downloading. Understands the
+same shapes as APIService._extract_jobs: a bare list, or an object wrapping the
+list in 'data', 'jobs' or 'results' (other top-level fields are kept as meta).
+When several of those keys are present, the first non-empty list in document
+order wins.
+"""
+
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, List
+
+JOB_LIST_KEYS = ('data', 'jobs', 'results')
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = _WHITESPACE + ',]}'
+
+# Parser states
+_START = 'start'
+_OBJECT_KEY = 'object_key'
+_OBJECT_VALUE = 'object_value'
+_ARRAY_ITEM = 'array_item'
+_DONE = 'done'
+
+
+class JobStreamParser:
+    """Push parser: feed() body chunks, get back the job dicts completed so far.
+
+    Only one job (plus whatever is still undecoded of the current chunk) is
+    held at a time; consumed text is dropped from the buffer as parsing moves on.
+    """
+
+    def __init__(self):
+        self.meta: Dict[str, Any] = {}
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._state = _START
+        self._top_is_object = False
+        self._jobs_seen = 0
+        self._key = None
+
+    def feed(self, chunk: bytes, final: bool = False) -> List[Dict]:
+        """Add a body chunk (pass final=True with the last one, which may be b'')"""
+        self._buffer = self._buffer[self._pos:] + self._utf8.decode(chunk, final)
+        self._pos = 0
+        jobs: List[Dict] = []
+        while self._step(jobs, final):
+            pass
+        return jobs
+
+    def _skip(self, chars: str = _WHITESPACE) -> str:
+        """Advance past chars; returns the next significant char ('' when the buffer is exhausted)"""
+        buf, pos = self._buffer, self._pos
+        while pos < len(buf) and buf[pos] in chars:
+            pos += 1
+        self._pos = pos
+        return buf[pos] if pos < len(buf) else ''
+
+    def _value(self, final: bool):
+        """Decode one complete JSON value at the cursor, or raise ValueError if more text is needed"""
+        value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        # A number cut off by the chunk boundary ('12' of '1250.5') decodes fine on its
+        # own, so scalars only count once the delimiter after them has arrived
+        if not final and not isinstance(value, (str, dict, list)):
+            if end == len(self._buffer) or self._buffer[end] not in _DELIMITERS:
+                raise ValueError('incomplete value')
+        self._pos = end
+        return value
+
+    def _step(self, jobs: List[Dict], final: bool) -> bool:
+        """Consume one token or value; False when more input is needed"""
+        char = self._skip()
+        if not char or self._state == _DONE:
+            return False
+        start = self._pos
+        try:
+            if self._state == _START:
+                self._pos += 1
+                if char == '[':
+                    self._state = _ARRAY_ITEM
+                elif char == '{':
+                    self._top_is_object = True
+                    self._state = _OBJECT_KEY
+                else:
+                    self._state = _DONE
+                return True
+
+            if self._state == _OBJECT_KEY:
+                char = self._skip(_WHITESPACE + ',')
+                if char == '}':
+                    self._pos += 1
+                    self._state = _DONE
+                    return True
+                if not char:
+                    return False
+                key = self._value(final)
+                if self._skip() != ':':
+                    self._pos = start
+                    return False
+                self._pos += 1
+                self._key = key
+                self._state = _OBJECT_VALUE
+                return True
+
+            if self._state == _OBJECT_VALUE:
+                if self._key in JOB_LIST_KEYS:
+                    if char == '[' and not self._jobs_seen:
+                        self._pos += 1
+                        self._state = _ARRAY_ITEM
+                        return True
+                    # A second job list (or a non-list) is dropped, as _extract_jobs would
+                    self._value(final)
+                else:
+                    self.meta[self._key] = self._value(final)
+                self._state = _OBJECT_KEY
+                return True
+
+            if self._state == _ARRAY_ITEM:
+                char = self._skip(_WHITESPACE + ',')
+                if char == ']':
+                    self._pos += 1
+                    self._state = _OBJECT_KEY if self._top_is_object else _DONE
+                    return True
+                if not char:
+                    return False
+                item = self._value(final)
+                if isinstance(item, dict):
+                    jobs.append(item)
+                    self._jobs_seen += 1
+                return True
+        except ValueError:
+            if final:
+                raise
+            self._pos = start
+            return False
+        return False
+
+
+def iter_json_jobs(chunks: Iterable[bytes], parser: JobStreamParser = None) -> Iterator[Dict]:
+    """Yield raw job dicts from an iterable of UTF-8 body chunks"""
+    parser = parser or JobStreamParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.feed(b'', final=True)
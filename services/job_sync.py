@@ -0,0 +1,159 @@
+"""
+Background sync of the SQLite job mirror
+Pulls only the jobs changed since the last cursor (?updated_since=) when the
+upstream records carry an updated_at, and falls back to diffing the complete
+listing otherwise - and periodically anyway, since deltas cannot report
+deleted jobs. Applicants are always diffed in full.
+
+Job pages are streamed (AsyncAPIService.iter_jobs) and each job is encoded
+into its mirror row as it arrives, so a sync holds neither the response
+bodies nor the parsed job dicts.
+"""
+
+import asyncio
+import os
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from .async_api_service import AsyncAPIService
+from .circuit_breaker import CircuitOpenError
+from .job_store import JobStore, encode_job, job_read_mode, job_store
+from .pagination import next_page_params
+
+JOB_SYNC_INTERVAL = float(os.getenv('JOB_SYNC_INTERVAL', '300'))  # seconds between syncs
+FULL_SYNC_EVERY = int(os.getenv('JOB_FULL_SYNC_EVERY', '12'))  # every Nth sync diffs the full listing
+SYNC_PAGE_SIZE = 100
+ENCODE_BATCH = 500  # streamed jobs encoded per worker-thread call
+UPDATED_SINCE_PARAM = 'updated_since'
+
+
+def mirror_sync_enabled() -> bool:
+    """The mirror is kept in sync when reads use it, or when JOB_MIRROR_SYNC=1 (to warm it up first)"""
+    return job_read_mode() == 'mirror' or os.getenv('JOB_MIRROR_SYNC', '') == '1'
+
+
+class JobMirrorSync:
+    def __init__(self, store: JobStore = job_store, api_service: Optional[AsyncAPIService] = None,
+                 interval: float = JOB_SYNC_INTERVAL):
+        self.store = store
+        # Always reads the remote API, never the mirror it is filling
+        self.api_service = api_service or AsyncAPIService(read_mode='api')
+        self.interval = interval
+        self._runs = 0
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stats = {'syncs': 0, 'full_syncs': 0, 'delta_syncs': 0, 'failures': 0,
+                       'added': 0, 'updated': 0, 'removed': 0}
+
+    def start(self):
+        """Start the sync loop (no-op unless the mirror is enabled)"""
+        if self._task is None and mirror_sync_enabled():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def request_sync(self):
+        """Sync as soon as possible (e.g. after a job was created, edited or deleted)"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            await self.sync()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def sync(self):
+        """One sync pass over jobs and applicants; failures leave the mirror as it was"""
+        loop = asyncio.get_running_loop()
+        self._runs += 1
+        self._stats['syncs'] += 1
+        try:
+            await self._sync_jobs(loop)
+            applicants = await self.api_service.get_applicants()
+            # get_applicants answers [] when the upstream fails, which must not wipe the mirror
+            if applicants or not await loop.run_in_executor(None, self.store.has_applicants):
+                await loop.run_in_executor(None, self.store.replace_applicants, applicants)
+        except Exception as e:
+            self._stats['failures'] += 1
+            print(f"Error syncing job mirror: {e}")
+
+    async def _sync_jobs(self, loop: asyncio.AbstractEventLoop):
+        cursor = await loop.run_in_executor(None, self.store.cursor, 'jobs')
+        full = cursor is None or self._runs % FULL_SYNC_EVERY == 1
+        fetched = await self._fetch_all(loop, {} if full else {UPDATED_SINCE_PARAM: cursor})
+        if fetched is None:
+            self._stats['failures'] += 1
+            return
+        records, stamps = fetched
+
+        if not full and not all(stamp and str(stamp) >= cursor for stamp in stamps):
+            # The API ignored updated_since and sent everything: diff it in full
+            full = True
+        present = [str(stamp) for stamp in stamps if stamp]
+        next_cursor = max(present + ([cursor] if cursor and not full else []), default=None)
+        if full and len(present) < len(stamps):
+            # Records without updated_at cannot be synced by delta
+            next_cursor = None
+
+        apply = self.store.apply_full if full else self.store.apply_delta
+        counts = await loop.run_in_executor(None, apply, records, next_cursor)
+        self._stats['full_syncs' if full else 'delta_syncs'] += 1
+        for name, count in counts.items():
+            self._stats[name] += count
+
+    async def _fetch_all(self, loop: asyncio.AbstractEventLoop,
+                         filters: Dict) -> Optional[Tuple[List[Tuple], List]]:
+        """Every job matching filters across all upstream pages, as (encode_job records, updated_at
+        stamps) in listing order, or None if any page failed"""
+        records: List[Tuple] = []
+        stamps: List = []
+        params: Optional[Dict] = dict(filters)
+        previous_ids = None
+        fetched = 0
+        while params is not None:
+            meta: Dict = {}
+            ids: List = []
+            pending: List[Dict] = []
+            page_records: List[Tuple] = []
+            try:
+                async for job in self.api_service.iter_jobs(params, meta=meta, fallback=False):
+                    ids.append(job.get('id'))
+                    if job.get('id') is None:
+                        continue
+                    stamps.append(job.get('updated_at'))
+                    pending.append(job)
+                    if len(pending) >= ENCODE_BATCH:
+                        page_records.extend(await loop.run_in_executor(None, _encode_jobs, pending))
+                        pending = []
+                page_records.extend(await loop.run_in_executor(None, _encode_jobs, pending))
+            except (httpx.HTTPError, CircuitOpenError, ValueError):
+                return None  # reported by iter_jobs
+            if ids == previous_ids:
+                # The server ignored the paging params and sent the same page again
+                del stamps[len(stamps) - len(page_records):]
+                break
+            previous_ids = ids
+            records.extend(page_records)
+            fetched += len(ids)
+            params = next_page_params(meta, params, len(ids), fetched, SYNC_PAGE_SIZE)
+        return records, stamps
+
+    def stats(self) -> Dict:
+        return dict(self._stats, running=self._task is not None, store=self.store.stats())
+
+
+def _encode_jobs(jobs: List[Dict]) -> List[Tuple]:
+    return [encode_job(job) for job in jobs]
+
+
+# Global mirror sync, started with the app
+job_sync = JobMirrorSync()
@@ -0,0 +1,133 @@
+"""
+Last-known-good store for upstream responses
+Keeps the most recent successful (real, non-fallback) result per request in
+memory and on disk, so outages can be answered with the last real data
+instead of sample jobs - including right after a restart. Keys carry the
+auth scope (see single_flight.request_key), so one user's data is never
+served to another. Both copies are LRU-bounded; on disk the file mtime is
+the recency.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional, Tuple
+
+LAST_GOOD_DIR = os.getenv('LAST_GOOD_DIR', os.path.join('.cache', 'last_good'))
+LAST_GOOD_MEMORY_SIZE = int(os.getenv('LAST_GOOD_MEMORY_SIZE', '128'))  # results kept in memory
+LAST_GOOD_MAX_FILES = int(os.getenv('LAST_GOOD_MAX_FILES', '1024'))  # results kept on disk
+
+
+class LastKnownGood:
+    def __init__(self, directory: str = LAST_GOOD_DIR, max_entries: int = LAST_GOOD_MEMORY_SIZE,
+                 max_files: int = LAST_GOOD_MAX_FILES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_files = max_files
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._files: Optional[int] = None  # counted on the first write
+        self._lock = threading.Lock()
+
+    def _name(self, key: Hashable) -> str:
+        return hashlib.sha256(repr(key).encode()).hexdigest()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.json")
+
+    def _keep(self, name: str, result: Any):
+        """Put a result in the memory LRU (caller holds the lock)"""
+        self._memory[name] = result
+        self._memory.move_to_end(name)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def remember(self, key: Hashable, result: Any):
+        """Record a successful result; the disk copy is only rewritten when it changed"""
+        name = self._name(key)
+        with self._lock:
+            if self._memory.get(name) is result:
+                # Same object as last time (e.g. a 304 revalidation) - nothing to write
+                self._memory.move_to_end(name)
+                return
+            self._keep(name, result)
+        path = self._path(name)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # A private temp file per writer: concurrent saves of one key never share a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(result, f)
+                new = not os.path.exists(path)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Error saving last known good response: {e}")
+            return
+        if new:
+            self._prune()
+
+    def _prune(self):
+        """Delete the least recently used files beyond max_files"""
+        with self._lock:
+            if self._files is None:
+                self._files = len(self._entries())  # includes the file just written
+            else:
+                self._files += 1
+            if self._files <= self.max_files:
+                return
+            entries = self._entries()
+            entries.sort(key=lambda entry: entry[0])
+            stale = entries[:max(0, len(entries) - self.max_files)]
+            self._files = len(entries) - len(stale)
+        for _, path in stale:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass  # already gone
+
+    def _entries(self) -> List[Tuple[float, str]]:
+        """(mtime, path) of every stored result"""
+        entries = []
+        try:
+            with os.scandir(self.directory) as found:
+                for entry in found:
+                    if entry.name.endswith('.json'):
+                        try:
+                            entries.append((entry.stat().st_mtime, entry.path))
+                        except OSError:
+                            pass
+        except OSError:
+            pass
+        return entries
+
+    def recall(self, key: Hashable) -> Optional[Any]:
+        """Return the last good result from memory, falling back to disk"""
+        name = self._name(key)
+        with self._lock:
+            if name in self._memory:
+                self._memory.move_to_end(name)
+                return self._memory[name]
+        path = self._path(name)
+        try:
+            with open(path, 'r') as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)  # recently used: keep it when pruning
+        except OSError:
+            pass
+        with self._lock:
+            if name not in self._memory:
+                self._keep(name, result)
+            return self._memory[name]
+
+
+# Global last-known-good store shared by APIService and AsyncAPIService
+last_known_good = LastKnownGood()
@@ -0,0 +1,168 @@
+"""
+Prefetching pager over server-side /jobs pages
+Works out from the response meta whether the API pages by page number,
+offset or cursor, keeps every page it fetched, and loads page N+1 in the
+background as soon as page N has been handed out, so "Load more" is usually
+answered from memory
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+PAGE_CACHE_TTL = float(os.getenv('PAGE_CACHE_TTL', '60'))  # seconds a query's pages are reused
+PAGE_CACHE_SIZE = int(os.getenv('PAGE_CACHE_SIZE', '32'))  # queries kept
+
+CURSOR_KEYS = ('next_cursor', 'nextCursor', 'cursor')
+HAS_MORE_KEYS = ('has_more', 'hasMore', 'has_next', 'hasNext')
+TOTAL_PAGES_KEYS = ('total_pages', 'totalPages', 'pages')
+PAGING_PARAMS = ('page', 'offset', 'cursor')
+
+FetchPage = Callable[[Dict], Awaitable[Dict[str, Any]]]
+
+
+def _first(meta: Dict, keys) -> Any:
+    for key in keys:
+        if key in meta:
+            return meta[key]
+    return None
+
+
+def next_page_params(meta: Dict, params: Dict, batch_count: int, fetched: int, page_size: int) -> Optional[Dict]:
+    """Request params for the page after this one, or None when this was the last page.
+
+    params are the ones the current page was requested with, fetched is the
+    number of jobs received so far including this batch.
+    """
+    if not batch_count or meta.get('source') == 'fallback':
+        return None
+    has_more = _first(meta, HAS_MORE_KEYS)
+    if has_more is not None and not has_more:
+        return None
+    total = meta.get('total')
+    if isinstance(total, int) and fetched >= total:
+        return None
+
+    # The query itself without the position of the current page
+    base = {k: v for k, v in params.items() if k not in PAGING_PARAMS}
+
+    # Cursor style: an opaque token, or a 'next' link carrying the next query
+    if any(key in meta for key in CURSOR_KEYS):
+        cursor = _first(meta, CURSOR_KEYS)
+        return {**base, 'cursor': cursor, 'limit': page_size} if cursor else None
+    if 'next' in meta and not isinstance(meta['next'], int):
+        if not meta['next']:
+            return None
+        return {**base, **dict(parse_qsl(urlsplit(str(meta['next'])).query))}
+
+    # A short page is the last one (the server may cap the page size below ours)
+    limit = meta.get('limit')
+    if batch_count < (limit if isinstance(limit, int) and limit > 0 else page_size):
+        return None
+
+    # Offset style
+    if 'offset' in meta:
+        try:
+            offset = int(meta['offset']) + batch_count
+        except (TypeError, ValueError):
+            return None
+        return {**base, 'offset': offset, 'limit': page_size}
+
+    # Page-number style (also assumed when a full page came back without any hints)
+    try:
+        if isinstance(meta.get('next'), int):
+            page = meta['next']
+        else:
+            page = int(meta.get('page', params.get('page', 1))) + 1
+    except (TypeError, ValueError):
+        return None
+    total_pages = _first(meta, TOTAL_PAGES_KEYS)
+    if isinstance(total_pages, int) and page > total_pages:
+        return None
+    return {**base, 'page': page, 'limit': page_size}
+
+
+class JobPager:
+    """Pages of one /jobs query, fetched in order and kept for reuse"""
+
+    def __init__(self, fetch: FetchPage, filters: Dict, page_size: int):
+        self._fetch = fetch
+        self.page_size = page_size
+        self.pages: List[List[Dict]] = []
+        self.created_at = time.monotonic()
+        self._fetched = 0
+        self._next_params: Optional[Dict] = {**filters, 'page': 1, 'limit': page_size}
+        self._loading: Optional[asyncio.Task] = None
+        # Set once a page came from the fallback (sample or last known good data): not reused
+        self.fallback = False
+
+    @property
+    def exhausted(self) -> bool:
+        return self._next_params is None and self._loading is None
+
+    def has_page(self, number: int) -> bool:
+        """True if page `number` (1-based) is loaded or may still exist upstream"""
+        return number <= len(self.pages) or not self.exhausted
+
+    async def get_page(self, number: int) -> List[Dict]:
+        """Return page `number` (1-based), fetching up to it, then prefetch the next one"""
+        while len(self.pages) < number and not self.exhausted:
+            await asyncio.shield(self._load_next())
+        if len(self.pages) == number and not self.exhausted:
+            self._load_next()
+        return list(self.pages[number - 1]) if number <= len(self.pages) else []
+
+    def _load_next(self) -> asyncio.Task:
+        if self._loading is None:
+            self._loading = asyncio.ensure_future(self._fetch_next())
+        return self._loading
+
+    async def _fetch_next(self):
+        params = self._next_params
+        try:
+            result = await self._fetch(params)
+            batch, meta = result.get('jobs', []), result.get('meta', {})
+            if meta.get('source') == 'fallback':
+                self.fallback = True
+            ids = [job.get('id') for job in batch]
+            if self.pages and ids == [job.get('id') for job in self.pages[-1]]:
+                # The server ignored the paging params and sent the same page again
+                self._next_params = None
+                return
+            self.pages.append(batch)
+            self._fetched += len(batch)
+            self._next_params = next_page_params(meta, params, len(batch), self._fetched, self.page_size)
+        except Exception as e:
+            print(f"Error fetching jobs page {len(self.pages) + 1}: {e}")
+            self._next_params = None
+        finally:
+            self._loading = None
+
+
+class PagerCache:
+    """Small LRU of pagers keyed by query, so re-running a search reuses its pages"""
+
+    def __init__(self, max_entries: int = PAGE_CACHE_SIZE, ttl: float = PAGE_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._pagers: "OrderedDict[Hashable, JobPager]" = OrderedDict()
+
+    def get(self, key: Hashable, factory: Callable[[], JobPager]) -> JobPager:
+        pager = self._pagers.get(key)
+        # A pager that served fallback data is replaced, so the query goes upstream again once it recovers
+        if pager is None or pager.fallback or time.monotonic() - pager.created_at > self.ttl:
+            pager = self._pagers[key] = factory()
+        self._pagers.move_to_end(key)
+        while len(self._pagers) > self.max_entries:
+            self._pagers.popitem(last=False)
+        return pager
+
+    def clear(self):
+        self._pagers.clear()
+
+
+# Global pager cache shared by all AsyncAPIService instances
+job_pagers = PagerCache()
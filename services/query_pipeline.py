@@ -0,0 +1,111 @@
+"""
+Debounced, latest-only async queries
+Each submit() restarts the debounce and cancels the run still in flight for
+an older input, so a burst of keystrokes costs one query and a slow answer
+to a stale input is never rendered over a newer one. Time-to-results (from
+the last submit to delivery) is recorded for /_stats/search.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+DEBOUNCE_SECONDS = 0.3
+RECENT_TIMINGS = 500
+
+
+def _percentile(values, fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 1)
+
+
+class QueryStats:
+    """Counts and recent time-to-results of every LatestQuery sharing it"""
+
+    def __init__(self):
+        # debounced: superseded while waiting; cancelled: superseded while its query was running
+        self._stats = {'submitted': 0, 'debounced': 0, 'run': 0, 'cancelled': 0, 'delivered': 0, 'failed': 0}
+        self._total_ms = deque(maxlen=RECENT_TIMINGS)
+        self._query_ms = deque(maxlen=RECENT_TIMINGS)
+
+    def count(self, name: str):
+        self._stats[name] += 1
+
+    def record(self, total_ms: float, query_ms: float):
+        self._stats['delivered'] += 1
+        self._total_ms.append(total_ms)
+        self._query_ms.append(query_ms)
+
+    def stats(self) -> Dict:
+        return dict(
+            self._stats,
+            time_to_results_ms={'p50': _percentile(self._total_ms, 0.5), 'p95': _percentile(self._total_ms, 0.95)},
+            query_ms={'p50': _percentile(self._query_ms, 0.5), 'p95': _percentile(self._query_ms, 0.95)},
+        )
+
+
+class LatestQuery:
+    """Runs `run(value)` for the latest submitted value only and hands its result to `deliver`.
+
+    deliver(value, result, timing) is called on the event loop with timing
+    {'total_ms': since the submit, 'query_ms': the run itself}; it is never
+    called for a value that has been superseded.
+    """
+
+    def __init__(self, run: Callable[[Any], Awaitable[Any]],
+                 deliver: Callable[[Any, Any, Dict[str, float]], None],
+                 delay: float = DEBOUNCE_SECONDS, stats: Optional[QueryStats] = None):
+        self.run = run
+        self.deliver = deliver
+        self.delay = delay
+        self.stats = stats or search_stats
+        self._task: Optional[asyncio.Task] = None
+        self._running = False  # whether self._task got past the debounce
+
+    def submit(self, value: Any, delay: Optional[float] = None):
+        """Schedule value after the debounce delay (0 runs it right away), superseding older ones"""
+        self.stats.count('submitted')
+        self.cancel()
+        self._running = False
+        self._task = asyncio.get_running_loop().create_task(
+            self._execute(value, self.delay if delay is None else delay, time.perf_counter())
+        )
+
+    def cancel(self):
+        if self._task is not None and not self._task.done():
+            # Counted here: a task cancelled before its first step never runs its except clause
+            self.stats.count('cancelled' if self._running else 'debounced')
+            self._task.cancel()
+        self._task = None
+
+    @property
+    def pending(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def _execute(self, value: Any, delay: float, submitted: float):
+        try:
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.stats.count('run')
+            self._running = True
+            started = time.perf_counter()
+            result = await self.run(value)
+        except Exception as e:
+            self.stats.count('failed')
+            print(f"Error running query {value!r}: {e}")
+            return
+        if asyncio.current_task() is not self._task:
+            return  # superseded between the run finishing and now
+        finished = time.perf_counter()
+        timing = {'total_ms': (finished - submitted) * 1000, 'query_ms': (finished - started) * 1000}
+        self.stats.record(timing['total_ms'], timing['query_ms'])
+        self.deliver(value, result, timing)
+
+
+# Shared by every /jobs search box
+search_stats = QueryStats()
+# Shared by every typeahead dropdown (components/suggestions.py)
+suggest_stats = QueryStats()
@@ -0,0 +1,65 @@
+"""
+Single-flight coalescing of identical upstream requests
+The first caller for a key performs the fetch; concurrent callers with the
+same key await that same in-flight result instead of issuing their own
+"""
+
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+# Headers that change what the upstream returns for a caller
+AUTH_SCOPE_HEADERS = ('Authorization', 'X-User-Email', 'X-User-Role')
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, Mapping):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    return str(value)
+
+
+def auth_scope(headers: Optional[Mapping[str, str]]) -> str:
+    """Digest of the auth-related headers, so credentials are never kept as keys"""
+    if not headers:
+        return ''
+    material = '\n'.join(f"{name}:{headers.get(name, '')}" for name in AUTH_SCOPE_HEADERS)
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+def request_key(method: str, path: str, params: Optional[Mapping] = None,
+                headers: Optional[Mapping[str, str]] = None) -> Tuple:
+    """(method, path, normalized params, auth scope) key for a request"""
+    return (method.upper(), path, _freeze(params or {}), auth_scope(headers))
+
+
+class SingleFlight:
+    """Tracks in-flight calls by key and shares their result with duplicates"""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._stats = {'leaders': 0, 'coalesced': 0}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            self._stats['leaders'] += 1
+            task = asyncio.get_running_loop().create_task(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            self._stats['coalesced'] += 1
+        # Shield so one caller going away doesn't cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._stats, inflight=len(self._inflight))
+
+
+# Global coalescer shared by every AsyncAPIService instance
+upstream_flights = SingleFlight()
@@ -0,0 +1,231 @@
+"""
+Spelling correction for job searches (SymSpell)
+The vocabulary is every word of the catalog's titles, companies,
+categories, job types and locations, with how often the catalog uses it.
+Each word's first PREFIX_LENGTH characters are filed under the strings left
+by deleting up to MAX_EDIT_DISTANCE of them (fewer for short words, which
+are corrected within one edit), so a misspelling is looked up
+by generating its own (few) deletes instead of comparing it with every
+word; only the words sharing a delete get a real edit distance check.
+
+sync() diffs the catalog against the indexed jobs like the suggestion
+index, so only words that appear or disappear touch the delete dictionary.
+"""
+
+import os
+import re
+import threading
+from collections import Counter
+from itertools import combinations
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+MAX_EDIT_DISTANCE = 2
+PREFIX_LENGTH = 7
+MIN_WORD_LENGTH = 3  # shorter words are left out of the vocabulary
+MIN_CORRECTED_LENGTH = 4  # shorter words are too ambiguous to correct ("jav": "java", "jam"?)
+SHORT_WORD_LENGTH = 5  # words up to this long are corrected within one edit
+# Re-run a search that found nothing with its correction (else only offer "Did you mean")
+SEARCH_AUTOCORRECT = os.getenv('SEARCH_AUTOCORRECT', 'True').lower() == 'true'
+
+VOCABULARY_FIELDS = ('title', 'company', 'category', 'job_type', 'location')
+
+_WORD = re.compile(r'[^\W\d_]+', re.UNICODE)
+# Whole words of at least MIN_WORD_LENGTH letters
+_VOCABULARY_WORD = re.compile(r'(?<![^\W\d_])[^\W\d_]{%d,}' % MIN_WORD_LENGTH, re.UNICODE)
+
+
+# (length, distance) -> an itemgetter per way of deleting 1..distance characters, keeping the rest
+_keepers: Dict[Tuple[int, int], List[itemgetter]] = {}
+
+
+def _deletes(prefix: str, distance: int) -> Set[str]:
+    """The prefix with 0..distance characters deleted (never down to nothing)"""
+    key = (len(prefix), distance)
+    keepers = _keepers.get(key)
+    if keepers is None:
+        # Every prefix of a length shares its index combinations, so picking is one C call per delete
+        keepers = _keepers[key] = [itemgetter(*keep) for count in range(1, distance + 1) if count < len(prefix)
+                                   for keep in combinations(range(len(prefix)), len(prefix) - count)]
+    found = {''.join(keeper(prefix)) for keeper in keepers}
+    found.add(prefix)
+    return found
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Damerau-Levenshtein (optimal string alignment) distance, or limit + 1 once it exceeds limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+class SpellingIndex:
+    """Delete dictionary over the catalog vocabulary, kept in sync incrementally (see sync()).
+
+    sync() runs in a worker thread; lookups on the event loop read the
+    dictionaries as they are.
+    """
+
+    def __init__(self, max_distance: int = MAX_EDIT_DISTANCE):
+        self.max_distance = max_distance
+        self._lock = threading.Lock()  # one sync at a time
+        # word -> occurrences in the catalog
+        self._counts: Dict[str, int] = {}
+        # prefix (first PREFIX_LENGTH characters) -> words starting with it
+        self._prefixes: Dict[str, List[str]] = {}
+        # delete -> the prefix filed under it, or a list of them when several are;
+        # words sharing a prefix share its deletes. Most deletes belong to one prefix,
+        # and a plain str is no container for the garbage collector to walk.
+        self._deletes: Dict[str, Union[str, List[str]]] = {}
+        # job id -> its vocabulary field values
+        self._job_fields: Dict[str, Tuple] = {}
+        self._stats = {'lookups': 0, 'corrections': 0}
+        self.ready = False
+
+    def sync(self, jobs: Iterable[Dict]) -> Dict[str, int]:
+        """Index exactly these jobs (by id); returns added/updated/removed job counts"""
+        counts = {'added': 0, 'updated': 0, 'removed': 0}
+        current: Dict[str, Tuple] = {}
+        for job in jobs:
+            if job.get('id') is not None:
+                current.setdefault(str(job['id']), tuple(map(job.get, VOCABULARY_FIELDS)))
+        with self._lock:
+            # Values of the jobs that changed, gone ones counted once per job using them
+            gained: List = []
+            lost: List = []
+            for job_id, fields in current.items():
+                previous = self._job_fields.get(job_id)
+                if previous == fields:
+                    continue
+                counts['updated' if previous is not None else 'added'] += 1
+                gained.extend(fields)
+                lost.extend(previous or ())
+                self._job_fields[job_id] = fields
+            for job_id in [job_id for job_id in self._job_fields if job_id not in current]:
+                lost.extend(self._job_fields.pop(job_id))
+                counts['removed'] += 1
+            self._apply(Counter(gained), Counter(lost))
+            self.ready = True
+        return counts
+
+    def _apply(self, gained: Counter, lost: Counter):
+        """Count words of the gained and lost field values; only new and vanished prefixes touch the deletes"""
+        # Titles, companies and locations repeat a lot, so each distinct value is split once
+        delta: Counter = Counter()
+        for value, times in gained.items():
+            for word in _VOCABULARY_WORD.findall(str(value or '').casefold()):
+                delta[word] += times
+        for value, times in lost.items():
+            for word in _VOCABULARY_WORD.findall(str(value or '').casefold()):
+                delta[word] -= times
+        for word, change in delta.items():
+            if not change:
+                continue
+            before = self._counts.get(word, 0)
+            after = before + change
+            if after > 0:
+                self._counts[word] = after
+                if not before:
+                    self._add_word(word)
+            elif before:
+                del self._counts[word]
+                self._remove_word(word)
+
+    def _indexed_distance(self, prefix: str) -> int:
+        """How many deletes of a word's prefix are filed.
+
+        A query is at least MIN_CORRECTED_LENGTH long and allowed one edit up to
+        SHORT_WORD_LENGTH, so a short word mostly meets it through the query's own
+        deletes: with the defaults a 3-letter word needs none, 4-5 letters one.
+        """
+        length = len(prefix)
+        # Closest query lengths of each limit: the shortest query, and the shortest longer than SHORT_WORD_LENGTH
+        short_queries = min(1, length - MIN_CORRECTED_LENGTH + 1)
+        long_queries = min(self.max_distance, length - SHORT_WORD_LENGTH - 1 + self.max_distance)
+        return max(0, short_queries, long_queries)
+
+    def _add_word(self, word: str):
+        prefix = word[:PREFIX_LENGTH]
+        words = self._prefixes.get(prefix)
+        if words is not None:
+            words.append(word)
+            return
+        self._prefixes[prefix] = [word]
+        deletes = self._deletes
+        for delete in _deletes(prefix, self._indexed_distance(prefix)):
+            filed = deletes.setdefault(delete, prefix)
+            if filed is prefix:
+                continue
+            if isinstance(filed, str):
+                deletes[delete] = [filed, prefix]
+            else:
+                filed.append(prefix)
+
+    def _remove_word(self, word: str):
+        prefix = word[:PREFIX_LENGTH]
+        words = self._prefixes[prefix]
+        words.remove(word)
+        if words:
+            return
+        del self._prefixes[prefix]
+        for delete in _deletes(prefix, self._indexed_distance(prefix)):
+            filed = self._deletes[delete]
+            if isinstance(filed, str):
+                del self._deletes[delete]
+                continue
+            filed.remove(prefix)
+            if len(filed) == 1:
+                self._deletes[delete] = filed[0]
+
+    def correct_word(self, word: str) -> Optional[str]:
+        """Closest known word (then the most used one), or None when word is known or nothing is close"""
+        word = word.casefold()
+        if len(word) < MIN_CORRECTED_LENGTH or word in self._counts:
+            return None
+        # Short words tolerate one edit, or "jav" would be as close to "law" as to "java"
+        limit = 1 if len(word) <= SHORT_WORD_LENGTH else self.max_distance
+        best: Optional[Tuple[int, int, str]] = None
+        seen = set()
+        # Read without the lock: after the first build a sync only changes a few buckets
+        for delete in _deletes(word[:PREFIX_LENGTH], limit):
+            filed = self._deletes.get(delete, ())
+            for prefix in (filed,) if isinstance(filed, str) else filed:
+                if prefix in seen:
+                    continue
+                seen.add(prefix)
+                for candidate in self._prefixes.get(prefix, ()):
+                    distance = edit_distance(word, candidate, limit)
+                    if distance <= limit:
+                        rank = (distance, -self._counts.get(candidate, 0), candidate)
+                        if best is None or rank < best:
+                            best = rank
+        return best[2] if best is not None else None
+
+    def correct(self, text: str) -> Optional[str]:
+        """The query with each unknown word replaced by its correction, or None when nothing changed"""
+        self._stats['lookups'] += 1
+        text = text or ''
+        corrected = _WORD.sub(lambda match: self.correct_word(match.group()) or match.group(), text)
+        if corrected == text:
+            return None
+        self._stats['corrections'] += 1
+        return corrected
+
+    def stats(self) -> Dict:
+        return dict(self._stats, ready=self.ready, words=len(self._counts), deletes=len(self._deletes))
+
+
+# Global spelling index, fed by the job catalog
+job_spelling = SpellingIndex()
@@ -0,0 +1,200 @@
+"""
+Flyer thumbnail pipeline
+Reads each flyer through the local image proxy, resizes it to a few widths
+as WebP (and AVIF when the installed Pillow can write it) in a process pool,
+and stores the results in a content-addressed disk cache served from
+/thumbs. Cards then load a right-sized thumbnail via srcset instead of the
+full flyer.
+
+Pillow is in requirements.txt; if it is missing anyway, srcset_for() always
+returns None and pages keep using the original flyer URLs. A flyer that
+could not be thumbnailed is retried after THUMBNAIL_RETRY_SECONDS.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Dict, Optional, Tuple
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow not installed
+    Image = None
+
+try:
+    import pillow_avif  # noqa: F401  registers the AVIF plugin on older Pillow
+except ImportError:
+    pass
+
+from .image_proxy import image_proxy
+
+THUMBNAIL_DIR = os.getenv('THUMBNAIL_DIR', os.path.join('.cache', 'thumbs'))
+THUMBNAIL_WORKERS = int(os.getenv('THUMBNAIL_WORKERS', '2'))
+THUMBNAIL_WIDTHS = (320, 640, 960)
+# Seconds before a flyer that failed (upstream down, not an image yet, ...) is tried again
+THUMBNAIL_RETRY_SECONDS = float(os.getenv('THUMBNAIL_RETRY_SECONDS', '300'))
+MAX_TRACKED_URLS = 10000
+
+# Preferred first: browsers pick the first <source> type they support
+QUALITY = {'avif': 50, 'webp': 80}
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp'}
+
+# Thumbnail file names, e.g. '<sha256>-640.webp'
+THUMBNAIL_NAME = re.compile(r'^[0-9a-f]{64}-\d+\.(avif|webp)$')
+
+
+def available_formats() -> Tuple[str, ...]:
+    """Output formats the installed Pillow can encode, best first"""
+    if Image is None:
+        return ()
+    Image.init()
+    return tuple(fmt for fmt in QUALITY if fmt.upper() in Image.SAVE)
+
+
+def _render_thumbnails(source: bytes, digest: str, widths: Tuple[int, ...],
+                       formats: Tuple[str, ...], directory: str) -> Dict:
+    """Resize one image to every width/format (runs in a worker process); returns its manifest"""
+    os.makedirs(directory, exist_ok=True)
+    with Image.open(BytesIO(source)) as opened:
+        image = ImageOps.exif_transpose(opened)
+        image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+    # Never upscale: widths above the source collapse into the source width
+    rendered = sorted({min(width, image.width) for width in widths})
+    for width in rendered:
+        resized = image if width == image.width else image.resize(
+            (width, max(1, round(image.height * width / image.width))), Image.LANCZOS
+        )
+        for fmt in formats:
+            path = os.path.join(directory, f"{digest}-{width}.{fmt}")
+            if os.path.exists(path):
+                continue
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            resized.save(tmp_path, fmt.upper(), quality=QUALITY[fmt])
+            os.replace(tmp_path, path)
+    manifest = {'widths': rendered, 'formats': list(formats)}
+    with open(os.path.join(directory, f"{digest}.json"), 'w') as f:
+        json.dump(manifest, f)
+    return manifest
+
+
+class ThumbnailPipeline:
+    """Maps flyer URLs to thumbnail srcsets, generating missing thumbnails in the background"""
+
+    def __init__(self, directory: str = THUMBNAIL_DIR, widths: Tuple[int, ...] = THUMBNAIL_WIDTHS,
+                 workers: int = THUMBNAIL_WORKERS):
+        self.directory = directory
+        self.widths = widths
+        self.workers = workers
+        self.formats = available_formats()
+        # url -> srcset info
+        self._ready: Dict[str, Dict] = {}
+        # url -> monotonic time after which a failed URL is tried again
+        self._failed: Dict[str, float] = {}
+        self._pending: Dict[str, asyncio.Task] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.formats)
+
+    def srcset_for(self, url: Optional[str]) -> Optional[Dict]:
+        """Thumbnail sources for a flyer URL, or None if not available (yet).
+
+        The first call for a URL only schedules the thumbnails; until they are
+        ready the caller should fall back to the original URL. The result has
+        'src' (a WebP fallback) and 'sources' [(mime type, srcset), ...].
+        """
+        if not self.enabled or not image_proxy.is_allowed(url):
+            return None
+        if url in self._ready:
+            return self._ready[url]
+        if self._failed.get(url, 0.0) > time.monotonic():
+            return None
+        if url not in self._pending:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return None
+            self._pending[url] = loop.create_task(self._generate(url))
+        return None
+
+    async def _generate(self, url: str):
+        try:
+            source = await self._download(url)
+            digest = hashlib.sha256(source).hexdigest()
+            loop = asyncio.get_running_loop()
+            manifest = await loop.run_in_executor(None, self._load_manifest, digest)
+            if manifest is None:
+                manifest = await loop.run_in_executor(
+                    self._get_pool(), _render_thumbnails,
+                    source, digest, self.widths, self.formats, self.directory,
+                )
+            self._remember(url, self._sources(digest, manifest))
+        except Exception as e:
+            print(f"Error creating thumbnails for {url}: {e}")
+            if len(self._failed) >= MAX_TRACKED_URLS:
+                self._failed.clear()
+            self._failed[url] = time.monotonic() + THUMBNAIL_RETRY_SECONDS
+        finally:
+            self._pending.pop(url, None)
+
+    async def _download(self, url: str) -> bytes:
+        _, file = await image_proxy.open(url)
+
+        def read():
+            with file:
+                return file.read()
+
+        return await asyncio.get_running_loop().run_in_executor(None, read)
+
+    def _load_manifest(self, digest: str) -> Optional[Dict]:
+        try:
+            with open(os.path.join(self.directory, f"{digest}.json")) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Re-render if this Pillow can encode more formats than when the manifest was written
+        return manifest if set(self.formats) <= set(manifest.get('formats', [])) else None
+
+    def _sources(self, digest: str, manifest: Dict) -> Dict:
+        widths = manifest['widths']
+        fallback = 'webp' if 'webp' in self.formats else self.formats[0]
+        return {
+            'src': f"/thumbs/{digest}-{widths[-1]}.{fallback}",
+            'sources': [
+                (MIME_TYPES[fmt], ', '.join(f"/thumbs/{digest}-{w}.{fmt} {w}w" for w in widths))
+                for fmt in self.formats
+            ],
+        }
+
+    def _remember(self, url: str, sources: Dict):
+        if len(self._ready) >= MAX_TRACKED_URLS:
+            self._ready.clear()
+        self._ready[url] = sources
+        self._failed.pop(url, None)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def path_for(self, name: str) -> Optional[str]:
+        """Disk path of a thumbnail file name, or None for names that are not thumbnails"""
+        if not THUMBNAIL_NAME.match(name):
+            return None
+        path = os.path.join(self.directory, name)
+        return path if os.path.isfile(path) else None
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+
+# Global thumbnail pipeline
+thumbnails = ThumbnailPipeline()
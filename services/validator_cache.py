@@ -0,0 +1,75 @@
+"""
+Validator cache for conditional GETs
+Keeps the ETag / Last-Modified validators of recent responses together with
+the already-normalized result, so a 304 Not Modified reply can be answered
+without downloading or parsing the body again
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Mapping, Optional
+
+VALIDATOR_CACHE_SIZE = int(os.getenv('VALIDATOR_CACHE_SIZE', '256'))
+
+
+class _Validated:
+    __slots__ = ('etag', 'last_modified', 'result')
+
+    def __init__(self, etag: Optional[str], last_modified: Optional[str], result: Any):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.result = result
+
+
+class ValidatorCache:
+    """LRU map of request key -> (validators, normalized result)"""
+
+    def __init__(self, max_entries: int = VALIDATOR_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, _Validated]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'not_modified': 0, 'stored': 0}
+
+    def conditional_headers(self, key: Hashable) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for a cached response (empty when none)"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return {}
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def not_modified(self, key: Hashable) -> Any:
+        """Return the cached result for a 304 reply (None if it was evicted meanwhile)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self._stats['not_modified'] += 1
+            return entry.result
+
+    def store(self, key: Hashable, response_headers: Mapping[str, str], result: Any):
+        """Remember the result if the response carried validators"""
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        with self._lock:
+            self._entries[key] = _Validated(etag, last_modified, result)
+            self._entries.move_to_end(key)
+            self._stats['stored'] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._stats, entries=len(self._entries))
+
+
+# Global validator cache shared by APIService and AsyncAPIService
+validator_cache = ValidatorCache()
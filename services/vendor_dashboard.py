@@ -0,0 +1,59 @@
+"""
+Vendor dashboard data aggregator
+Loads a vendor's jobs and the applicants concurrently, so the overview waits
+for the slowest upstream call instead of the sum of them, and joins
+applicants to jobs through a job id map
+"""
+
+import asyncio
+from typing import Dict, List, Optional
+
+from .async_api_service import AsyncAPIService
+from .job_catalog import JobCatalog, job_catalog
+
+
+def join_applicants(jobs: List[Dict], applicants: List[Dict]) -> Dict[str, List[Dict]]:
+    """Group applicants by the id of the (given) job they applied to; others are dropped"""
+    by_job: Dict[str, List[Dict]] = {str(job['id']): [] for job in jobs if job.get('id') is not None}
+    for applicant in applicants:
+        matches = by_job.get(str(applicant.get('job_id')))
+        if matches is not None:
+            matches.append(applicant)
+    return by_job
+
+
+class VendorDashboardData:
+    """Everything the vendor overview renders, computed in one place"""
+
+    __slots__ = ('jobs', 'applicants', 'applicants_by_job', 'total_jobs',
+                 'total_applications', 'total_views', 'success_rate')
+
+    def __init__(self, jobs: List[Dict], applicants: List[Dict]):
+        self.jobs = jobs
+        self.applicants_by_job = join_applicants(jobs, applicants)
+        # Only applicants to this vendor's jobs, in upstream order
+        self.applicants = [app for app in applicants if str(app.get('job_id')) in self.applicants_by_job]
+        self.total_jobs = len(jobs)
+        self.total_applications = sum(job.get('application_count', 0) for job in jobs)
+        self.total_views = sum(job.get('view_count', 0) for job in jobs)
+        self.success_rate = (
+            round((self.total_applications / self.total_views) * 100) if self.total_views > 0 else 0
+        )
+
+
+async def load_vendor_dashboard(vendor_id: str, api_service: Optional[AsyncAPIService] = None,
+                                catalog: JobCatalog = job_catalog) -> VendorDashboardData:
+    """Fetch a vendor's jobs (via the catalog) and all applicants at the same time"""
+    api_service = api_service or catalog.api_service
+    jobs, applicants = await asyncio.gather(
+        catalog.get_jobs_by_vendor(vendor_id),
+        api_service.get_applicants(),
+        return_exceptions=True,
+    )
+    if isinstance(jobs, BaseException):
+        print(f"Error loading jobs for vendor {vendor_id}: {jobs}")
+        jobs = []
+    if isinstance(applicants, BaseException):
+        print(f"Error loading applicants for vendor {vendor_id}: {applicants}")
+        applicants = []
+    return VendorDashboardData(jobs, applicants)
@@ -0,0 +1,97 @@
+"""Typeahead index: incremental sync, ranking, cache invalidation and the segment-tree top-k"""
+
+import random
+
+import pytest
+
+from services.autocomplete import SuggestionIndex, _KindIndex, _lookup_texts
+
+
+def _job(job_id, title, company='Acme', category='Engineering', location='Boston, MA'):
+    return {'id': job_id, 'title': title, 'company': company, 'category': category, 'location': location}
+
+
+def _labels(found):
+    return [(suggestion.label, suggestion.count) for suggestion in found]
+
+
+def test_sync_adds_updates_and_removes_only_what_changed():
+    index = SuggestionIndex()
+    jobs = [_job(1, 'Software Engineer'), _job(2, 'Data Engineer'), _job(3, 'Software Engineer', 'Globex')]
+    assert index.sync(jobs) == {'added': 3, 'updated': 0, 'removed': 0}
+    assert _labels(index.suggest('soft', kinds=('title',))) == [('Software Engineer', 2)]
+    # A later word matches too, ranked below values that start with the prefix
+    assert _labels(index.suggest('eng')) == [('Engineering', 3), ('Software Engineer', 2), ('Data Engineer', 1)]
+
+    jobs = [_job(1, 'Software Engineer'), _job(2, 'Data Scientist'), _job(4, 'Engine Mechanic', 'Initech')]
+    assert index.sync(jobs) == {'added': 1, 'updated': 1, 'removed': 1}
+    assert index.sync(jobs) == {'added': 0, 'updated': 0, 'removed': 0}
+    assert _labels(index.suggest('eng', kinds=('title',))) == [('Engine Mechanic', 1), ('Software Engineer', 1)]
+    assert _labels(index.suggest('glob')) == []
+    assert _labels(index.suggest('bost')) == [('Boston', 3)]
+
+
+def test_cached_prefixes_are_dropped_when_a_matching_value_changes():
+    index = SuggestionIndex()
+    index.sync([_job(1, 'Cook'), _job(2, 'Baker')])
+    assert _labels(index.suggest('co', kinds=('title',))) == [('Cook', 1)]
+    assert _labels(index.suggest('ba', kinds=('title',))) == [('Baker', 1)]
+
+    index.sync([_job(1, 'Cook'), _job(2, 'Baker'), _job(3, 'Cook'), _job(4, 'Courier')])
+
+    assert _labels(index.suggest('co', kinds=('title',))) == [('Cook', 2), ('Courier', 1)]
+    assert ('ba', ('title',)) in index._snapshot.cache
+
+
+def _brute_top(counts, prefix):
+    best = {}
+    for key, count in counts.items():
+        for text in _lookup_texts(key):
+            if text.startswith(prefix):
+                best[key] = max(best.get(key, 0), count * (2 if text == key else 1))
+    return best
+
+
+def test_segment_tree_top_matches_a_scan():
+    rng = random.Random(7)
+    words = ['data', 'dev', 'design', 'driver', 'sales', 'senior', 'support', 'engineer']
+    counts = {'data': 1}
+    for _ in range(60):
+        key = ' '.join(rng.choice(words) for _ in range(rng.randint(1, 3)))
+        counts[key] = rng.randint(1, 9)
+    index = _KindIndex(sorted((text, key) for key in counts for text in _lookup_texts(key)))
+    index.rebuild(counts)
+
+    # Incremental edits must leave the same tree as a fresh build
+    for key in list(counts)[1:11]:
+        index.remove(key)
+        del counts[key]
+    index.insert('dev ops')
+    counts['dev ops'] = 4
+    index.rebuild(counts)
+    counts['data'] += 20
+    index.update('data', counts['data'])
+
+    for prefix in ('d', 'de', 'dev', 's', 'se', 'su', 'e', 'x', ''):
+        expected = _brute_top(counts, prefix)
+        for limit in (1, 3, 8, 100):
+            found = index.top(prefix, limit)
+            assert [score for score, _ in found] == sorted(expected.values(), reverse=True)[:limit], (prefix, limit)
+            assert all(expected[key] == score for score, key in found)
+
+
+def test_failed_publish_is_applied_by_the_next_sync(monkeypatch):
+    index = SuggestionIndex()
+    index.sync([_job(1, 'Cook')])
+    publish = index._publish
+
+    def fail(*args):
+        raise RuntimeError('boom')
+
+    monkeypatch.setattr(index, '_publish', fail)
+    with pytest.raises(RuntimeError):
+        index.sync([_job(1, 'Cook'), _job(2, 'Courier')])
+    monkeypatch.setattr(index, '_publish', publish)
+
+    assert index.sync([_job(1, 'Cook'), _job(2, 'Courier')]) == {'added': 1, 'updated': 0, 'removed': 0}
+    assert _labels(index.suggest('cou', kinds=('title',))) == [('Courier', 1)]
@@ -0,0 +1,98 @@
+"""Flyer uploads: disk spooling and the streamed multipart body sent by AsyncAPIService"""
+
+import asyncio
+import io
+import threading
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from services.async_api_service import AsyncAPIService
+from services.flyer_upload import UPLOAD_CHUNK_SIZE, FlyerTooLarge, MultipartBody, SpooledFlyer
+
+FLYER = bytes(range(256)) * (UPLOAD_CHUNK_SIZE // 256 * 2 + 7)  # a few chunks, not chunk-aligned
+
+
+def _service(handler) -> AsyncAPIService:
+    service = AsyncAPIService()
+    service.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    service.base_url = 'https://api.test'
+    return service
+
+
+def test_spool_rejects_oversized_flyer():
+    with pytest.raises(FlyerTooLarge):
+        SpooledFlyer.spool(io.BytesIO(b'x' * 11), 'big.png', 'image/png', max_bytes=10)
+
+
+def test_spool_async_writes_off_the_event_loop(monkeypatch):
+    writers = set()
+    write = SpooledFlyer._write
+
+    def recording_write(self, data):
+        writers.add(threading.get_ident())
+        write(self, data)
+
+    monkeypatch.setattr(SpooledFlyer, '_write', recording_write)
+
+    async def spool():
+        loop_thread = threading.get_ident()
+        flyer = await SpooledFlyer.spool_async(io.BytesIO(FLYER), 'flyer.png', 'image/png')
+        with pytest.raises(FlyerTooLarge):
+            await SpooledFlyer.spool_async(b'x' * 11, 'big.png', 'image/png', max_bytes=10)
+        return loop_thread, flyer
+
+    loop_thread, flyer = asyncio.run(spool())
+    assert writers and loop_thread not in writers
+    assert flyer.size == len(FLYER)
+    flyer.file.seek(0)
+    assert flyer.file.read() == FLYER
+
+
+def test_sync_and_async_bodies_match_content_length():
+    flyer = SpooledFlyer.spool(io.BytesIO(FLYER), 'flyer.png', 'image/png')
+    body = MultipartBody({'title': 'Driver', 'tags': ['a', 'b'], 'skip': None}, flyer)
+
+    async def collect():
+        return b''.join([chunk async for chunk in body])
+
+    sync_bytes = b''.join(body)
+    assert sync_bytes == asyncio.run(collect())
+    assert len(sync_bytes) == body.length
+    assert FLYER in sync_bytes
+    assert sync_bytes.count(b'name="tags"') == 2 and b'name="skip"' not in sync_bytes
+
+
+@pytest.mark.parametrize('method', ['create', 'update'])
+def test_async_service_streams_spooled_flyer(method):
+    received = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        received['method'] = request.method
+        received['headers'] = request.headers
+        received['body'] = request.read()
+        return httpx.Response(200, json={'id': 'job-1'})
+
+    flyer = SpooledFlyer.spool(io.BytesIO(FLYER), 'flyer.png', 'image/png')
+    if method == 'update':
+        # A plain upload object is spooled by the service itself
+        flyer = SimpleNamespace(content=io.BytesIO(FLYER), name='flyer.png', content_type='image/png')
+    progress = []
+
+    async def upload():
+        service = _service(handler)
+        try:
+            if method == 'create':
+                return await service.create_job({'title': 'Driver'}, flyer, lambda sent, total: progress.append(sent))
+            return await service.update_job('job-1', {'title': 'Driver'}, flyer,
+                                            lambda sent, total: progress.append(sent))
+        finally:
+            await service.client.aclose()
+
+    assert asyncio.run(upload()) == {'id': 'job-1'}
+    assert received['method'] == ('POST' if method == 'create' else 'PUT')
+    assert received['headers']['content-type'].startswith('multipart/form-data; boundary=')
+    assert int(received['headers']['content-length']) == len(received['body'])
+    assert FLYER in received['body']
+    assert progress[-1] == len(received['body'])
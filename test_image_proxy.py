@@ -0,0 +1,73 @@
+"""Image proxy: downloads, eviction while serving and the on-disk index"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from services import image_proxy as image_proxy_module
+from services.image_proxy import ImageProxy, read_chunks
+
+HOST = 'https://images.unsplash.com'
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        name = request.url.path.strip('/')
+        return httpx.Response(200, content=name.encode() * 100, headers={'Content-Type': 'image/png'})
+
+    # Like the shared client, which defaults to JSON
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler), headers={'Accept': 'application/json'})
+    monkeypatch.setattr(image_proxy_module, 'get_async_client', lambda: client)
+    return requests
+
+
+def test_download_asks_for_an_image(tmp_path, upstream):
+    proxy = ImageProxy(directory=str(tmp_path))
+
+    async def run():
+        image, file = await proxy.open(f'{HOST}/a')
+        return image, b''.join(read_chunks(file))
+
+    image, body = asyncio.run(run())
+    assert body == b'a' * 100 and image.size == 100
+    assert upstream[0].headers['Accept'] == 'image/*'
+
+
+def test_open_file_survives_eviction(tmp_path, upstream):
+    proxy = ImageProxy(directory=str(tmp_path), max_bytes=150)
+
+    async def run():
+        _, file = await proxy.open(f'{HOST}/a')
+        await proxy.get(f'{HOST}/b')  # evicts a
+        return file
+
+    file = asyncio.run(run())
+    assert proxy.stats()['evictions'] == 1
+    assert b''.join(read_chunks(file)) == b'a' * 100
+
+
+def test_image_removed_from_disk_is_downloaded_again(tmp_path, upstream):
+    proxy = ImageProxy(directory=str(tmp_path))
+
+    async def run():
+        image = await proxy.get(f'{HOST}/a')
+        (tmp_path / image.key).unlink()
+        _, file = await proxy.open(f'{HOST}/a')
+        return b''.join(read_chunks(file))
+
+    assert asyncio.run(run()) == b'a' * 100
+    assert len(upstream) == 2
+
+
+def test_cache_index_is_picked_up_after_a_restart(tmp_path, upstream):
+    asyncio.run(ImageProxy(directory=str(tmp_path)).get(f'{HOST}/a'))
+    proxy = ImageProxy(directory=str(tmp_path))
+
+    asyncio.run(proxy.get(f'{HOST}/a'))
+    assert len(upstream) == 1
+    assert proxy.stats()['hits'] == 1 and proxy.stats()['bytes'] == 100
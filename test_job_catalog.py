@@ -0,0 +1,91 @@
+"""Job catalog reindexing: unchanged catalogs are skipped and index updates apply in order"""
+
+import asyncio
+import threading
+import time
+
+import services.job_catalog as job_catalog_module
+from services.job_catalog import JobCatalog
+
+
+class _Recorder:
+    """Stands in for an index: records the catalogs synced into it, optionally slowly"""
+
+    def __init__(self, delays=()):
+        self.enabled = True
+        self.ready = False
+        self.synced = []
+        self._delays = list(delays)
+        self._lock = threading.Lock()
+
+    def sync(self, jobs):
+        with self._lock:
+            delay = self._delays.pop(0) if self._delays else 0
+        time.sleep(delay)
+        self.synced.append([job['id'] for job in jobs])
+        self.ready = True
+
+
+class _Api:
+    def __init__(self, results):
+        self.results = results
+
+    async def get_jobs_with_meta(self, filters=None):
+        return {'jobs': self.results.pop(0), 'meta': {}}
+
+
+def _catalog(monkeypatch, results, delays=()):
+    indexes = {name: _Recorder(delays) for name in ('job_search', 'job_suggestions', 'job_spelling')}
+    for name, index in indexes.items():
+        monkeypatch.setattr(job_catalog_module, name, index)
+    return JobCatalog(api_service=_Api(results), ttl=0), indexes
+
+
+async def _settle(catalog):
+    for update in (catalog._search_sync, catalog._facet_build, catalog._suggest_sync, catalog._spelling_sync):
+        await update
+
+
+def test_an_unchanged_catalog_is_not_reindexed(monkeypatch):
+    jobs = [{'id': 'a', 'title': 'Cook'}]
+    catalog, indexes = _catalog(monkeypatch, [jobs, jobs, [dict(jobs[0])]])
+
+    async def run():
+        for _ in range(3):
+            catalog._entries.clear()  # expire the entry so get_jobs loads again
+            await catalog.get_jobs()
+            await _settle(catalog)
+
+    asyncio.run(run())
+    assert all(index.synced == [['a']] for index in indexes.values())
+    assert catalog._by_id == {'a': jobs[0]}
+
+
+def test_a_slow_older_update_never_lands_after_a_newer_one(monkeypatch):
+    older, newer, newest = [{'id': 'old'}], [{'id': 'new'}], [{'id': 'newest'}]
+    catalog, indexes = _catalog(monkeypatch, [], delays=[0.2])
+
+    async def run():
+        catalog._reindex(older)
+        await asyncio.sleep(0.05)  # the first update is running
+        catalog._reindex(newer)
+        catalog._reindex(newest)  # supersedes 'new' before it starts
+        await _settle(catalog)
+
+    asyncio.run(run())
+    for index in indexes.values():
+        assert index.synced == [['old'], ['newest']]
+    assert [job['id'] for job in catalog.facets.jobs] == ['newest']
+
+
+def test_warm_up_builds_the_indexes_before_the_first_query(monkeypatch):
+    catalog, indexes = _catalog(monkeypatch, [[{'id': 'a', 'title': 'Cook'}]])
+
+    async def run():
+        catalog.warm_up()
+        catalog.warm_up()  # the load already running is shared
+        await catalog._entries[job_catalog_module.ALL_JOBS].task
+        await _settle(catalog)
+
+    asyncio.run(run())
+    assert all(index.synced == [['a']] for index in indexes.values())
@@ -0,0 +1,103 @@
+"""Facet posting lists: selections, live counts, salary ranges and cached sort orders"""
+
+from services.job_facets import FacetIndex, SortOrder, bitmap, normalize_location, positions
+
+JOBS = [
+    {'id': 1, 'category': 'Design', 'job_type': 'Full-time', 'company': 'Acme', 'location': 'New York, NY'},
+    {'id': 2, 'category': 'design', 'job_type': 'Part-time', 'company': 'Globex', 'location': ' new york'},
+    {'id': 3, 'category': 'Engineering', 'job_type': 'Full-time', 'company': 'Acme', 'location': 'Remote'},
+    {'id': 4, 'category': 'Engineering', 'job_type': 'Contract', 'company': 'Initech', 'location': 'Boston, MA',
+     'remote': True},
+]
+
+
+def _ids(index, bits):
+    return [job['id'] for job in index.jobs_for(bits)]
+
+
+def test_bitmap_round_trips_positions():
+    assert positions(bitmap([0, 9, 64, 3], 70)) == [0, 3, 9, 64]
+    assert positions(0) == []
+
+
+def test_locations_group_by_city():
+    assert normalize_location('New York, NY') == normalize_location(' new  york') == 'new york'
+    assert normalize_location('Remote - US') == 'remote'
+    assert normalize_location('Location not specified') is None
+
+
+def test_select_ors_values_and_ands_facets():
+    index = FacetIndex(JOBS)
+
+    assert _ids(index, index.select({'category': 'DESIGN'})) == [1, 2]
+    assert _ids(index, index.select({'category': ['Design', 'Engineering'], 'job_type': 'Full-time'})) == [1, 3]
+    assert _ids(index, index.select({'location': 'york', 'company': 'All'})) == [1, 2]
+    assert _ids(index, index.select({'remote': True})) == [3, 4]
+    assert index.select({'company': 'Nobody', 'category': 'Design'}) == 0
+
+
+def test_counts_ignore_the_facets_own_selection():
+    index = FacetIndex(JOBS)
+    counts = index.counts({'category': 'Design', 'company': 'Acme'}, facets=('category', 'company'))
+
+    # Category counts are under company=Acme only, company counts under category=Design only
+    assert counts['category'] == [('Design', 1), ('Engineering', 1)]
+    assert counts['company'] == [('Acme', 1), ('Globex', 1), ('Initech', 0)]
+
+
+def test_base_and_job_subsets():
+    index = FacetIndex(JOBS)
+    hits = [{'id': 4}, {'id': 2}, {'id': 99}]
+    base = index.bits_for(hits)
+
+    assert _ids(index, index.select({}, base)) == [2, 4]
+    assert index.filter_jobs(hits, index.select({'category': 'Engineering'})) == [{'id': 4}]
+
+
+def test_filter_jobs_keeps_the_given_order():
+    jobs = [{'id': n, 'category': 'Odd' if n % 2 else 'Even'} for n in range(20)]
+    index = FacetIndex(jobs)
+    ranked = [jobs[n] for n in (17, 2, 9, 19, 4, 1)] + [{'id': 'unknown'}]
+
+    assert [job['id'] for job in index.filter_jobs(ranked, index.select({'category': 'Odd'}))] == [17, 9, 19, 1]
+
+
+def test_salary_ranges_overlap_and_keep_unknown_salaries():
+    jobs = [
+        {'id': 1, 'salary_min': 40000.0, 'salary_max': 60000.0},
+        {'id': 2, 'salary_min': 80000.0, 'salary_max': 120000.0},
+        {'id': 3},
+        {'id': 4, 'salary_min': 60000.0, 'salary_max': 60000.0},
+    ]
+    index = FacetIndex(jobs)
+
+    assert _ids(index, index.select({'min_salary': 60000})) == [1, 2, 3, 4]
+    assert _ids(index, index.select({'min_salary': '70000'})) == [2, 3]
+    assert _ids(index, index.select({'max_salary': 50000})) == [1, 3]
+    assert _ids(index, index.select({'min_salary': 50000, 'max_salary': 70000})) == [1, 3, 4]
+    assert _ids(index, index.select({'min_salary': 'not a number'})) == [1, 2, 3, 4]
+
+
+def test_sorted_positions_dense_and_sparse_agree():
+    jobs = [{'id': n, 'title': f'Job {n % 7}', 'posted_ts': float(n * 37 % 50)} for n in range(50)]
+    for mode, (key, descending) in (('title', (lambda job: job['title'], False)),
+                                    ('newest', (lambda job: job['posted_ts'], True))):
+        order = SortOrder(jobs, key, descending)
+        expected_all = sorted(range(50), key=lambda n: key(jobs[n]), reverse=descending)
+        for selected in ([3], [0, 49, 7], list(range(0, 50, 2)), list(range(50))):
+            bits = bitmap(selected, 50)
+            # Sparse below a fifth of the snapshot, dense above; both are stable
+            assert order.sorted_positions(bits) == [n for n in expected_all if n in selected], (mode, selected)
+
+
+def test_sorted_jobs_uses_the_given_records():
+    index = FacetIndex([
+        {'id': 'a', 'title': 'Zoo keeper', 'posted_ts': 1.0},
+        {'id': 'b', 'title': 'accountant', 'posted_ts': 3.0},
+        {'id': 'c', 'title': 'Baker', 'posted_ts': 2.0},
+    ])
+
+    assert [job['id'] for job in index.sorted_jobs(index.all_bits, 'title')] == ['b', 'c', 'a']
+    assert [job['id'] for job in index.sorted_jobs(index.all_bits, 'newest')] == ['b', 'c', 'a']
+    hits = [{'id': 'a', 'snippet': 'x'}, {'id': 'c', 'snippet': 'y'}]
+    assert index.sorted_jobs(index.all_bits, 'newest', hits) == [hits[1], hits[0]]
@@ -0,0 +1,73 @@
+"""Compiled per-shape job normalizer"""
+
+import pytest
+
+import services.job_normalizer as job_normalizer
+from services.job_normalizer import epoch_seconds, normalize_job, normalize_jobs, parse_salary, salary_range
+
+
+def _abs(url):
+    return f"https://api.test{url}" if url and url.startswith('/') else url
+
+
+def test_aliases_are_resolved_in_priority_order():
+    job = normalize_job({'_id': 7, 'job_title': 'Cook', 'title': '', 'employer': 'Acme',
+                         'flyerUrl': '/f.png', 'employment_type': 'Part-time'}, _abs)
+    # An empty preferred alias falls through to the next one
+    assert (job['id'], job['title'], job['company'], job['job_type']) == (7, 'Cook', 'Acme', 'Part-time')
+    assert job['flyer'] == 'https://api.test/f.png'
+    assert job['location'] == 'Location not specified' and job['category'] == 'Technology'
+
+
+def test_batches_mixing_shapes_match_one_by_one_normalization():
+    raw = [
+        {'id': 1, 'title': 'A', 'date_posted': '2024-01-02T00:00:00Z'},
+        {'id': 2, 'title': 'B', 'date_posted': '2024-01-03T00:00:00Z'},
+        {'job_id': 3, 'jobTitle': 'C', 'created_at': 1704067200000},
+        {'id': 4, 'title': 'D'},
+    ]
+    assert normalize_jobs(raw, _abs) == [normalize_job(job, _abs) for job in raw]
+    assert [job['title'] for job in normalize_jobs(raw, _abs)] == ['A', 'B', 'C', 'D']
+
+
+def test_posted_ts_is_the_numeric_posted_date():
+    assert epoch_seconds('2024-01-01T00:00:00Z') == 1704067200.0
+    assert epoch_seconds(1704067200000) == epoch_seconds('1704067200') == 1704067200.0
+    assert epoch_seconds('Recently') == epoch_seconds(None) == 0.0
+    assert epoch_seconds('2 days ago') < epoch_seconds('an hour ago')
+    assert normalize_job({'id': 1, 'posted_date': '2024-01-01T00:00:00Z'}, _abs)['posted_ts'] == 1704067200.0
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('$120,000 - $160,000', (120000.0, 160000.0, 'USD')),
+    ('€50k-60k', (50000.0, 60000.0, 'EUR')),
+    ('GHS 4,000', (4000.0, 4000.0, 'GHS')),
+    ('1.2m', (1200000.0, 1200000.0, None)),
+    ('80000.50', (80000.5, 80000.5, None)),
+    ('Negotiable', (None, None, None)),
+    (95000, (95000.0, 95000.0, None)),
+])
+def test_parse_salary(text, expected):
+    assert parse_salary(text) == expected
+
+
+def test_salary_fields_are_numeric_after_normalizing():
+    ranged = normalize_job({'id': 1, 'min_salary': '40,000', 'max_salary': None, 'currency': 'GBP'}, _abs)
+    assert (ranged['salary_min'], ranged['salary_max'], ranged['salary_currency']) == (40000.0, 40000.0, 'GBP')
+    text = normalize_job({'id': 2, 'salary': '$50k - $70k'}, _abs)
+    assert (text['salary_min'], text['salary_max']) == (50000.0, 70000.0)
+    assert salary_range(50000, 70000, 'USD') == '$50,000 - $70,000'
+
+
+def test_relative_dates_keep_the_timestamp_of_their_first_sighting(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(job_normalizer.time, 'time', lambda: now[0])
+    raw = {'id': 'rel-1', 'title': 'Cook', 'posted_date': '2 days ago'}
+
+    first = normalize_job(raw, lambda url: url)
+    now[0] += 3600
+    again = normalize_job(dict(raw), lambda url: url)
+    other = normalize_job(dict(raw, id='rel-2'), lambda url: url)
+
+    assert first == again and first['posted_ts'] == 1_000_000.0 - 2 * 86400
+    assert other['posted_ts'] == 1_003_600.0 - 2 * 86400
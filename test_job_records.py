@@ -0,0 +1,75 @@
+"""Typed job records: one validate_json pass, per-record skipping and the as_records service path"""
+
+import asyncio
+import json
+import sys
+
+import httpx
+import pytest
+
+import services.async_api_service as async_api_service
+from services.async_api_service import AsyncAPIService
+from services.job_records import JobRecord, job_records, parse_job_records
+from services.last_known_good import LastKnownGood
+from services.validator_cache import ValidatorCache
+
+RAW = [
+    {'_id': 1, 'job_title': 'Cook', 'salary': '$50k', 'flyer_url': '/f.png', 'application_count': 4},
+    {'id': 2, 'title': {'not': 'text'}},
+    'not a job',
+    None,
+    {'id': 3, 'title': 'Baker', 'date_posted': '2024-01-02'},
+]
+
+
+@pytest.mark.parametrize('payload, meta', [
+    (RAW, {}),
+    ({'total': 5, 'data': RAW}, {'total': 5}),
+    ({'results': RAW, 'next_cursor': 'abc'}, {'next_cursor': 'abc'}),
+])
+def test_malformed_records_are_skipped_one_by_one(payload, meta):
+    records, found_meta = parse_job_records(json.dumps(payload).encode(), lambda url: 'https://api.test' + url)
+
+    assert [record.id for record in records] == ['1', '3']
+    assert found_meta == meta
+    cook = records[0]
+    assert (cook.title, cook.salary_min, cook.flyer, cook.application_count) == \
+        ('Cook', 50000.0, 'https://api.test/f.png', 4)
+    assert records[1].posted_ts > 0 and records[1].view_count == 0
+    if sys.version_info >= (3, 10):
+        assert not hasattr(cook, '__dict__')
+
+
+def test_a_body_that_is_not_jobs_raises_value_error():
+    with pytest.raises(ValueError):
+        parse_job_records(b'<html>Bad gateway</html>', None)
+
+
+def test_normalized_dicts_convert_without_normalizing_again():
+    records = job_records([{'id': '7', 'title': 'Driver', 'posted_date': 'Recently', 'remote': True}])
+
+    assert records == [JobRecord(id='7', title='Driver')]
+    assert records[0].to_dict()['title'] == 'Driver'
+
+
+def _service(handler) -> AsyncAPIService:
+    service = AsyncAPIService(read_mode='api')
+    service.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    service.base_url = 'https://api.test'
+    return service
+
+
+def test_service_returns_records_and_falls_back_on_a_bad_body(tmp_path, monkeypatch):
+    monkeypatch.setattr(async_api_service, 'validator_cache', ValidatorCache())
+    monkeypatch.setattr(async_api_service, 'last_known_good', LastKnownGood(str(tmp_path)))
+    bodies = [json.dumps({'data': RAW, 'total': 2}).encode(), b'<html>Bad gateway</html>']
+
+    service = _service(lambda request: httpx.Response(200, content=bodies.pop(0)))
+
+    async def run():
+        return (await service.get_jobs_with_meta({'q': 'a'}, as_records=True),
+                await service.get_jobs({'q': 'b'}, as_records=True))
+
+    good, fallback = asyncio.run(run())
+    assert [record.title for record in good['jobs']] == ['Cook', 'Baker'] and good['meta'] == {'total': 2}
+    assert fallback and all(isinstance(record, JobRecord) for record in fallback)
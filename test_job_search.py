@@ -0,0 +1,33 @@
+"""Full-text job index: incremental sync and untruncated ranked results"""
+
+from services.job_search import MATCH_START, SNIPPET_LIMIT, JobSearchIndex
+
+
+def _job(job_id, title, description=''):
+    return {'id': job_id, 'title': title, 'company': 'Acme', 'description': description}
+
+
+def test_sync_adds_updates_and_removes_documents():
+    index = JobSearchIndex()
+    assert index.sync([_job(1, 'Truck driver'), _job(2, 'Baker'), _job(3, 'Cook')]) == \
+        {'added': 3, 'updated': 0, 'removed': 0}
+    assert index.sync([_job(1, 'Truck driver'), _job(2, 'Night baker'), _job(4, 'Bus driver')]) == \
+        {'added': 1, 'updated': 1, 'removed': 1}
+
+    assert sorted(hit.job_id for hit in index.search('driv')) == ['1', '4']
+    assert [hit.job_id for hit in index.search('night')] == ['2']
+    assert index.search('cook') == []
+
+
+def test_search_returns_every_match_with_snippets_for_the_top_ones():
+    index = JobSearchIndex()
+    total = SNIPPET_LIMIT + 50
+    index.sync([_job(n, 'Driver' if n % 2 else 'Warehouse', 'Driver wanted') for n in range(total)])
+
+    hits = index.search('driver')
+    assert len(hits) == total
+    # Title matches outrank description-only ones
+    assert all(int(hit.job_id) % 2 for hit in hits[:total // 2])
+    assert all(MATCH_START in hit.snippet for hit in hits[:SNIPPET_LIMIT])
+    assert not any(hit.snippet for hit in hits[SNIPPET_LIMIT:])
+    assert [hit.score for hit in index.search('driver', limit=3)] == [hit.score for hit in hits[:3]]
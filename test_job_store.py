@@ -0,0 +1,75 @@
+"""SQLite job mirror: diffs, newest-first ordering, schema migration and search patterns"""
+
+import sqlite3
+
+from services.job_store import JobStore, encode_job
+
+
+def _job(job_id, posted_date, posted_ts, title='Job'):
+    return {'id': job_id, 'title': title, 'posted_date': posted_date, 'posted_ts': posted_ts}
+
+
+def _ids(result):
+    return [job['id'] for job in result['jobs']]
+
+
+def test_full_and_delta_syncs_diff_by_hash(tmp_path):
+    store = JobStore(str(tmp_path / 'jobs.sqlite3'))
+    counts = store.apply_full([encode_job(_job(n, '', 0.0)) for n in ('a', 'b', 'c')], None)
+    assert counts == {'added': 3, 'updated': 0, 'removed': 0}
+
+    counts = store.apply_full([encode_job(_job('c', '', 0.0, 'Cook')), encode_job(_job('a', '', 0.0))], None)
+    assert counts == {'added': 0, 'updated': 1, 'removed': 1}
+    assert _ids(store.query_jobs({})) == ['c', 'a']
+
+    counts = store.apply_delta([encode_job(_job('d', '', 0.0)), encode_job(_job('c', '', 0.0, 'Chef'))], 'x')
+    assert counts == {'added': 1, 'updated': 1, 'removed': 0}
+    assert _ids(store.query_jobs({})) == ['c', 'a', 'd']
+    assert store.get_job('c')['title'] == 'Chef'
+
+
+def test_newest_sorts_on_the_timestamp_not_the_display_date(tmp_path):
+    store = JobStore(str(tmp_path / 'jobs.sqlite3'))
+    store.apply_full([
+        encode_job(_job('old', '2024-01-01', 1704067200.0)),
+        encode_job(_job('recent', '2 days ago', 1900000000.0)),
+        encode_job(_job('mid', 'Mar 5, 2024', 1709596800.0)),
+    ], None)
+
+    assert _ids(store.query_jobs({'sort': 'created_at:desc'})) == ['recent', 'mid', 'old']
+
+
+def test_existing_database_gains_posted_ts(tmp_path):
+    path = str(tmp_path / 'jobs.sqlite3')
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE jobs (id TEXT PRIMARY KEY, vendor_id TEXT, title TEXT, company TEXT, location TEXT,
+            category TEXT, job_type TEXT, posted_date TEXT, updated_at TEXT, position INTEGER NOT NULL,
+            hash TEXT NOT NULL, data TEXT NOT NULL);
+        CREATE INDEX jobs_posted_date ON jobs (posted_date);
+        INSERT INTO jobs VALUES ('a', NULL, 'A', NULL, NULL, NULL, NULL, 'Recently', NULL, 0, 'h',
+            '{"id": "a", "posted_ts": 5.0}');
+        INSERT INTO jobs VALUES ('b', NULL, 'B', NULL, NULL, NULL, NULL, '2020-01-01', NULL, 1, 'h',
+            '{"id": "b", "posted_ts": 9.0}');
+    """)
+    conn.commit()
+    conn.close()
+
+    assert _ids(JobStore(path).query_jobs({'sort': 'created_at:desc'})) == ['b', 'a']
+
+
+def test_search_text_wildcards_match_literally(tmp_path):
+    store = JobStore(str(tmp_path / 'jobs.sqlite3'))
+    store.apply_full([encode_job(dict(_job(job_id, '', 0.0, title), location=location)) for job_id, title, location in (
+        ('pct', '100% Remote Engineer', 'Boston'),
+        ('plain', '100 Remote Engineers', 'Austin'),
+        ('under', 'C_DEV lead', 'New_York'),
+        ('other', 'CXDEV lead', 'NewYork'),
+        ('slash', 'Ops \\ SRE', 'Denver'),
+    )], None)
+
+    assert _ids(store.query_jobs({'search': '100%'})) == ['pct']
+    assert _ids(store.query_jobs({'search': 'C_DEV'})) == ['under']
+    assert _ids(store.query_jobs({'location': 'new_'})) == ['under']
+    assert _ids(store.query_jobs({'search': '\\'})) == ['slash']
+    assert len(store.query_jobs({'search': 'engineer'})['jobs']) == 2
@@ -0,0 +1,97 @@
+"""Streaming /jobs parser and the mirror sync that reads pages through it"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from services.async_api_service import AsyncAPIService
+from services.job_store import JobStore
+from services.job_stream import JobStreamParser, iter_json_jobs
+from services.job_sync import JobMirrorSync
+
+JOBS = [
+    {'id': 1, 'title': 'Café driver', 'salary': 1250.5, 'tags': ['a', 'b'], 'remote': True},
+    {'id': 2, 'title': 'Baker "night"', 'salary': 12, 'extra': {'nested': [1, {'x': None}]}},
+    {'id': 3, 'title': 'Cook', 'salary': -3e2},
+]
+
+
+def _chunks(body: bytes, size: int):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+@pytest.mark.parametrize('payload', [
+    JOBS,
+    {'total': 3, 'data': JOBS, 'next_cursor': 'abc'},
+    {'meta': {'page': 1}, 'jobs': [], 'results': JOBS},
+])
+def test_every_chunk_boundary_yields_the_same_jobs(payload):
+    body = json.dumps(payload, ensure_ascii=False, indent=1).encode()
+    for size in range(1, 24):
+        parser = JobStreamParser()
+        assert list(iter_json_jobs(_chunks(body, size), parser)) == JOBS, size
+        if isinstance(payload, dict):
+            assert parser.meta == {k: v for k, v in payload.items() if k not in ('data', 'jobs', 'results')}
+
+
+def test_number_split_by_a_chunk_is_not_cut_short():
+    parser = JobStreamParser()
+    assert parser.feed(b'[{"id": 1}, 12') == [{'id': 1}]
+    assert parser.feed(b'50') == []
+    assert parser.feed(b'.5, {"id": 2}]', final=True) == [{'id': 2}]
+
+
+def test_truncated_body_raises():
+    with pytest.raises(ValueError):
+        list(iter_json_jobs([b'[{"id": 1}, {"id": ']))
+
+
+def _job(job_id, updated_at):
+    return {'id': job_id, 'title': f'Job {job_id}', 'company': 'Acme', 'updated_at': updated_at}
+
+
+def _sync(tmp_path, handler) -> JobMirrorSync:
+    service = AsyncAPIService(read_mode='api')
+    service.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    service.base_url = 'https://api.test'
+    return JobMirrorSync(store=JobStore(str(tmp_path / 'jobs.sqlite3')), api_service=service)
+
+
+def test_sync_streams_every_page_into_the_mirror(tmp_path):
+    pages = {
+        '1': {'data': [_job('a', '2024-01-01'), _job('b', '2024-01-03')], 'limit': 2, 'has_more': True},
+        '2': {'data': [_job('c', '2024-01-02')], 'has_more': False},
+    }
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = request.url.params.get('page', '1')
+        requested.append(page)
+        return httpx.Response(200, json=pages[page])
+
+    sync = _sync(tmp_path, handler)
+    asyncio.run(_run(sync))
+
+    assert requested == ['1', '2']
+    assert [job['id'] for job in sync.store.query_jobs({})['jobs']] == ['a', 'b', 'c']
+    assert sync.store.cursor('jobs') == '2024-01-03'
+    assert sync.stats()['added'] == 3
+
+
+def test_failed_page_leaves_the_mirror_untouched(tmp_path):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.params.get('page', '1') == '2':
+            return httpx.Response(500)
+        return httpx.Response(200, json={'data': [_job('a', '2024-01-01')], 'limit': 1, 'has_more': True})
+
+    sync = _sync(tmp_path, handler)
+    asyncio.run(_run(sync))
+
+    assert not sync.store.ready()
+    assert sync.stats()['failures'] == 1
+
+
+async def _run(sync: JobMirrorSync):
+    await sync._sync_jobs(asyncio.get_running_loop())
@@ -0,0 +1,53 @@
+"""Keyed list rendering: reuse, moves, removals and re-renders by version"""
+
+import pytest
+from nicegui import ui
+from nicegui.client import Client
+from nicegui.page import page
+
+from components.keyed_list import KeyedList
+
+
+@pytest.fixture
+def keyed():
+    """(KeyedList, keys rendered so far, current label texts) inside a page client"""
+    client = Client(page('/keyed'))
+    with client, client.content:
+        container = ui.column()
+        rendered = []
+
+        def render(item):
+            rendered.append(item['id'])
+            return ui.label(f"{item['id']}:{item.get('v', 0)}")
+
+        items = KeyedList(container, key=lambda item: item['id'], render=render, version=lambda item: item.get('v'))
+        yield items, rendered, lambda: [child.text for child in container.default_slot.children]
+
+
+def test_update_reuses_moves_and_removes_elements(keyed):
+    items, rendered, texts = keyed
+    assert items.update([{'id': 'a'}, {'id': 'b'}, {'id': 'c'}]) == \
+        {'created': 3, 'removed': 0, 'moved': 0, 'kept': 0}
+
+    counts = items.update([{'id': 'c'}, {'id': 'a'}, {'id': 'd'}])
+    assert texts() == ['c:0', 'a:0', 'd:0']
+    assert counts == {'created': 1, 'removed': 1, 'moved': 1, 'kept': 1}
+    assert rendered == ['a', 'b', 'c', 'd']
+
+    # Appending ("Load more") only renders the new items
+    counts = items.update([{'id': 'c'}, {'id': 'a'}, {'id': 'd'}, {'id': 'e'}, {'id': 'e'}])
+    assert counts == {'created': 1, 'removed': 0, 'moved': 0, 'kept': 3}
+    assert texts() == ['c:0', 'a:0', 'd:0', 'e:0'] and len(items) == 4
+
+
+def test_changed_version_renders_again_in_place(keyed):
+    items, rendered, texts = keyed
+    items.update([{'id': 'a'}, {'id': 'b', 'v': 1}, {'id': 'c'}])
+    counts = items.update([{'id': 'a'}, {'id': 'b', 'v': 2}, {'id': 'c'}])
+
+    assert texts() == ['a:0', 'b:2', 'c:0']
+    assert counts == {'created': 1, 'removed': 1, 'moved': 0, 'kept': 2}
+    assert rendered == ['a', 'b', 'c', 'b']
+
+    items.clear()
+    assert len(items) == 0 and texts() == []
@@ -0,0 +1,42 @@
+"""Last-known-good store: auth-scoped keys, LRU bounds and concurrent writes"""
+
+import os
+import threading
+
+from services.last_known_good import LastKnownGood
+from services.single_flight import request_key
+
+
+def test_results_are_scoped_to_the_credentials(tmp_path):
+    store = LastKnownGood(str(tmp_path))
+    alice = request_key('GET', '/jobs', {'q': 'x'}, {'Authorization': 'Bearer alice'})
+    bob = request_key('GET', '/jobs', {'q': 'x'}, {'Authorization': 'Bearer bob'})
+    store.remember(alice, {'jobs': ['private']})
+
+    assert store.recall(bob) is None
+    assert LastKnownGood(str(tmp_path)).recall(alice) == {'jobs': ['private']}
+
+
+def test_memory_and_disk_keep_only_the_most_recent(tmp_path):
+    store = LastKnownGood(str(tmp_path), max_entries=2, max_files=3)
+    for n in range(5):
+        store.remember(('key', n), n)
+        # mtime resolution can be coarse: make the write order explicit
+        os.utime(os.path.join(str(tmp_path), f"{store._name(('key', n))}.json"), (n, n))
+
+    assert len(store._memory) == 2
+    assert len(os.listdir(str(tmp_path))) == 3
+    assert [LastKnownGood(str(tmp_path)).recall(('key', n)) for n in range(5)] == [None, None, 2, 3, 4]
+
+
+def test_concurrent_writers_never_leave_a_partial_file(tmp_path):
+    store = LastKnownGood(str(tmp_path))
+    results = [{'jobs': [writer] * 2000} for writer in range(8)]
+    threads = [threading.Thread(target=store.remember, args=('same', result)) for result in results]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert os.listdir(str(tmp_path)) == [f"{store._name('same')}.json"]
+    assert LastKnownGood(str(tmp_path)).recall('same') in results
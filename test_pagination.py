@@ -0,0 +1,88 @@
+"""Server-side /jobs paging: next-page params per paging style and the prefetching pager"""
+
+import asyncio
+
+import pytest
+
+from services.pagination import JobPager, PagerCache, next_page_params
+
+
+@pytest.mark.parametrize('meta, params, batch_count, fetched, expected', [
+    # Page numbers, with and without hints
+    ({}, {'q': 'x', 'page': 1}, 10, 10, {'q': 'x', 'page': 2, 'limit': 10}),
+    ({'page': 3, 'total_pages': 3}, {'page': 3}, 10, 30, None),
+    ({'next': 5}, {'page': 4}, 10, 40, {'page': 5, 'limit': 10}),
+    # Offsets
+    ({'offset': 20, 'limit': 5}, {'offset': 20}, 5, 25, {'offset': 25, 'limit': 10}),
+    # Cursors and next links
+    ({'next_cursor': 'abc'}, {'q': 'x', 'cursor': 'old'}, 10, 10, {'q': 'x', 'cursor': 'abc', 'limit': 10}),
+    ({'nextCursor': None}, {}, 10, 10, None),
+    ({'next': 'https://api.test/jobs?page=2&limit=10'}, {'q': 'x', 'page': 1}, 10, 10,
+     {'q': 'x', 'page': '2', 'limit': '10'}),
+    # Last pages
+    ({}, {'page': 1}, 7, 7, None),
+    ({'limit': 7}, {'page': 1}, 7, 7, {'page': 2, 'limit': 10}),
+    ({'has_more': False}, {'page': 1}, 10, 10, None),
+    ({'total': 20}, {'page': 2}, 10, 20, None),
+    ({'source': 'fallback'}, {'page': 1}, 10, 10, None),
+    ({}, {'page': 1}, 0, 0, None),
+])
+def test_next_page_params(meta, params, batch_count, fetched, expected):
+    assert next_page_params(meta, params, batch_count, fetched, 10) == expected
+
+
+def _fetcher(total, calls):
+    async def fetch(params):
+        calls.append(params['page'])
+        start = (params['page'] - 1) * params['limit']
+        jobs = [{'id': n} for n in range(start, min(start + params['limit'], total))]
+        return {'jobs': jobs, 'meta': {'total': total}}
+    return fetch
+
+
+def test_pager_prefetches_the_next_page():
+    async def run():
+        calls = []
+        pager = JobPager(_fetcher(5, calls), {'q': 'x'}, 2)
+        first = await pager.get_page(1)
+        await asyncio.sleep(0)  # let the prefetch run
+        assert calls == [1, 2]
+        assert [job['id'] for job in first] == [0, 1]
+        assert [job['id'] for job in await pager.get_page(2)] == [2, 3]
+        assert [job['id'] for job in await pager.get_page(3)] == [4]
+        assert await pager.get_page(4) == []
+        assert pager.exhausted and calls == [1, 2, 3]
+
+    asyncio.run(run())
+
+
+def test_pager_stops_when_the_server_repeats_a_page():
+    async def fetch(params):
+        return {'jobs': [{'id': 1}, {'id': 2}], 'meta': {}}
+
+    async def run():
+        pager = JobPager(fetch, {}, 2)
+        assert len(await pager.get_page(1)) == 2
+        assert await pager.get_page(2) == []
+        assert pager.exhausted and len(pager.pages) == 1
+
+    asyncio.run(run())
+
+
+def test_a_pager_that_served_fallback_data_is_not_reused():
+    results = [{'jobs': [{'id': 'sample'}], 'meta': {'source': 'fallback'}},
+               {'jobs': [{'id': 'real'}], 'meta': {}}]
+
+    async def fetch(params):
+        return results.pop(0)
+
+    async def run():
+        cache = PagerCache()
+        first = cache.get('q', lambda: JobPager(fetch, {}, 10))
+        assert [job['id'] for job in await first.get_page(1)] == ['sample']
+        again = cache.get('q', lambda: JobPager(fetch, {}, 10))
+        assert again is not first
+        assert [job['id'] for job in await again.get_page(1)] == ['real']
+        assert cache.get('q', lambda: JobPager(fetch, {}, 10)) is again
+
+    asyncio.run(run())
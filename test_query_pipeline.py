@@ -0,0 +1,57 @@
+"""LatestQuery: debouncing, cancellation of superseded runs, latest-only delivery"""
+
+import asyncio
+
+from services.query_pipeline import LatestQuery, QueryStats
+
+
+def _pipeline(run_seconds: float = 0.05, delay: float = 0.02):
+    started, finished, delivered = [], [], []
+
+    async def run(value):
+        started.append(value)
+        await asyncio.sleep(run_seconds)
+        finished.append(value)
+        return value.upper()
+
+    stats = QueryStats()
+    query = LatestQuery(run, lambda value, result, timing: delivered.append(result), delay=delay, stats=stats)
+    return query, stats, started, finished, delivered
+
+
+def test_keystrokes_within_the_delay_run_once():
+    async def scenario():
+        query, stats, started, _, delivered = _pipeline()
+        for value in ('d', 'de', 'dev'):
+            query.submit(value)
+        await asyncio.sleep(0.2)
+        return stats.stats(), started, delivered
+
+    stats, started, delivered = asyncio.run(scenario())
+    assert started == ['dev'] and delivered == ['DEV']
+    assert stats['debounced'] == 2 and stats['delivered'] == 1
+
+
+def test_superseded_run_is_cancelled_and_never_delivered():
+    async def scenario():
+        query, stats, started, finished, delivered = _pipeline()
+        query.submit('old', 0)
+        await asyncio.sleep(0.01)  # 'old' is running
+        query.submit('new', 0)
+        await asyncio.sleep(0.2)
+        return stats.stats(), started, finished, delivered
+
+    stats, started, finished, delivered = asyncio.run(scenario())
+    assert started == ['old', 'new'] and finished == ['new']
+    assert delivered == ['NEW'] and stats['cancelled'] == 1
+
+
+def test_cancel_drops_the_pending_query():
+    async def scenario():
+        query, _, started, _, delivered = _pipeline()
+        query.submit('dev')
+        query.cancel()
+        await asyncio.sleep(0.1)
+        return query.pending, started, delivered
+
+    assert asyncio.run(scenario()) == (False, [], [])
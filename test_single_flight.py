@@ -0,0 +1,72 @@
+"""Single-flight coalescing and the request keys it (and the caches) use"""
+
+import asyncio
+
+import pytest
+
+from services.single_flight import SingleFlight, request_key
+
+
+def test_request_key_ignores_param_order_but_not_credentials():
+    assert request_key('get', '/jobs', {'a': 1, 'b': [2, 3]}) == request_key('GET', '/jobs', {'b': [2, 3], 'a': '1'})
+    alice = request_key('GET', '/jobs', None, {'Authorization': 'Bearer alice'})
+    bob = request_key('GET', '/jobs', None, {'Authorization': 'Bearer bob'})
+    assert alice != bob and 'alice' not in repr(alice)
+    # Headers outside the auth scope do not split the key
+    assert request_key('GET', '/jobs', None, {'Authorization': 'x', 'Accept': 'a'}) == \
+        request_key('GET', '/jobs', None, {'Authorization': 'x', 'Accept': 'b'})
+
+
+def test_concurrent_callers_share_one_call():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {'jobs': []}
+
+    async def scenario():
+        flights = SingleFlight()
+        results = await asyncio.gather(*(flights.do('k', fetch) for _ in range(5)))
+        again = await flights.do('k', fetch)  # finished flights are not reused
+        return flights.stats(), results, again
+
+    stats, results, again = asyncio.run(scenario())
+    assert len(calls) == 2 and all(result is results[0] for result in results)
+    assert stats == {'leaders': 2, 'coalesced': 4, 'inflight': 0}
+
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return 'done'
+
+    async def scenario():
+        flights = SingleFlight()
+        first = asyncio.ensure_future(flights.do('k', fetch))
+        second = asyncio.ensure_future(flights.do('k', fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario()) == 'done'
+
+
+def test_failure_reaches_every_caller_and_is_not_kept():
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise OSError('upstream down')
+
+    async def scenario():
+        flights = SingleFlight()
+        results = await asyncio.gather(flights.do('k', fetch), flights.do('k', fetch), return_exceptions=True)
+        return flights.stats(), results
+
+    stats, results = asyncio.run(scenario())
+    assert all(isinstance(result, OSError) for result in results)
+    assert stats['inflight'] == 0
+
+
+@pytest.mark.parametrize('params', [None, {}])
+def test_missing_and_empty_params_share_a_key(params):
+    assert request_key('GET', '/jobs', params) == request_key('GET', '/jobs')
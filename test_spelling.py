@@ -0,0 +1,87 @@
+"""SymSpell correction: deletes, edit distance, incremental sync and lookups"""
+
+import random
+from itertools import combinations
+
+from services.spelling import SpellingIndex, _deletes, edit_distance
+
+
+def _filed(index):
+    return {delete: sorted([filed] if isinstance(filed, str) else filed) for delete, filed in index._deletes.items()}
+
+
+def _job(job_id, title, company='Acme', location='Boston, MA'):
+    return {'id': job_id, 'title': title, 'company': company, 'category': 'Engineering',
+            'job_type': 'Full-time', 'location': location}
+
+
+def test_deletes_are_every_combination_once():
+    word = 'develop'
+    expected = {''.join(word[i] for i in range(len(word)) if i not in gone)
+                for count in range(3) for gone in combinations(range(len(word)), count)}
+    assert _deletes(word, 2) == expected
+    assert _deletes('ab', 2) == {'ab', 'a', 'b'}
+
+
+def test_edit_distance_counts_transpositions_and_stops_at_the_limit():
+    assert edit_distance('developer', 'developer', 2) == 0
+    assert edit_distance('develper', 'developer', 2) == 1
+    assert edit_distance('devloeper', 'developer', 2) == 2
+    assert edit_distance('dveeloper', 'developer', 2) == 1
+    assert edit_distance('designer', 'developer', 2) == 3
+    assert edit_distance('a', 'abcdef', 2) == 3
+
+
+def test_corrections_prefer_closer_then_more_used_words():
+    index = SpellingIndex()
+    index.sync([_job(1, 'Senior Developer'), _job(2, 'Marketing Manager'), _job(3, 'Marketing Lead'),
+                _job(4, 'Market Analyst')])
+
+    assert index.correct_word('develper') == 'developer'
+    assert index.correct_word('Markting') == 'marketing'
+    assert index.correct_word('markst') == 'market'
+    assert index.correct_word('developer') is None  # known
+    assert index.correct_word('zzzzzz') is None
+    assert index.correct_word('lad') is None  # too short to correct
+    assert index.correct('Senoir develper in Bostn') == 'senior developer in boston'
+    assert index.correct('Senior Developer') is None
+
+
+def test_sync_adds_updates_and_removes_words():
+    index = SpellingIndex()
+    jobs = [_job(1, 'Developer'), _job(2, 'Designer'), _job(3, 'Developer', 'Globex')]
+    assert index.sync(jobs) == {'added': 3, 'updated': 0, 'removed': 0}
+    assert index.correct_word('globx') == 'globex'
+
+    jobs = [_job(1, 'Developer'), _job(2, 'Illustrator'), _job(4, 'Cook')]
+    assert index.sync(jobs) == {'added': 1, 'updated': 1, 'removed': 1}
+    assert index.sync(jobs) == {'added': 0, 'updated': 0, 'removed': 0}
+    assert index.correct_word('globx') is None
+    assert index.correct_word('desginer') is None
+    assert index.correct_word('ilustrator') == 'illustrator'
+    assert index._counts['developer'] == 1
+
+    # The dictionaries end up as a fresh build of the same jobs would
+    fresh = SpellingIndex()
+    fresh.sync(jobs)
+    assert index._counts == fresh._counts
+    assert {prefix: sorted(words) for prefix, words in index._prefixes.items()} == \
+        {prefix: sorted(words) for prefix, words in fresh._prefixes.items()}
+    assert _filed(index) == _filed(fresh)
+    assert all(isinstance(filed, str) or len(filed) > 1 for filed in index._deletes.values())
+
+
+def test_trimmed_deletes_correct_like_a_full_index(monkeypatch):
+    rng = random.Random(7)
+    letters = 'abcdefghij'
+    words = {''.join(rng.choice(letters) for _ in range(rng.randint(3, 9))) for _ in range(400)}
+    jobs = [_job(i, word) for i, word in enumerate(sorted(words))]
+    trimmed = SpellingIndex()
+    trimmed.sync(jobs)
+    monkeypatch.setattr(SpellingIndex, '_indexed_distance', lambda self, prefix: self.max_distance)
+    full = SpellingIndex()
+    full.sync(jobs)
+    assert len(trimmed._deletes) < len(full._deletes)
+    for _ in range(2000):
+        query = ''.join(rng.choice(letters) for _ in range(rng.randint(4, 10)))
+        assert trimmed.correct_word(query) == full.correct_word(query), query
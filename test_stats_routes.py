@@ -0,0 +1,28 @@
+"""/_stats routes: hidden unless STATS_ROUTES is on, and then only for admin sessions"""
+
+import pytest
+from fastapi.testclient import TestClient
+from nicegui import app
+
+import main
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+def _session(monkeypatch, user_data):
+    monkeypatch.setattr(type(app.storage), 'user', property(lambda self: {'user_data': user_data}))
+
+
+def test_stats_routes_are_off_by_default(client, monkeypatch):
+    _session(monkeypatch, {'role': 'admin'})
+    assert client.get('/_stats/circuits').status_code == 404
+
+
+@pytest.mark.parametrize('user_data, status', [(None, 403), ({'role': 'vendor'}, 403), ({'role': 'admin'}, 200)])
+def test_stats_routes_need_an_admin_session(client, monkeypatch, user_data, status):
+    monkeypatch.setattr(main, 'STATS_ROUTES', True)
+    _session(monkeypatch, user_data)
+    assert client.get('/_stats/circuits').status_code == status
@@ -0,0 +1,35 @@
+"""Thumbnail pipeline: failed flyers are retried instead of being cached for good"""
+
+import asyncio
+
+from services import thumbnails as thumbnails_module
+from services.thumbnails import ThumbnailPipeline
+
+URL = 'https://cdn.test/flyer.png'
+
+
+def test_failed_flyer_is_retried_after_the_retry_delay(tmp_path, monkeypatch):
+    pipeline = ThumbnailPipeline(directory=str(tmp_path))
+    pipeline.formats = ('webp',)  # as if Pillow could encode WebP
+    monkeypatch.setattr(thumbnails_module.image_proxy, 'is_allowed', lambda url: True)
+    downloads = []
+
+    async def failing_download(url):
+        downloads.append(url)
+        raise OSError('upstream down')
+
+    monkeypatch.setattr(pipeline, '_download', failing_download)
+
+    async def request():
+        assert pipeline.srcset_for(URL) is None
+        await asyncio.gather(*pipeline._pending.values())
+
+    async def run():
+        await request()
+        await request()  # still within the retry delay: not downloaded again
+        assert pipeline._failed[URL] > thumbnails_module.time.monotonic()
+        pipeline._failed[URL] -= thumbnails_module.THUMBNAIL_RETRY_SECONDS  # the delay has passed
+        await request()
+
+    asyncio.run(run())
+    assert downloads == [URL, URL]
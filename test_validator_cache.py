@@ -0,0 +1,67 @@
+"""Conditional GETs: stored validators, LRU bounds, 304 revalidation and unreadable bodies"""
+
+import asyncio
+
+import httpx
+
+import services.async_api_service as async_api_service
+from services.async_api_service import AsyncAPIService
+from services.last_known_good import LastKnownGood
+from services.validator_cache import ValidatorCache
+
+
+def test_only_responses_with_validators_are_kept():
+    cache = ValidatorCache(max_entries=2)
+    cache.store('none', {}, {'id': 0})
+    cache.store('a', {'ETag': '"1"'}, {'id': 1})
+    cache.store('b', {'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}, {'id': 2})
+
+    assert cache.conditional_headers('none') == {}
+    assert cache.conditional_headers('a') == {'If-None-Match': '"1"'}
+    assert cache.conditional_headers('b') == {'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+    assert cache.not_modified('a') == {'id': 1}
+
+    # 'a' was just used, so 'b' is the one evicted
+    cache.store('c', {'ETag': '"3"'}, {'id': 3})
+    assert cache.not_modified('b') is None
+    assert cache.stats() == {'not_modified': 1, 'stored': 3, 'entries': 2}
+
+
+def test_not_modified_reply_reuses_the_normalized_job(tmp_path, monkeypatch):
+    monkeypatch.setattr(async_api_service, 'validator_cache', ValidatorCache())
+    monkeypatch.setattr(async_api_service, 'last_known_good', LastKnownGood(str(tmp_path)))
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get('If-None-Match'))
+        if request.headers.get('If-None-Match') == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={'data': {'id': 'j1', 'title': 'Cook'}}, headers={'ETag': '"v1"'})
+
+    service = AsyncAPIService(read_mode='api')
+    service.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    service.base_url = 'https://api.test'
+
+    async def run():
+        return await service.get_job_by_id('j1'), await service.get_job_by_id('j1')
+
+    first, second = asyncio.run(run())
+    assert seen == [None, '"v1"']
+    assert first == second and first['title'] == 'Cook'
+
+
+def test_a_body_that_is_not_json_falls_back_instead_of_raising(tmp_path, monkeypatch):
+    monkeypatch.setattr(async_api_service, 'validator_cache', ValidatorCache())
+    monkeypatch.setattr(async_api_service, 'last_known_good', LastKnownGood(str(tmp_path)))
+    service = AsyncAPIService(read_mode='api')
+    service.client = httpx.AsyncClient(transport=httpx.MockTransport(
+        lambda request: httpx.Response(200, content=b'<html>Bad gateway</html>')))
+    service.base_url = 'https://api.test'
+
+    async def run():
+        listings = await asyncio.gather(*(service.get_jobs_with_meta({'q': 'x'}) for _ in range(3)))
+        return listings, await service.get_job_by_id('j1'), await service.create_job({'title': 'Cook'})
+
+    listings, job, created = asyncio.run(run())
+    assert all(listing['meta']['source'] == 'fallback' and listing['jobs'] for listing in listings)
+    assert job is None and created is None